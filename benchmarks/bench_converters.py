@@ -0,0 +1,94 @@
+# bench_converters.py
+# 플랫폼별 변환(convert_by_platform) 텍스트 열 정리: 예전 astype(str) + str.lower() != "nan" vs text_column
+# 실행: python benchmarks/bench_converters.py [행 수 ...]
+#   - 시간: 3회 중 최솟값 / 할당: tracemalloc(파이썬 객체) 최대 + Arrow 메모리 풀 할당 횟수·바이트 (pyarrow 문자열 열일 때)
+
+import io
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError:  # pyarrow 없으면 object 문자열 열 → tracemalloc 만
+    pa = None
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from excel_convert import converters  # noqa: E402
+from excel_convert.converters import DEFAULT_MAPPING, DEFAULT_TEMPLATE_COLUMNS, convert_by_platform  # noqa: E402
+from excel_convert.xlsx_reader import read_xlsx_as_text  # noqa: E402
+from excel_convert.xlsx_writer import df_to_xlsx_bytes  # noqa: E402
+
+PLATFORMS = ("LAORA", "COUPANG", "SMARTSTORE", "TTARIMALL")
+# 스마트스토어 키워드 열 (나머지는 열 문자 매핑이 쓰는 위치에 그대로)
+SS_HEADERS = {0: "주문번호", 3: "수취인명", 4: "상품명", 5: "옵션정보", 6: "통합배송지", 7: "수취인연락처1",
+              8: "수량", 9: "배송메세지"}
+
+
+def legacy_text_column(ser: pd.Series) -> pd.Series:
+    series = ser.astype(str)
+    return series.where(series.str.lower() != "nan", "")
+
+
+def make_source(n: int) -> pd.DataFrame:
+    """40열 주문 목록을 XLSX 로 썼다가 앱과 같은 방식(read_xlsx_as_text)으로 읽은 것"""
+    rnd = random.Random(0)
+    columns = [SS_HEADERS.get(i, f"열{i + 1}") for i in range(40)]
+    data = {
+        c: ["" if rnd.random() < 0.1 else f"010-{rnd.randrange(10**4):04d}-{rnd.randrange(10**4):04d}" for _ in range(n)]
+        for c in columns
+    }
+    return read_xlsx_as_text(io.BytesIO(df_to_xlsx_bytes(pd.DataFrame(data), engine="stream")), cache=False)
+
+
+def convert(platform: str, df: pd.DataFrame) -> pd.DataFrame:
+    return convert_by_platform(platform, df, DEFAULT_TEMPLATE_COLUMNS, DEFAULT_MAPPING)
+
+
+def measure(platform: str, df: pd.DataFrame) -> str:
+    best = min(_timed(convert, platform, df) for _ in range(3))
+    pool = pa.default_memory_pool() if pa is not None else None
+    if pool is not None:
+        n0, b0 = pool.num_allocations(), pool.total_bytes_allocated()
+    tracemalloc.start()
+    convert(platform, df)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    text = f"{best * 1000:7.1f}ms 최대 {peak / 2**20:5.1f}MB"
+    if pool is not None:
+        text += f" Arrow {pool.num_allocations() - n0:>4}회 {(pool.total_bytes_allocated() - b0) / 2**20:6.1f}MB"
+    return text
+
+
+def _timed(fn, *args) -> float:
+    t = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - t
+
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or [10000, 100000]
+    current = converters.text_column
+    for n in sizes:
+        df = make_source(n)
+        for platform in PLATFORMS:
+            row = [f"rows={n:>6} {platform:<10}"]
+            outputs = []
+            for label, fn in (("예전", legacy_text_column), ("text_column", current)):
+                converters.text_column = fn
+                try:
+                    row.append(f"{label} {measure(platform, df)}")
+                    outputs.append(convert(platform, df))
+                finally:
+                    converters.text_column = current
+            pd.testing.assert_frame_equal(*outputs)
+            print(" | ".join(row))
+
+
+if __name__ == "__main__":
+    main()
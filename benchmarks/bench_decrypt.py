@@ -0,0 +1,69 @@
+# bench_decrypt.py
+# 암호 걸린 스마트스토어 파일 복호화: msoffcrypto 매번 vs decrypt_bytes (복호화 결과 캐시 / 키 유도 재사용)
+# 실행: python benchmarks/bench_decrypt.py [행 수 ...]
+
+import io
+import os
+import random
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import msoffcrypto  # noqa: E402
+
+from excel_convert.decrypt import DECRYPT_CACHE, KEY_CACHE, decrypt_bytes  # noqa: E402
+from excel_convert.xlsx_writer import df_to_xlsx_bytes  # noqa: E402
+
+PASSWORD = "1234"
+
+
+def make_encrypted(n: int) -> bytes:
+    rnd = random.Random(0)
+    df = pd.DataFrame({
+        "주문번호": [f"2026{rnd.randrange(10**12):012d}" for _ in range(n)],
+        "수취인명": [f"고객{rnd.randrange(10**4)}" for _ in range(n)],
+        "수취인연락처1": [f"010-{rnd.randrange(10**4):04d}-{rnd.randrange(10**4):04d}" for _ in range(n)],
+        "통합배송지": [f"서울특별시 강남구 테헤란로 {rnd.randrange(500)}길" for _ in range(n)],
+    })
+    out = io.BytesIO()
+    msoffcrypto.OfficeFile(io.BytesIO(df_to_xlsx_bytes(df, engine="stream"))).encrypt(PASSWORD, out)
+    return out.getvalue()
+
+
+def plain_decrypt(data: bytes) -> bytes:
+    office_file = msoffcrypto.OfficeFile(io.BytesIO(data))
+    office_file.load_key(password=PASSWORD)
+    out = io.BytesIO()
+    office_file.decrypt(out)
+    return out.getvalue()
+
+
+def timed(fn, *args):
+    t = time.perf_counter()
+    out = fn(*args)
+    return time.perf_counter() - t, out
+
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or [1000, 10000, 100000]
+    for n in sizes:
+        data = make_encrypted(n)
+        DECRYPT_CACHE.clear()
+        KEY_CACHE.clear()
+        base_s, expected = timed(plain_decrypt, data)
+        cold_s, cold = timed(decrypt_bytes, data, PASSWORD)
+        hit_s, hit = timed(decrypt_bytes, data, PASSWORD)
+        DECRYPT_CACHE.clear()  # 복호화 결과는 없고 키 유도 결과만 남은 상태 (같은 솔트의 다른 파일과 같음)
+        key_s, key = timed(decrypt_bytes, data, PASSWORD)
+        assert expected == cold == hit == key
+        print(
+            f"rows={n:>6} ({len(data) / 1024:,.0f}KB)  msoffcrypto {base_s * 1000:7.1f}ms  처음 {cold_s * 1000:7.1f}ms  "
+            f"결과 캐시 {hit_s * 1000:6.2f}ms  키 재사용 {key_s * 1000:7.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# bench_numeric_alignment.py
+# 템플릿 숫자형 정렬: 예전(결과마다 템플릿 열 전체 재검사 + 이미 숫자인 수량도 다시 to_numeric) vs TemplateSchema
+# 실행: python benchmarks/bench_numeric_alignment.py [행 수 ...]
+#   - 템플릿: 예시 행이 있는 2.xlsx 모양 (수량·주문번호 숫자형, 전화번호도 숫자형이지만 제외 대상)
+#   - 작은 결과 여러 개(배치) / 큰 결과 하나 두 경우, 3회 중 최솟값. 결과가 같은지 확인
+
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import synthetic  # noqa: E402
+from excel_convert.converters import (  # noqa: E402
+    DEFAULT_TEMPLATE_COLUMNS,
+    TemplateSchema,
+    convert_by_platform,
+    post_numeric_alignment,
+)
+
+
+def template() -> pd.DataFrame:
+    return pd.DataFrame({"주문번호": [20260001], "받는분 이름": ["홍길동"], "받는분 주소": ["서울"],
+                         "받는분 전화번호": [1012345678], "상품명": ["사과"], "수량": [1], "메모": [""]},
+                        columns=DEFAULT_TEMPLATE_COLUMNS)
+
+
+def legacy_alignment(result_df: pd.DataFrame, template_columns, tpl_df: pd.DataFrame):
+    for col in template_columns:
+        if col in result_df.columns and col in tpl_df.columns and tpl_df[col].notna().any():
+            if pd.api.types.is_numeric_dtype(tpl_df[col]) and col != "받는분 전화번호":
+                result_df[col] = pd.to_numeric(result_df[col], errors="coerce")
+
+
+def best_of(fn, frames) -> float:
+    best = float("inf")
+    for _ in range(3):
+        copies = [f.copy() for f in frames]
+        t = time.perf_counter()
+        for f in copies:
+            fn(f)
+        best = min(best, time.perf_counter() - t)
+    return best
+
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or [100000]
+    tpl_df = template()
+    columns = list(tpl_df.columns)
+    schema = TemplateSchema.from_template(columns, tpl_df)
+    print(f"숫자로 맞출 열: {', '.join(schema.numeric)}")
+    for n in sizes:
+        big = convert_by_platform("COUPANG", synthetic.coupang_frame(n), columns)
+        small = [big.iloc[i:i + 50].reset_index(drop=True) for i in range(0, min(n, 50 * 500), 50)]
+        for label, frames in ((f"큰 결과 1개 ({n:,}행)", [big]), (f"작은 결과 {len(small)}개 (50행)", small)):
+            legacy = best_of(lambda f: legacy_alignment(f, columns, tpl_df), frames)
+            current = best_of(lambda f: post_numeric_alignment(f, schema), frames)
+            a, b = frames[0].copy(), frames[0].copy()
+            legacy_alignment(a, columns, tpl_df)
+            post_numeric_alignment(b, schema)
+            pd.testing.assert_frame_equal(a, b)
+            print(f"{label:<22} 예전 {legacy * 1000:8.1f}ms | 지금 {current * 1000:8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# bench_ss_direct_map.py
+# make_ss_filled_df 의 송장파일 직접 매칭 맵 생성: 행 단위 iloc 루프 vs 컬럼 단위 digits_key_map
+# 실행: python benchmarks/bench_ss_direct_map.py [행 수]
+
+import os
+import random
+import re
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from excel_convert.matching import digits_key_map, digits_series  # noqa: E402
+
+
+def _digits_only(x: str) -> str:
+    return re.sub(r"\D+", "", str(x or ""))
+
+
+def direct_map_loop(df_invoice, inv_order_col, inv_tracking_col):
+    # 기존 구현 (비교 기준)
+    direct_map = {}
+    for i in range(len(df_invoice)):
+        inv_order = str(df_invoice.iloc[i][inv_order_col])
+        inv_order_digits = _digits_only(inv_order)
+        inv_track = str(df_invoice.iloc[i][inv_tracking_col])
+        if inv_order_digits and inv_track and str(inv_track).lower() != "nan":
+            direct_map[inv_order_digits] = inv_track
+    return direct_map
+
+
+def make_invoice(n: int) -> pd.DataFrame:
+    rnd = random.Random(0)
+    orders, tracks = [], []
+    for i in range(n):
+        kind = rnd.random()
+        if kind < 0.4:
+            orders.append(f"2026{rnd.randrange(10**12):012d}")  # 스마트스토어 16자리
+        elif kind < 0.7:
+            orders.append(f"260106{rnd.randrange(10**6):06d}LOG{rnd.randrange(10**5):05d}")  # 라오
+        elif kind < 0.95:
+            orders.append(f"{rnd.randrange(10**11)}-{rnd.randrange(100)}")
+        else:
+            orders.append(orders[rnd.randrange(len(orders))] if orders else "")  # 중복
+        tracks.append("" if rnd.random() < 0.03 else f"{rnd.randrange(10**12):012d}")
+    return pd.DataFrame({"고객주문번호": orders, "운송장번호": tracks}, dtype=str)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    df = make_invoice(n)
+
+    t = time.perf_counter()
+    old = direct_map_loop(df, "고객주문번호", "운송장번호")
+    t_old = time.perf_counter() - t
+
+    t = time.perf_counter()
+    new = digits_key_map(digits_series(df["고객주문번호"]), df["운송장번호"])
+    t_new = time.perf_counter() - t
+
+    assert old == new, "결과가 다릅니다"
+    print(f"rows={n}  iloc loop {t_old:.3f}s  columnar {t_new:.4f}s  x{t_old / t_new:.0f}")
+
+
+if __name__ == "__main__":
+    main()
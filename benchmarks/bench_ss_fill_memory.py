@@ -0,0 +1,110 @@
+# bench_ss_fill_memory.py
+# 스마트스토어 송장 채우기 메모리: 예전(깊은 복사 + loc 쓰기 + 내보내기용 복사 + CSV 복사) vs 지금(얕은 사본 + 바뀐 열만 새 배열)
+# 실행: python benchmarks/bench_ss_fill_memory.py [행 수 ...]
+#   - 시간 / tracemalloc(파이썬 객체) 최대 / Arrow 메모리 풀 할당 바이트 / 원본과 메모리를 공유하는 열 수
+#   - object 열, pyarrow 문자열 열 두 가지 주문 파일로
+#   - 지금 경로가 송장번호/택배사 두 열만 새로 만들고, 최대 메모리(파이썬 + Arrow)가 예전보다 적은지 확인 (아니면 실패)
+
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError:  # pyarrow 없으면 object 주문 파일만
+    pa = None
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from excel_convert.invoice import SS_TRACKING_COL_NAME, make_ss_filled_df  # noqa: E402
+from excel_convert.text_columns import text_column  # noqa: E402
+
+COURIER = "CJ대한통운"
+N_COLS = 72  # 스마트스토어 발주(주문) 목록 열 수 정도
+
+
+def make_orders(n: int, storage: str) -> "tuple[pd.DataFrame, dict]":
+    rnd = random.Random(0)
+    orders = [f"2026{i:012d}" for i in range(n)]
+    data = {"주문번호": orders, SS_TRACKING_COL_NAME: [""] * n, "택배사": [""] * n}
+    for i in range(N_COLS - len(data)):
+        data[f"열{i + 1}"] = [f"값 {rnd.randrange(10**6)}" for _ in range(n)]
+    dtype = object if storage == "object" else pd.StringDtype("pyarrow", na_value=np.nan)
+    df = pd.DataFrame(data).astype(dtype)
+    ss_map = {o: f"{rnd.randrange(10**12):012d}" for o in orders if rnd.random() < 0.8}
+    return df, ss_map
+
+
+def legacy_fill(ss_map: dict, df: pd.DataFrame) -> pd.DataFrame:
+    """예전 경로: make_ss_filled_df(.copy + loc) → 앱에서 .copy + fill_courier → CSV 만들 때 .copy"""
+    out = df.copy()
+    is_empty = text_column(out[SS_TRACKING_COL_NAME]).str.strip().eq("")
+    mapped = text_column(out["주문번호"]).map(ss_map).fillna("")
+    out.loc[is_empty, SS_TRACKING_COL_NAME] = mapped[is_empty]
+    for frame in (out, out.copy()):
+        empty_mask = text_column(frame["택배사"]).str.strip().eq("")
+        frame.loc[empty_mask, "택배사"] = COURIER
+    return out.copy().copy()  # 내보내기용 사본 + CSV 사본 (마지막 값만 사용)
+
+
+def current_fill(ss_map: dict, df: pd.DataFrame) -> pd.DataFrame:
+    return make_ss_filled_df(ss_map, df, ["주문번호"], COURIER).copy(deep=False)  # CSV 는 얕은 사본
+
+
+def _data_buffer(ser: pd.Series) -> np.ndarray:
+    """열 값이 든 메모리 (pyarrow 문자열 열은 첫 청크의 문자 버퍼, 그 외는 numpy 배열)"""
+    chunked = getattr(ser.array, "_pa_array", None)
+    if chunked is not None and chunked.num_chunks:
+        return np.frombuffer(chunked.chunk(0).buffers()[-1], dtype=np.uint8)
+    return ser.to_numpy()
+
+
+def shared_columns(src: pd.DataFrame, out: pd.DataFrame) -> int:
+    return sum(np.shares_memory(_data_buffer(src[c]), _data_buffer(out[c])) for c in src.columns)
+
+
+def measure(fn, ss_map: dict, df: pd.DataFrame) -> "tuple[str, pd.DataFrame, int, int]":
+    """(표시 문자열, 결과, 최대 메모리 바이트(tracemalloc 최대 + Arrow 할당), 원본과 공유하는 열 수)"""
+    pool = pa.default_memory_pool() if pa is not None else None
+    b0 = pool.total_bytes_allocated() if pool is not None else 0
+    tracemalloc.start()
+    t = time.perf_counter()
+    out = fn(ss_map, df)
+    elapsed = time.perf_counter() - t
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    arrow = pool.total_bytes_allocated() - b0 if pool is not None else 0
+    shared = shared_columns(df, out)
+    text = f"{elapsed * 1000:7.1f}ms 최대 {peak / 2**20:6.1f}MB"
+    if pool is not None:
+        text += f" Arrow {arrow / 2**20:6.1f}MB"
+    text += f" 공유 열 {shared:>2}/{len(df.columns)}"
+    return text, out, peak + arrow, shared
+
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or [10000, 100000]
+    storages = ("object", "arrow") if pa is not None else ("object",)
+    for n in sizes:
+        for storage in storages:
+            df, ss_map = make_orders(n, storage)
+            before = df.copy()
+            legacy_text, legacy, legacy_peak, _ = measure(legacy_fill, ss_map, df)
+            current_text, current, current_peak, shared = measure(current_fill, ss_map, df)
+            print(f"rows={n:>6} {storage:<6} 예전 {legacy_text} | 지금 {current_text}")
+            pd.testing.assert_frame_equal(legacy, current)
+            pd.testing.assert_frame_equal(df, before)  # 원본 주문 파일은 그대로
+            # 전체 복사로 돌아가면 실패: 송장번호/택배사만 새 배열, 최대 메모리는 예전보다 적게
+            assert shared == len(df.columns) - 2, f"원본과 공유하는 열 {shared}/{len(df.columns)} (송장번호/택배사 외 열이 복사됨)"
+            assert current_peak < legacy_peak, (
+                f"최대 메모리 {current_peak / 2**20:.1f}MB ≥ 예전 {legacy_peak / 2**20:.1f}MB"
+            )
+
+
+if __name__ == "__main__":
+    main()
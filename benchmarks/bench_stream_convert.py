@@ -0,0 +1,106 @@
+# bench_stream_convert.py
+# 쿠팡 파일 변환 최대 메모리(tracemalloc): 전체 읽기 → 변환 → 쓰기 vs 행 묶음 변환 (convert_path)
+# 실행: python benchmarks/bench_stream_convert.py [행 수 ...]   (tracemalloc 때문에 평소보다 몇 배 느림)
+#   - 결과가 같은지 확인 + 헤더는 AC 열까지, 데이터는 AN 열까지인 쿠팡 파일도 같은지 확인 (AD/AE 가 'Unnamed' 열)
+
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+from openpyxl import Workbook
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from excel_convert.converters import (  # noqa: E402
+    DEFAULT_TEMPLATE_COLUMNS,
+    TemplateSchema,
+    convert_by_platform,
+    post_numeric_alignment,
+)
+from excel_convert.streaming import convert_path, output_columns  # noqa: E402
+from excel_convert.xlsx_reader import read_xlsx_as_text  # noqa: E402
+from excel_convert.xlsx_writer import df_to_xlsx_bytes  # noqa: E402
+
+N_COLS = 40
+
+
+def make_coupang(n: int) -> bytes:
+    """쿠팡 주문 목록 모양 (40열, P열=최초등록상품명) XLSX"""
+    rnd = random.Random(0)
+    columns = [f"열{i + 1}" for i in range(N_COLS)]
+    columns[15] = "최초등록상품명"
+    data = {c: [f"{c}-{rnd.randrange(10**6)}" for _ in range(n)] for c in columns}
+    data[columns[2]] = [f"2026{rnd.randrange(10**12):012d}" for _ in range(n)]
+    data[columns[22]] = [str(rnd.randrange(1, 5)) for _ in range(n)]
+    return df_to_xlsx_bytes(pd.DataFrame(data), engine="stream")
+
+
+def make_coupang_wide(n: int) -> bytes:
+    """헤더는 AC(29열)까지, 데이터 행은 AN(40열)까지 (pd.read_excel 이면 'Unnamed: 29' … 열)"""
+    rnd = random.Random(1)
+    wb = Workbook()
+    ws = wb.active
+    header = [f"열{i + 1}" for i in range(29)]
+    header[15] = "최초등록상품명"
+    ws.append(header)
+    for _ in range(n):
+        ws.append([f"v{rnd.randrange(10**6)}" for _ in range(N_COLS)])
+    buf = io.BytesIO()
+    wb.save(buf)
+    return buf.getvalue()
+
+
+def convert_in_memory(src: str, dst: str, schema: TemplateSchema):
+    template_columns = schema.template_columns
+    df = read_xlsx_as_text(src, cache=False)
+    out = convert_by_platform("COUPANG", df, template_columns)
+    post_numeric_alignment(out, schema)
+    with open(dst, "wb") as fh:
+        fh.write(df_to_xlsx_bytes(out[output_columns(template_columns, out)]))
+
+
+def measure(fn, *args):
+    tracemalloc.start()
+    t = time.perf_counter()
+    fn(*args)
+    elapsed = time.perf_counter() - t
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or [20000, 60000]
+    schema = TemplateSchema.from_template(DEFAULT_TEMPLATE_COLUMNS, pd.DataFrame(columns=DEFAULT_TEMPLATE_COLUMNS))
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "coupang.xlsx")
+        for n in sizes:
+            with open(src, "wb") as fh:
+                fh.write(make_coupang(n))
+            outs = {"memory": os.path.join(tmp, "a.xlsx"), "stream": os.path.join(tmp, "b.xlsx")}
+            row = [f"rows={n:>6} ({os.path.getsize(src) / 2**20:.1f}MB)"]
+            elapsed, peak = measure(convert_in_memory, src, outs["memory"], schema)
+            row.append(f"전체 {elapsed:6.2f}s 최대 {peak / 2**20:6.1f}MB")
+            elapsed, peak = measure(convert_path, src, outs["stream"], schema)
+            row.append(f"묶음 {elapsed:6.2f}s 최대 {peak / 2**20:6.1f}MB")
+            a, b = (read_xlsx_as_text(io.BytesIO(open(p, "rb").read()), cache=False) for p in outs.values())
+            pd.testing.assert_frame_equal(a, b)
+            print("  ".join(row))
+
+        # 헤더보다 넓은 데이터 행: 묶음 변환도 전체 읽기와 같은 'Unnamed' 열로 해석 (묶음 여러 개)
+        with open(src, "wb") as fh:
+            fh.write(make_coupang_wide(120))
+        convert_in_memory(src, outs["memory"], schema)
+        convert_path(src, outs["stream"], schema, chunksize=50)
+        a, b = (read_xlsx_as_text(io.BytesIO(open(p, "rb").read()), cache=False) for p in outs.values())
+        pd.testing.assert_frame_equal(a, b)
+        print(f"헤더보다 넓은 데이터 행: 같음 ({len(b)}행)")
+
+
+if __name__ == "__main__":
+    main()
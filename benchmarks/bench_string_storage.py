@@ -0,0 +1,87 @@
+# bench_string_storage.py
+# 소스 텍스트 열 저장 방식: 파이썬 str 객체(object) vs pyarrow 문자열 — 읽기 / 메모리 / 문자열 연산 / 변환 / 쓰기
+# 실행: python benchmarks/bench_string_storage.py [행 수 ...]
+
+import io
+import os
+import random
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from excel_convert.converters import DEFAULT_TEMPLATE_COLUMNS, convert_by_platform  # noqa: E402
+from excel_convert.matching import digits_series  # noqa: E402
+from excel_convert.text_columns import STRING_STORAGE_ENV, string_storage  # noqa: E402
+from excel_convert.xlsx_reader import read_xlsx_as_text  # noqa: E402
+from excel_convert.xlsx_writer import df_to_xlsx_bytes  # noqa: E402
+
+# 스마트스토어 주문 목록 모양 (키워드 열 + 나머지 텍스트 열)
+SS_HEADERS = {0: "주문번호", 3: "수취인명", 4: "상품명", 5: "옵션정보", 6: "통합배송지", 7: "수취인연락처1",
+              8: "수량", 9: "배송메세지"}
+
+
+def make_source(n: int) -> bytes:
+    rnd = random.Random(0)
+    columns = [SS_HEADERS.get(i, f"열{i + 1}") for i in range(40)]
+    data = {c: [f"{c} {rnd.randrange(10**6)}" for _ in range(n)] for c in columns}
+    data["주문번호"] = [f"2026{rnd.randrange(10**12):012d}" for _ in range(n)]
+    data["수취인연락처1"] = [f"010-{rnd.randrange(10**4):04d}-{rnd.randrange(10**4):04d}" for _ in range(n)]
+    data["수량"] = [str(rnd.randrange(1, 5)) for _ in range(n)]
+    return df_to_xlsx_bytes(pd.DataFrame(data), engine="stream")
+
+
+def timed(fn, *args, repeat: int = 3):
+    best, out = None, None
+    for _ in range(repeat):
+        t = time.perf_counter()
+        out = fn(*args)
+        elapsed = time.perf_counter() - t
+        best = elapsed if best is None else min(best, elapsed)
+    return best, out
+
+
+def run(data: bytes) -> dict:
+    read_s, df = timed(lambda: read_xlsx_as_text(io.BytesIO(data), cache=False), repeat=1)
+    mem = df.memory_usage(index=False, deep=True).sum()
+    digits_s, _ = timed(digits_series, df["주문번호"])
+    contains_s, _ = timed(lambda: df["배송메세지"].str.contains("1", regex=False).sum())
+    convert_s, out = timed(convert_by_platform, "SMARTSTORE", df, DEFAULT_TEMPLATE_COLUMNS)
+    write_s, xlsx = timed(df_to_xlsx_bytes, out, None, "stream", repeat=1)
+    return {
+        "frame": out, "xlsx": xlsx,
+        "text": (f"읽기 {read_s:5.2f}s 메모리 {mem / 2**20:6.1f}MB 숫자키 {digits_s * 1000:6.1f}ms "
+                 f"contains {contains_s * 1000:6.1f}ms 변환 {convert_s * 1000:6.1f}ms 쓰기 {write_s:5.2f}s"),
+    }
+
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or [10000, 100000]
+    saved = os.environ.get(STRING_STORAGE_ENV)
+    try:
+        for n in sizes:
+            data = make_source(n)
+            results = {}
+            for mode in ("object", "arrow"):
+                os.environ[STRING_STORAGE_ENV] = mode
+                if string_storage() != mode:
+                    print(f"rows={n:>6} {mode:<6} (pyarrow 없음 — 건너뜀)")
+                    continue
+                results[mode] = run(data)
+                print(f"rows={n:>6} {mode:<6} {results[mode]['text']}")
+            if len(results) == 2:
+                a, b = results["object"], results["arrow"]
+                pd.testing.assert_frame_equal(a["frame"], b["frame"], check_dtype=False)
+                pd.testing.assert_frame_equal(*(read_xlsx_as_text(io.BytesIO(r["xlsx"]), cache=False)
+                                                for r in (a, b)))
+    finally:
+        if saved is None:
+            os.environ.pop(STRING_STORAGE_ENV, None)
+        else:
+            os.environ[STRING_STORAGE_ENV] = saved
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+# bench_suite.py
+# 전체 흐름 벤치마크: 가짜 주문/송장 파일(synthetic.py)로 플랫폼별 단계 시간 + 최대 RSS
+# 실행: python benchmarks/bench_suite.py [행 수 ...] [--platforms SMARTSTORE,COUPANG] [--keep 폴더]
+#   - 기본 1,000 / 10,000 / 100,000 행. 라오라, 쿠팡, 스마트스토어(암호), 떠리몰 + 송장파일(플랫폼별 행 수 × 4 × 0.9)
+#   - 단계: 복호화(스마트스토어) / 읽기 / 변환 / 저장 / 송장 채우기(송장등록) / 송장 저장
+#     송장파일 행은 읽기 / 조회표(build_invoice_index)
+#   - 경우마다 새 프로세스에서 실행하므로 최대 RSS 는 그 경우만의 값 (괄호 안은 import 직후 대비 증가분,
+#     플랫폼 행은 송장 채우기에 쓰는 송장파일 읽기까지 포함)
+#   - --keep: 만든 파일을 폴더에 남김 (앱에 직접 올려 볼 때)
+
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import Dict, List, Tuple
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import synthetic  # noqa: E402
+from excel_convert.converters import (  # noqa: E402
+    DEFAULT_MAPPING,
+    DEFAULT_TEMPLATE_COLUMNS,
+    TemplateSchema,
+    convert_by_platform,
+    post_numeric_alignment,
+)
+from excel_convert.decrypt import decrypt_bytes  # noqa: E402
+from excel_convert.invoice import (  # noqa: E402
+    build_invoice_index,
+    make_cp_filled_df_by_letters,
+    make_lao_invoice_df,
+    make_ss_filled_df,
+    make_tm_filled_df,
+)
+from excel_convert.streaming import output_columns  # noqa: E402
+from excel_convert.xlsx_reader import read_xlsx_as_text  # noqa: E402
+from excel_convert.xlsx_writer import df_to_xlsx_bytes  # noqa: E402
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+# final.py 송장등록과 같은 설정
+ORDER_KEYS_INVOICE = ["주문번호", "주문ID", "주문코드", "주문번호1", "고객주문번호"]
+SS_ORDER_KEYS = ["상품주문번호", "주문번호"]
+SCHEMA = TemplateSchema.from_template(DEFAULT_TEMPLATE_COLUMNS, pd.DataFrame(columns=DEFAULT_TEMPLATE_COLUMNS))
+STAGE_LABELS = {"decrypt": "복호화", "read": "읽기", "convert": "변환", "write": "저장", "index": "조회표",
+                "fill": "송장 채우기", "fill_write": "송장 저장"}
+
+
+def reset_peak_rss():
+    """리눅스: 최대 RSS 기록을 지금 값으로 되돌림 (새 프로세스도 부모의 기록을 물려받으므로)"""
+    try:
+        with open("/proc/self/clear_refs", "w") as fh:
+            fh.write("5")
+    except OSError:
+        pass
+
+
+def peak_rss_bytes() -> int:
+    """이 프로세스의 최대 RSS (리눅스 VmHWM / 그 외 resource·psutil, 둘 다 없으면 0)"""
+    try:
+        with open("/proc/self/status") as fh:
+            for line in fh:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        try:
+            import psutil
+        except ImportError:
+            return 0
+        info = psutil.Process().memory_info()
+        return int(getattr(info, "peak_wset", info.rss))
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _fill(platform: str, index, df):
+    if platform == "LAORA":
+        return make_lao_invoice_df(index.lao, "04")
+    if platform == "SMARTSTORE":
+        return make_ss_filled_df(index.ss_by_digits, df, SS_ORDER_KEYS, "CJ대한통운", index)
+    if platform == "COUPANG":
+        return make_cp_filled_df_by_letters(index, df)
+    return make_tm_filled_df(df, index.by_order)
+
+
+def run_case(platform: str, path: str, invoice_path: str) -> Tuple[Dict[str, float], int, int, int]:
+    """경우 하나 (작업자 프로세스에서 실행). 반환: (단계별 초, 행 수, 시작 RSS, 최대 RSS)"""
+    reset_peak_rss()
+    base_rss = peak_rss_bytes()
+    timings: Dict[str, float] = {}
+    with open(path, "rb") as fh:
+        data = fh.read()
+    with open(invoice_path, "rb") as fh:
+        invoice = fh.read()
+
+    t = time.perf_counter()
+    if platform == "INVOICE":
+        df = read_xlsx_as_text(io.BytesIO(invoice), cache=False)
+        timings["read"] = time.perf_counter() - t
+        t = time.perf_counter()
+        build_invoice_index(df, ORDER_KEYS_INVOICE)
+        timings["index"] = time.perf_counter() - t
+        return timings, len(df), base_rss, peak_rss_bytes()
+
+    skiprows = 0
+    if platform == "SMARTSTORE":
+        data = decrypt_bytes(data, synthetic.SS_PASSWORD)
+        skiprows = 1
+        timings["decrypt"] = time.perf_counter() - t
+        t = time.perf_counter()
+    df = read_xlsx_as_text(io.BytesIO(data), skiprows=skiprows, cache=False)
+    timings["read"] = time.perf_counter() - t
+
+    t = time.perf_counter()
+    out = convert_by_platform(platform, df, DEFAULT_TEMPLATE_COLUMNS, DEFAULT_MAPPING)
+    post_numeric_alignment(out, SCHEMA)
+    timings["convert"] = time.perf_counter() - t
+
+    t = time.perf_counter()
+    df_to_xlsx_bytes(out[output_columns(DEFAULT_TEMPLATE_COLUMNS, out)])
+    timings["write"] = time.perf_counter() - t
+
+    # 송장등록: 조회표 만들기는 송장파일 행에서 따로 재므로 여기서는 채우기/저장만
+    index = build_invoice_index(read_xlsx_as_text(io.BytesIO(invoice), cache=False), ORDER_KEYS_INVOICE)
+    t = time.perf_counter()
+    filled = _fill(platform, index, df)
+    timings["fill"] = time.perf_counter() - t
+    t = time.perf_counter()
+    df_to_xlsx_bytes(filled)
+    timings["fill_write"] = time.perf_counter() - t
+    return timings, len(df), base_rss, peak_rss_bytes()
+
+
+def make_files(n: int, platforms: List[str], folder: str) -> Dict[str, str]:
+    paths = {}
+    for platform in platforms + ["INVOICE"]:
+        if platform == "INVOICE":
+            data = synthetic.invoice_workbook(n)
+        elif platform == "SMARTSTORE":
+            data = synthetic.smartstore_encrypted(n)
+        else:
+            data = synthetic.workbook(platform, n)
+        paths[platform] = os.path.join(folder, f"{platform.lower()}_{n}.xlsx")
+        with open(paths[platform], "wb") as fh:
+            fh.write(data)
+    return paths
+
+
+def report(n: int, platform: str, path: str, result) -> str:
+    timings, rows, base_rss, peak_rss = result
+    stages = " · ".join(f"{STAGE_LABELS[k]} {v:6.2f}s" for k, v in timings.items())
+    total = sum(timings.values())
+    rss = f"최대 RSS {peak_rss / 2**20:6.0f}MB (+{(peak_rss - base_rss) / 2**20:.0f})" if peak_rss else "RSS 측정 불가"
+    return (f"n={n:>6} {platform:<10} {rows:>7}행 {os.path.getsize(path) / 2**20:6.1f}MB | "
+            f"합계 {total:6.2f}s | {stages} | {rss}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="가짜 주문/송장 파일로 단계별 시간·최대 RSS 측정")
+    parser.add_argument("sizes", nargs="*", type=int, default=DEFAULT_SIZES, help="플랫폼별 주문 행 수")
+    parser.add_argument("--platforms", default=",".join(synthetic.PLATFORMS), help="쉼표로 구분")
+    parser.add_argument("--keep", help="만든 파일을 남길 폴더")
+    args = parser.parse_args()
+    platforms = [p.strip().upper() for p in args.platforms.split(",") if p.strip()]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = args.keep or tmp
+        os.makedirs(folder, exist_ok=True)
+        for n in args.sizes:
+            t = time.perf_counter()
+            paths = make_files(n, platforms, folder)
+            print(f"n={n:>6} 파일 생성 {time.perf_counter() - t:.1f}s")
+            for platform in platforms + ["INVOICE"]:
+                # 최대 RSS 가 경우마다 따로 잡히도록 새 프로세스 하나씩
+                with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+                    result = pool.submit(run_case, platform, paths[platform], paths["INVOICE"]).result()
+                print(report(n, platform, paths[platform], result), flush=True)
+
+
+if __name__ == "__main__":
+    main()
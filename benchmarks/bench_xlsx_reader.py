@@ -0,0 +1,71 @@
+# bench_xlsx_reader.py
+# 원본 읽기: pd.read_excel(openpyxl, dtype=str) vs read_xlsx_as_text
+# 실행: python benchmarks/bench_xlsx_reader.py [행 수 ...]
+#   - 먼저 헤더 규칙 확인: 빈/중복/'이름.1' 이 이미 있는 헤더가 read_excel 과 같은 컬럼명이 되는지
+#   - 플랫폼별 가짜 주문 파일(synthetic.py)로 읽기 시간 비교 + 결과가 같은지 확인
+
+import io
+import os
+import sys
+import time
+
+import pandas as pd
+from openpyxl import Workbook
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import synthetic  # noqa: E402
+from excel_convert.xlsx_reader import read_xlsx_as_text  # noqa: E402
+
+HEADER_CASES = [
+    ["a", None, "a", "a.1", "a"],
+    ["x", "y", "x", "x"],
+    [None, "Unnamed: 0", None, "b", "b.1", "b"],
+    ["상품명", "상품명", "상품명.1", None, "상품명"],
+    [1, 1, "1.1", 2.5, None],
+]
+
+
+def read_excel_text(data: bytes) -> pd.DataFrame:
+    return pd.read_excel(io.BytesIO(data), sheet_name=0, header=0, dtype=str, keep_default_na=False,
+                         engine="openpyxl")
+
+
+def header_workbook(header) -> bytes:
+    wb = Workbook()
+    ws = wb.active
+    ws.append(header)
+    ws.append([f"v{i}" for i in range(len(header))])
+    buf = io.BytesIO()
+    wb.save(buf)
+    return buf.getvalue()
+
+
+def check_headers():
+    for header in HEADER_CASES:
+        data = header_workbook(header)
+        expected = list(read_excel_text(data).columns)
+        got = list(read_xlsx_as_text(data, cache=False).columns)
+        assert got == expected, f"헤더 {header}: read_excel {expected} / read_xlsx_as_text {got}"
+    print(f"헤더 규칙 {len(HEADER_CASES)}건 read_excel 과 같음")
+
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or [1000, 10000]
+    check_headers()
+    for n in sizes:
+        for platform in ("LAORA", "COUPANG", "TTARIMALL"):
+            data = synthetic.workbook(platform, n)
+            t = time.perf_counter()
+            a = read_excel_text(data)
+            legacy = time.perf_counter() - t
+            t = time.perf_counter()
+            b = read_xlsx_as_text(data, cache=False)
+            current = time.perf_counter() - t
+            pd.testing.assert_frame_equal(a, b, check_dtype=False)
+            print(f"{platform:<10} rows={n:>6}  read_excel {legacy:6.2f}s | read_xlsx_as_text {current:6.2f}s")
+
+
+if __name__ == "__main__":
+    main()
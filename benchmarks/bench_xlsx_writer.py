@@ -0,0 +1,48 @@
+# bench_xlsx_writer.py
+# 변환 결과(템플릿 7열) XLSX 쓰기: openpyxl(pd.ExcelWriter) vs 스트리밍 엔진
+# 실행: python benchmarks/bench_xlsx_writer.py [행 수 ...]
+
+import io
+import os
+import random
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from excel_convert.xlsx_reader import read_xlsx_as_text  # noqa: E402
+from excel_convert.xlsx_writer import df_to_xlsx_bytes  # noqa: E402
+
+
+def make_result(n: int) -> pd.DataFrame:
+    rnd = random.Random(0)
+    return pd.DataFrame({
+        "주문번호": [f"2026{rnd.randrange(10**12):012d}" for _ in range(n)],
+        "받는분 이름": [f"고객{rnd.randrange(10**4)}" for _ in range(n)],
+        "받는분 주소": [f"서울특별시 강남구 테헤란로 {rnd.randrange(500)}길 {rnd.randrange(99)}" for _ in range(n)],
+        "받는분 전화번호": [f"010-{rnd.randrange(10**4):04d}-{rnd.randrange(10**4):04d}" for _ in range(n)],
+        "상품명": [f"상품 {rnd.randrange(300)} / 옵션 {rnd.randrange(5)}" for _ in range(n)],
+        "수량": [float(rnd.randrange(1, 5)) for _ in range(n)],
+        "메모": ["" if rnd.random() < 0.6 else "문 앞에 놓아주세요" for _ in range(n)],
+    })
+
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or [1000, 10000, 100000]
+    for n in sizes:
+        df = make_result(n)
+        row = [f"rows={n:>6}"]
+        outputs = {}
+        for engine in ("openpyxl", "stream"):
+            t = time.perf_counter()
+            outputs[engine] = df_to_xlsx_bytes(df, "발송처리", engine=engine)
+            row.append(f"{engine} {time.perf_counter() - t:6.2f}s ({len(outputs[engine]) / 1024:,.0f}KB)")
+        a, b = (read_xlsx_as_text(io.BytesIO(outputs[e]), cache=False) for e in ("openpyxl", "stream"))
+        pd.testing.assert_frame_equal(a, b)
+        print("  ".join(row))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+# synthetic.py
+# 벤치마크용 가짜 주문/송장 파일 (라오라, 쿠팡, 스마트스토어(암호 포함), 떠리몰, 송장파일)
+#   - 열 위치/헤더는 변환기가 쓰는 매핑과 같게: DEFAULT_MAPPING / COUPANG_MAPPING / SS_NAME_MAP /
+#     TTARIMALL_FIXED_LETTER_MAPPING 의 열 문자·키워드 자리에 값을 넣고, 나머지는 채움 열
+#   - 플랫폼 판별(detect_platform_by_headers)이 의도한 플랫폼으로 나오도록 신호 헤더를 둔다
+#   - 같은 (플랫폼, 행 수) 면 항상 같은 내용 (random.Random(행 수))
+#   - 송장파일은 네 플랫폼 주문번호를 섞어 만든다 (P열 = 주문번호, 쿠팡 매칭용)
+
+import io
+import os
+import random
+import sys
+from typing import Dict, List
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from excel_convert.converters import (  # noqa: E402
+    COUPANG_MAPPING,
+    DEFAULT_MAPPING,
+    SS_NAME_MAP,
+    TTARIMALL_FIXED_LETTER_MAPPING,
+)
+from excel_convert.projection import excel_col_to_index  # noqa: E402
+from excel_convert.xlsx_writer import df_to_xlsx_bytes  # noqa: E402
+
+PLATFORMS = ("LAORA", "COUPANG", "SMARTSTORE", "TTARIMALL")
+SS_PASSWORD = "1234"
+
+# 템플릿 컬럼 → 소스 헤더 (열 문자 매핑 플랫폼은 헤더 이름이 변환에 쓰이지 않으므로 실제 파일과 비슷한 이름만)
+_LAORA_HEADERS = {"주문번호": "주문번호", "받는분 이름": "받는사람", "받는분 주소": "받는사람 주소",
+                  "받는분 전화번호": "받는사람 연락처", "상품명": "상품명", "수량": "주문수량", "메모": "배송 요청사항"}
+_COUPANG_HEADERS = {"주문번호": "주문번호", "받는분 이름": "수취인이름", "받는분 주소": "수취인 주소",
+                    "받는분 전화번호": "수취인전화번호", "상품명": "최초등록상품명", "수량": "구매수(수량)",
+                    "메모": "배송메세지"}
+_TTARIMALL_HEADERS = {"주문번호": "주문번호", "받는분 이름": "수령자명", "받는분 주소": "수령자주소",
+                      "받는분 전화번호": "수령자연락처", "상품명": "옵션명:옵션값", "수량": "수량", "메모": "배송메모"}
+_SS_COLUMNS = 60  # 스마트스토어 발주(주문) 목록은 열이 많다
+_SS_FIXED = {0: "상품주문번호", 1: "주문번호", 2: "배송방법", 3: "택배사", 4: "송장번호"}
+
+_NAMES = ["김민준", "이서연", "박도윤", "최서윤", "정하준", "강지우", "조은우", "윤수아"]
+_STREETS = ["서울특별시 강남구 테헤란로", "경기도 성남시 분당구 판교역로", "부산광역시 해운대구 센텀중앙로",
+            "대구광역시 수성구 달구벌대로", "인천광역시 연수구 송도과학로"]
+_PRODUCTS = ["유기농 사과 3kg", "제주 감귤 5kg", "국산 햇양파 10kg", "무농약 방울토마토 2kg", "고당도 배 7.5kg"]
+_OPTIONS = ["선택: 가정용", "선택: 선물용", "중량: 소과", "중량: 대과", ""]
+_MEMOS = ["문 앞에 놓아주세요", "부재 시 경비실", "배송 전 연락 바랍니다", "", ""]
+
+
+def order_ids(platform: str, n: int) -> List[str]:
+    """플랫폼별 주문번호 모양 (송장파일 분류 규칙과 맞춤: 라오 'LO', 스마트스토어 숫자 16자리)"""
+    if platform == "LAORA":
+        return [f"LO2026{i:08d}" for i in range(n)]
+    if platform == "COUPANG":
+        return [f"30{i:011d}" for i in range(n)]  # 13자리
+    if platform == "SMARTSTORE":
+        return [f"2026{i:012d}" for i in range(n)]  # 16자리
+    return [f"TM{i:09d}" for i in range(n)]
+
+
+def _values(rnd: random.Random, kind: str, n: int) -> List[str]:
+    if kind == "이름":
+        return [rnd.choice(_NAMES) for _ in range(n)]
+    if kind == "주소":
+        return [f"{rnd.choice(_STREETS)} {rnd.randrange(1, 500)}, {rnd.randrange(101, 2000)}호" for _ in range(n)]
+    if kind == "전화":
+        return [f"010-{rnd.randrange(10**4):04d}-{rnd.randrange(10**4):04d}" for _ in range(n)]
+    if kind == "상품":
+        return [rnd.choice(_PRODUCTS) for _ in range(n)]
+    if kind == "옵션":
+        return [rnd.choice(_OPTIONS) for _ in range(n)]
+    if kind == "수량":
+        return [str(rnd.randrange(1, 5)) for _ in range(n)]
+    if kind == "메모":
+        return [rnd.choice(_MEMOS) for _ in range(n)]
+    if kind == "빈칸":
+        return [""] * n
+    return [f"{kind}-{rnd.randrange(10**6)}" if rnd.random() > 0.1 else "" for _ in range(n)]
+
+
+_KINDS = {"받는분 이름": "이름", "받는분 주소": "주소", "받는분 전화번호": "전화", "상품명": "상품", "수량": "수량",
+          "메모": "메모"}
+
+
+def _letter_frame(platform: str, n: int, mapping: Dict[str, str], headers: Dict[str, str], n_cols: int,
+                  extra: Dict[int, tuple] = None) -> pd.DataFrame:
+    """열 문자 매핑 자리에 값, 나머지는 채움 열. extra: {0-based 위치: (헤더, 값 종류)}"""
+    rnd = random.Random(n)
+    columns: List[str] = [f"열{i + 1}" for i in range(n_cols)]
+    kinds: Dict[int, str] = {}
+    for key, letters in mapping.items():
+        idx = excel_col_to_index(letters)
+        columns[idx] = headers[key]
+        kinds[idx] = _KINDS.get(key, key)
+    for idx, (header, kind) in (extra or {}).items():
+        columns[idx] = header
+        kinds[idx] = kind
+    data = {}
+    for i, col in enumerate(columns):
+        kind = kinds.get(i, col)
+        data[col] = order_ids(platform, n) if kind == "주문번호" else _values(rnd, kind, n)
+    return pd.DataFrame(data)
+
+
+def laora_frame(n: int) -> pd.DataFrame:
+    return _letter_frame("LAORA", n, DEFAULT_MAPPING, _LAORA_HEADERS, 20)
+
+
+def coupang_frame(n: int) -> pd.DataFrame:
+    # E열: 운송장번호 (송장등록에서 채우는 칸)
+    return _letter_frame("COUPANG", n, COUPANG_MAPPING, _COUPANG_HEADERS, 40, {4: ("운송장번호", "빈칸")})
+
+
+def ttarimall_frame(n: int) -> pd.DataFrame:
+    # S열: 상품명 (V열 옵션과 비교), 송장번호 열 (송장등록에서 채움)
+    return _letter_frame("TTARIMALL", n, TTARIMALL_FIXED_LETTER_MAPPING, _TTARIMALL_HEADERS, 34,
+                         {excel_col_to_index("S"): ("상품명", "상품"), 33: ("송장번호", "빈칸")})
+
+
+def smartstore_frame(n: int) -> pd.DataFrame:
+    """키워드 매핑이라 위치는 자유: SS_NAME_MAP 후보의 첫 이름을 헤더로"""
+    rnd = random.Random(n)
+    columns = [f"열{i + 1}" for i in range(_SS_COLUMNS)]
+    kinds: Dict[int, str] = {}
+    for i, header in _SS_FIXED.items():
+        columns[i] = header
+    for pos, (key, kind) in enumerate([("받는분 이름", "이름"), ("상품명_left", "상품"), ("상품명_right", "옵션"),
+                                       ("수량", "수량"), ("받는분 전화번호", "전화"), ("받는분 주소", "주소"),
+                                       ("메모", "메모")], start=10):
+        columns[pos] = SS_NAME_MAP[key][0]
+        kinds[pos] = kind
+    orders = order_ids("SMARTSTORE", n)
+    data = {}
+    for i, col in enumerate(columns):
+        if col == "상품주문번호":
+            data[col] = orders
+        elif col == "주문번호":
+            data[col] = [o[:-2] + "00" for o in orders]  # 주문 하나에 상품주문 여러 개인 모양
+        elif col in ("택배사", "송장번호"):
+            data[col] = [""] * n
+        else:
+            data[col] = _values(rnd, kinds.get(i, col), n)
+    return pd.DataFrame(data)
+
+
+FRAMES = {"LAORA": laora_frame, "COUPANG": coupang_frame, "SMARTSTORE": smartstore_frame,
+          "TTARIMALL": ttarimall_frame}
+
+
+def workbook(platform: str, n: int) -> bytes:
+    return df_to_xlsx_bytes(FRAMES[platform](n), engine="stream")
+
+
+def smartstore_encrypted(n: int, password: str = SS_PASSWORD) -> bytes:
+    """스마트스토어 다운로드 파일 모양: 첫 행은 제목 행(읽을 때 skiprows=1), 비밀번호 암호화"""
+    import msoffcrypto
+
+    df = smartstore_frame(n)
+    titled = pd.concat([pd.DataFrame([list(df.columns)], columns=df.columns), df], ignore_index=True)
+    titled.columns = ["발주발송관리"] + [f"제목{i}" for i in range(1, len(df.columns))]
+    out = io.BytesIO()
+    msoffcrypto.OfficeFile(io.BytesIO(df_to_xlsx_bytes(titled, engine="stream"))).encrypt(password, out)
+    return out.getvalue()
+
+
+def invoice_frame(n: int) -> pd.DataFrame:
+    """송장파일: 네 플랫폼 주문 n 건씩 중 90% 에 송장번호 (A 주문번호, B 송장번호, P 주문번호)"""
+    rnd = random.Random(n)
+    orders = [o for p in PLATFORMS for o in order_ids(p, n) if rnd.random() < 0.9]
+    rnd.shuffle(orders)
+    columns = ["주문번호", "송장번호"] + [f"열{i}" for i in range(3, 16)] + ["고객주문번호"]
+    data = {c: _values(rnd, c, len(orders)) for c in columns[2:-1]}
+    data["주문번호"] = orders
+    data["송장번호"] = [f"{rnd.randrange(10**4):04d}-{rnd.randrange(10**4):04d}-{rnd.randrange(10**4):04d}"
+                     for _ in orders]
+    data["고객주문번호"] = orders
+    return pd.DataFrame(data, columns=columns)
+
+
+def invoice_workbook(n: int) -> bytes:
+    return df_to_xlsx_bytes(invoice_frame(n), engine="stream")
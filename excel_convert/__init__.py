@@ -0,0 +1 @@
+"""엑셀 변환기 공용 모듈 (Streamlit 앱에서 import 해서 사용, 명령줄: python -m excel_convert)"""
@@ -0,0 +1,8 @@
+"""python -m excel_convert ... (excel_convert.cli 참고)"""
+
+import sys
+
+from excel_convert.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,25 @@
+# atomic.py
+# 같은 폴더의 임시 파일에 쓰고 교체 (읽는 쪽에서 반쯤 쓴 파일이 보이지 않음)
+#   - 배치 결과/ZIP, 묶음 변환 결과, 양식·템플릿 등록부 JSON 이 함께 사용
+#   - 실패(예외·중단)하면 임시 파일을 지우고 원래 파일은 그대로
+
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import IO, Iterator, Optional
+
+
+@contextmanager
+def atomic_file(path: str, mode: str = "wb", encoding: Optional[str] = None,
+                prefix: str = ".excel-convert-", suffix: str = ".tmp") -> Iterator[IO]:
+    """임시 파일 핸들을 내주고, 블록이 정상으로 끝나면 path 로 교체 (스트림으로 흘려 쓸 때도 그대로)"""
+    folder = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=folder, prefix=prefix, suffix=suffix)
+    try:
+        with os.fdopen(fd, mode, encoding=encoding) as fh:
+            yield fh
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
@@ -0,0 +1,199 @@
+# batch.py
+# 배치 변환: 파일별 헤더 확인 → 플랫폼 판별 → 필요한 열만 읽기 → 변환 → XLSX 저장 을 작업자 프로세스 풀에서 실행
+#   - 헤더 행만 먼저 읽어(공유문자열도 헤더에 필요한 만큼만) 양식/필요 열을 정한 뒤 본문은 그 열만 파싱
+#   - 결과는 입력 순서 그대로 반환 (ZIP 순서 고정)
+#   - 파일별 단계 기록(시간/행 수/메모리, excel_convert.perf)을 로그 줄과 ZIP 의 batch_trace.json 에 함께
+#   - 결과 ZIP(변환 파일 + 로그) 만들기까지 여기서 (앱과 명령줄이 같이 사용)
+#   - 쿠팡/떠리몰은 행 묶음 단위로 읽기 → 변환 → 쓰기 (excel_convert.streaming 참고)
+
+import io
+import multiprocessing
+import os
+import zipfile
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from excel_convert.atomic import atomic_file
+from excel_convert.converters import TemplateSchema, convert_by_platform, post_numeric_alignment
+from excel_convert.layouts import LAYOUTS, Layout
+from excel_convert.perf import STAGE_LABELS, Trace, traces_json
+from excel_convert.projection import read_header
+from excel_convert.streaming import STREAM_PLATFORMS, chunks_to_xlsx_bytes, iter_converted_chunks, output_columns
+from excel_convert.xlsx_reader import read_xlsx_as_text
+from excel_convert.xlsx_writer import df_to_xlsx_bytes
+
+
+def default_jobs() -> int:
+    return max(1, min(4, os.cpu_count() or 1))
+
+
+@dataclass
+class BatchResult:
+    name: str
+    platform: Optional[str] = None
+    out_name: Optional[str] = None
+    xlsx: Optional[bytes] = None
+    rows: int = 0
+    error: Optional[str] = None
+    trace: Optional[Trace] = None  # 단계별 시간/행 수/메모리 (excel_convert.perf)
+    new_layout: Optional[Layout] = None  # 처음 본 헤더 양식이면 등록할 Layout
+
+    @property
+    def timings(self) -> Dict[str, float]:
+        return self.trace.timings() if self.trace is not None else {}
+
+    def timing_text(self) -> str:
+        parts = [f"{STAGE_LABELS[k]} {v:.2f}s" for k, v in self.timings.items()]
+        return f" ({' · '.join(parts)})" if parts else ""
+
+    def log_line(self) -> str:
+        platform = f"{self.platform} (새 양식)" if self.new_layout is not None else self.platform
+        if self.error is None:
+            return f"[OK]   {self.name}: {platform} → rows={self.rows} → {self.out_name}{self.timing_text()}"
+        if self.platform is None:
+            return f"[FAIL] {self.name}: 파일 읽기 오류 - {self.error}{self.timing_text()}"
+        return f"[FAIL] {self.name}: {platform} 처리 중 오류 - {self.error}{self.timing_text()}"
+
+
+def convert_file(
+    name: str,
+    data: bytes,
+    schema: TemplateSchema,
+    laora_mapping: Optional[Dict[str, str]],
+    trace_memory: bool = False,
+) -> BatchResult:
+    """파일 하나를 끝까지 처리. 예외는 결과에 담아 돌려준다 (작업자 프로세스에서 호출)"""
+    template_columns = schema.template_columns
+    res = BatchResult(name=name, trace=Trace(name, memory=trace_memory))
+    trace = res.trace
+    try:
+        with trace.stage("sniff"):
+            book, columns = read_header(data, cache=False)  # 한 번 읽고 끝 (작업자/앱 파싱 캐시를 채우지 않음)
+    except Exception as e:
+        res.error = str(e)
+        return res
+
+    # 아는 헤더 양식이면 등록부에서 바로, 아니면 판별/해석 후 새 양식으로 표시
+    with trace.stage("detect"):
+        layout = LAYOUTS.lookup(columns)
+    res.platform = layout.platform
+    if layout.new:
+        res.new_layout = layout
+    base = name.rsplit(".", 1)[0]
+    try:
+        if res.platform in STREAM_PLATFORMS:
+            # 원본/결과 전체를 들고 있지 않도록 묶음마다 읽기 → 변환 → 쓰기 (단계 시간은 합쳐서)
+            with trace.stage("stream") as stage:
+                chunks = iter_converted_chunks(book, res.platform, columns, layout.usecols(laora_mapping),
+                                               schema, laora_mapping)
+                res.xlsx, res.rows = chunks_to_xlsx_bytes(chunks)
+                stage.rows = res.rows
+            res.out_name = f"{base}__{res.platform.lower()}_converted.xlsx"
+            return res
+
+        # 본문은 변환에 쓰는 열만 파싱 (열 문자 → 컬럼명 해석은 전체 헤더 목록으로)
+        # 파싱 캐시는 쓰지 않음: jobs=1 이면 앱 프로세스에서 돌아 단일 변환 화면의 캐시 항목을 밀어냄
+        with trace.stage("read") as stage:
+            df = read_xlsx_as_text(book, usecols=layout.usecols(laora_mapping), cache=False)
+            stage.rows = len(df)
+
+        with trace.stage("convert", rows=len(df)):
+            out_df = convert_by_platform(
+                res.platform, df, template_columns, laora_mapping, layout.column_names(columns), columns,
+            )
+        with trace.stage("align", rows=len(out_df)):
+            post_numeric_alignment(out_df, schema)
+
+        # 파일별 엑셀 쓰기 (행 수가 많으면 스트리밍 엔진)
+        with trace.stage("write", rows=len(out_df)):
+            xlsx = df_to_xlsx_bytes(out_df[output_columns(template_columns, out_df)])
+
+        res.out_name = f"{base}__{res.platform.lower()}_converted.xlsx"
+        res.xlsx = xlsx
+        res.rows = len(out_df)
+    except Exception as e:
+        res.error = str(e)
+    return res
+
+
+def new_pool(jobs: int) -> ProcessPoolExecutor:
+    # Streamlit 서버는 스레드를 쓰므로 fork 대신 spawn 으로 작업자를 띄운다
+    return ProcessPoolExecutor(max_workers=jobs, mp_context=multiprocessing.get_context("spawn"))
+
+
+def _run_in_pool(pool: Executor, items: Sequence[Tuple[str, bytes]], args: tuple) -> List[BatchResult]:
+    futures = [pool.submit(convert_file, name, data, *args) for name, data in items]
+    results = []
+    for (name, _), fut in zip(items, futures):
+        try:
+            results.append(fut.result())
+        except Exception as e:  # 작업자 프로세스 비정상 종료 등
+            results.append(BatchResult(name=name, error=f"작업자 오류: {e}"))
+    return results
+
+
+def convert_batch(
+    items: Sequence[Tuple[str, bytes]],
+    schema: TemplateSchema,
+    laora_mapping: Optional[Dict[str, str]] = None,
+    jobs: int = 1,
+    pool: Optional[Executor] = None,
+    trace_memory: bool = False,
+) -> List[BatchResult]:
+    """
+    items: [(파일명, 바이트)]. jobs > 1 이면 프로세스 풀로 병렬 처리.
+    pool 을 주면 그 풀을 사용 (감시 모드처럼 여러 번 호출할 때 작업자를 다시 띄우지 않도록).
+    반환 순서는 항상 items 순서와 같다.
+    schema: 템플릿에서 한 번 만든 TemplateSchema (작업자에게는 템플릿 대신 이것만 넘김)
+    trace_memory: 단계별 파이썬 할당 최대치까지 기록 (tracemalloc — 느려짐)
+    """
+    args = (schema, laora_mapping, trace_memory)
+    if pool is not None:
+        results = _run_in_pool(pool, items, args)
+    elif jobs <= 1 or len(items) <= 1:
+        results = [convert_file(name, data, *args) for name, data in items]
+    else:
+        with new_pool(min(jobs, len(items))) as own_pool:
+            results = _run_in_pool(own_pool, items, args)
+    learn_layouts(results)
+    return results
+
+
+def learn_layouts(results: List[BatchResult]):
+    # 새 양식 등록은 부모 프로세스에서만 (작업자끼리 파일을 동시에 쓰지 않도록), 저장은 한 번
+    learned = [LAYOUTS.learn(r.new_layout) for r in results if r.new_layout is not None and r.error is None]
+    if any(learned):
+        LAYOUTS.save()
+
+
+def batch_zip_bytes(results: List[BatchResult], started: datetime, jobs: int, elapsed: float) -> bytes:
+    """변환 결과를 입력 순서대로 담고 batch_convert_log.txt 를 덧붙인 ZIP"""
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for r in results:
+            if r.xlsx is not None:
+                zf.writestr(r.out_name, r.xlsx)
+        log_text = (
+            "Batch Convert Log - " + started.strftime("%Y-%m-%d %H:%M:%S")
+            + f" (files={len(results)}, jobs={jobs}, total={elapsed:.2f}s)\n"
+            + "\n".join(r.log_line() for r in results)
+            + "\n\n[성능]\n"
+            + "\n".join(f"{r.name}: {r.trace.text()}" for r in results if r.trace is not None)
+        )
+        zf.writestr("batch_convert_log.txt", log_text)
+        zf.writestr("batch_trace.json", batch_trace_json(results, started, jobs, elapsed))
+    return buf.getvalue()
+
+
+def batch_trace_json(results: List[BatchResult], started: datetime, jobs: int, elapsed: float) -> bytes:
+    """파일별 단계 기록 JSON (다른 실행과 비교용)"""
+    return traces_json([r.trace for r in results], kind="batch", started=started.isoformat(timespec="seconds"),
+                       jobs=jobs, elapsed=elapsed)
+
+
+def write_atomic(path: str, data: bytes):
+    """같은 폴더의 임시 파일에 쓰고 교체 (읽는 쪽에서 반쯤 쓴 파일이 보이지 않음)"""
+    with atomic_file(path) as fh:
+        fh.write(data)
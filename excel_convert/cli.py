@@ -0,0 +1,199 @@
+# cli.py
+# 명령줄 진입점: 브라우저/Streamlit 없이 배치 변환 (cron 야간 작업 등)
+#   python -m excel_convert batch <폴더> --out <결과.zip> [--jobs N] [--template 2.xlsx] [--mapping mapping_laora.json]
+#                                 [--trace-memory]
+#   python -m excel_convert watch <폴더> [--interval 초] [--once] [--jobs N] [--template ...] [--mapping ...]
+#   python -m excel_convert convert <파일.xlsx> --out <결과.xlsx|.csv> [--template ...] [--mapping ...]
+#   - 폴더 안의 .xlsx 를 이름순으로 변환해 앱의 배치 ZIP 과 같은 구성으로 저장 (임시 파일에 쓴 뒤 교체)
+#     ZIP 의 batch_trace.json: 파일별 단계 시간/행 수/메모리 (--trace-memory 면 파이썬 할당 최대치까지, 느려짐)
+#   - watch: 새로 생기거나 바뀐 파일만 입력 옆에 변환 결과를 씀 (excel_convert.watch 참고)
+#   - convert: 큰 파일 하나를 결과 파일로 바로 흘려 씀 (쿠팡/떠리몰은 행 묶음 단위, excel_convert.streaming 참고)
+#   - --template: 템플릿 파일 또는 저장된 템플릿 이름 (처음 보는 파일은 등록부에 저장, excel_convert.templates 참고)
+#   - 종료 코드: 0 전부 성공 / 1 실패한 파일 있음 / 2 입력 오류
+
+import argparse
+import json
+import os
+import signal
+import sys
+import time
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from excel_convert.batch import batch_zip_bytes, convert_batch, default_jobs, write_atomic
+from excel_convert.converters import DEFAULT_MAPPING, DEFAULT_TEMPLATE_COLUMNS, TemplateSchema, clean_laora_mapping
+from excel_convert.streaming import convert_path
+from excel_convert.templates import TEMPLATES
+from excel_convert.watch import FolderWatcher
+
+
+def _collect(folder: str, out_path: str) -> List[Tuple[str, bytes]]:
+    out_abs = os.path.abspath(out_path)
+    items = []
+    for name in sorted(os.listdir(folder)):
+        path = os.path.join(folder, name)
+        # 엑셀 잠금 파일(~$...)과 결과 파일 자신은 제외
+        if not name.lower().endswith(".xlsx") or name.startswith("~$") or os.path.abspath(path) == out_abs:
+            continue
+        if os.path.isfile(path):
+            with open(path, "rb") as fh:
+                items.append((name, fh.read()))
+    return items
+
+
+def _load_template(spec: Optional[str]) -> TemplateSchema:
+    """--template: 템플릿 파일(처음 보는 내용만 파싱해 등록부에 저장) 또는 저장된 템플릿 이름"""
+    if not spec:
+        return TemplateSchema.from_template(DEFAULT_TEMPLATE_COLUMNS, None)
+    if os.path.isfile(spec):
+        with open(spec, "rb") as fh:
+            saved, _ = TEMPLATES.register(fh.read(), os.path.splitext(os.path.basename(spec))[0])
+        return saved.schema()
+    saved = TEMPLATES.by_name(spec)
+    if saved is None:
+        names = ", ".join(TEMPLATES.names()) or "없음"
+        raise ValueError(f"템플릿 파일도, 저장된 템플릿 이름도 아닙니다: {spec} (저장된 템플릿: {names})")
+    return saved.schema()
+
+
+def _load_mapping(path: Optional[str], template_columns: List[str]) -> dict:
+    defaults = {k: v for k, v in DEFAULT_MAPPING.items() if k in template_columns}
+    if not path:
+        return defaults
+    with open(path, "r", encoding="utf-8") as fh:
+        return clean_laora_mapping(json.load(fh), template_columns, defaults)
+
+
+def _load_inputs(args) -> Optional[Tuple[TemplateSchema, dict]]:
+    """폴더/템플릿/매핑 확인. 문제가 있으면 stderr 에 알리고 None"""
+    if not os.path.isdir(args.folder):
+        print(f"폴더를 찾을 수 없습니다: {args.folder}", file=sys.stderr)
+        return None
+    return _load_template_mapping(args)
+
+
+def _load_template_mapping(args) -> Optional[Tuple[TemplateSchema, dict]]:
+    try:
+        schema = _load_template(args.template)
+        template_columns = schema.template_columns
+        mapping = _load_mapping(args.mapping, template_columns)
+    except (OSError, ValueError) as e:
+        print(f"템플릿/매핑을 읽는 중 오류: {e}", file=sys.stderr)
+        return None
+    if not template_columns:
+        print("유효한 템플릿이 필요합니다.", file=sys.stderr)
+        return None
+    return schema, mapping
+
+
+def run_batch(args) -> int:
+    loaded = _load_inputs(args)
+    if loaded is None:
+        return 2
+    schema, mapping = loaded
+
+    items = _collect(args.folder, args.out)
+    if not items:
+        print(f"변환할 .xlsx 파일이 없습니다: {args.folder}", file=sys.stderr)
+        return 2
+
+    jobs = max(1, args.jobs)
+    started = datetime.now()
+    t0 = time.perf_counter()
+    results = convert_batch(items, schema, laora_mapping=mapping, jobs=jobs,
+                            trace_memory=args.trace_memory)
+    elapsed = time.perf_counter() - t0
+    write_atomic(args.out, batch_zip_bytes(results, started, jobs, elapsed))
+
+    for r in results:
+        print(r.log_line())
+    failed = sum(1 for r in results if r.error is not None)
+    print(f"{len(results) - failed}/{len(results)}개 변환 → {args.out} ({elapsed:.1f}초)")
+    return 1 if failed else 0
+
+
+def run_watch(args) -> int:
+    loaded = _load_inputs(args)
+    if loaded is None:
+        return 2
+    schema, mapping = loaded
+
+    watcher = FolderWatcher(args.folder, schema, mapping, jobs=args.jobs, settle=args.settle)
+    if args.once:
+        try:
+            results = watcher.run_once()
+        finally:
+            watcher.close()
+        for r in results:
+            print(r.log_line())
+        return 1 if any(r.error is not None for r in results) else 0
+
+    print(f"감시 시작: {args.folder} ({args.interval:g}초 간격, 동시 {watcher.jobs}개). 멈추려면 Ctrl+C", flush=True)
+    # 서비스 관리자의 종료 신호도 Ctrl+C 와 같이 작업자 풀을 정리하고 끝내도록
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        watcher.run_forever(args.interval, lambda r: print(f"{datetime.now():%H:%M:%S} {r.log_line()}", flush=True))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def run_convert(args) -> int:
+    if not os.path.isfile(args.file):
+        print(f"파일을 찾을 수 없습니다: {args.file}", file=sys.stderr)
+        return 2
+    loaded = _load_template_mapping(args)
+    if loaded is None:
+        return 2
+    schema, mapping = loaded
+
+    t0 = time.perf_counter()
+    try:
+        layout, rows = convert_path(args.file, args.out, schema, mapping)
+    except Exception as e:
+        print(f"[FAIL] {os.path.basename(args.file)}: {e}", file=sys.stderr)
+        return 1
+    print(f"[OK]   {os.path.basename(args.file)}: {layout.platform} → rows={rows} → {args.out} "
+          f"({time.perf_counter() - t0:.1f}초)")
+    return 0
+
+
+def _add_common(p: argparse.ArgumentParser, jobs: bool = True):
+    if jobs:
+        p.add_argument("--jobs", type=int, default=default_jobs(), help="동시 처리 파일 수 (기본: %(default)s)")
+    p.add_argument("--template", help="템플릿(2.xlsx) 또는 앱/이전 실행에서 저장된 템플릿 이름. 없으면 기본 템플릿")
+    p.add_argument("--mapping", help="라오라 매핑 JSON (앱에서 내려받은 mapping_laora.json)")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="excel-convert", description="엑셀 양식 변환기 (Streamlit 없이 실행)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    batch = sub.add_parser("batch", help="폴더 안의 .xlsx 를 플랫폼 자동 판별 후 일괄 변환해 ZIP 으로 저장")
+    batch.add_argument("folder", help="입력 폴더 (.xlsx, 하위 폴더는 보지 않음)")
+    batch.add_argument("--out", required=True, help="결과 ZIP 경로")
+    batch.add_argument("--trace-memory", action="store_true",
+                       help="성능 기록에 단계별 파이썬 할당 최대치 포함 (tracemalloc, 느려짐)")
+    _add_common(batch)
+    batch.set_defaults(func=run_batch)
+
+    watch = sub.add_parser("watch", help="폴더를 감시하며 새로 생기거나 바뀐 .xlsx 만 변환 (결과는 입력 옆에)")
+    watch.add_argument("folder", help="감시할 폴더 (하위 폴더는 보지 않음)")
+    watch.add_argument("--interval", type=float, default=5.0, help="폴더 확인 간격(초, 기본: %(default)s)")
+    watch.add_argument("--settle", type=float, default=2.0,
+                       help="마지막 수정 후 이 시간(초)이 지난 파일만 처리 (기본: %(default)s)")
+    watch.add_argument("--once", action="store_true", help="한 번만 확인하고 종료 (cron 용)")
+    _add_common(watch)
+    watch.set_defaults(func=run_watch)
+
+    convert = sub.add_parser("convert", help="파일 하나를 변환해 결과 파일로 저장 (큰 파일용, .csv 로도 저장 가능)")
+    convert.add_argument("file", help="입력 .xlsx")
+    convert.add_argument("--out", required=True, help="결과 경로 (.csv 면 CSV, 그 외 XLSX)")
+    _add_common(convert, jobs=False)
+    convert.set_defaults(func=run_convert)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
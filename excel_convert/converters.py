@@ -0,0 +1,295 @@
+# converters.py
+# 플랫폼 판별 + 라오라/쿠팡/스마트스토어/떠리몰 → 템플릿 변환 (Streamlit 의존 없음)
+#   - 배치 작업자 프로세스에서도 import 할 수 있도록 세션 상태/모듈 전역 대신 인자로 받는다
+#   - 템플릿 숫자형 정렬은 템플릿을 읽을 때 한 번 TemplateSchema 로 계산해 두고 변환 결과마다 적용
+
+import re
+from dataclasses import dataclass
+from typing import Dict, Hashable, List, Optional, Tuple
+
+import pandas as pd
+
+from excel_convert.headers import find_col, header_index
+from excel_convert.projection import excel_col_to_index
+from excel_convert.text_columns import text_column
+
+# -------------------- Defaults --------------------
+DEFAULT_TEMPLATE_COLUMNS = [
+    "주문번호",
+    "받는분 이름",
+    "받는분 주소",
+    "받는분 전화번호",
+    "상품명",
+    "수량",
+    "메모",
+]
+
+# 라오라 기본 매핑 (열 문자)
+DEFAULT_MAPPING = {
+    "주문번호": "A",
+    "받는분 이름": "I",
+    "받는분 주소": "L",
+    "받는분 전화번호": "J",
+    "상품명": "D",
+    "수량": "G",
+    "메모": "M",
+}
+
+# 쿠팡 고정 매핑 (열 문자) — 주문번호 C
+COUPANG_MAPPING = {
+    "주문번호": "C",
+    "받는분 이름": "AA",
+    "받는분 주소": "AD",
+    "받는분 전화번호": "AB",
+    "상품명": "P",
+    "수량": "W",
+    "메모": "AE",
+}
+
+# 스마트스토어 키워드 매핑용 후보
+SS_NAME_MAP = {
+    "주문번호": ["주문번호"],
+    "받는분 이름": ["수취인명"],
+    "받는분 주소": ["통합배송지"],
+    "받는분 전화번호": ["수취인연락처1", "수취인연락처", "수취인휴대폰", "연락처1"],
+    "상품명_left": ["상품명"],
+    "상품명_right": ["옵션정보", "옵션명", "옵션내용"],
+    "수량": ["수량", "구매수량"],
+    "메모": ["배송메세지", "배송메시지", "배송요청사항"],
+}
+
+# 떠리몰 고정 매핑 (열 문자) + 상품명 S&V 규칙
+TTARIMALL_FIXED_LETTER_MAPPING = {
+    "주문번호": "H",
+    "받는분 이름": "AB",
+    "받는분 주소": "AE",
+    "받는분 전화번호": "AC",
+    "상품명": "V",  # 비교는 S와 수행
+    "수량": "Y",
+    "메모": "AA",
+}
+
+
+def clean_laora_mapping(loaded, template_columns: List[str], fallback: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """
+    불러온 라오라 매핑(JSON) 정리: 템플릿 컬럼 + 열 문자 값만 남기고 대문자로.
+    빠진 컬럼은 fallback → DEFAULT_MAPPING 순으로 채운다.
+    """
+    if not isinstance(loaded, dict):
+        raise ValueError("JSON 루트가 객체(dict)가 아닙니다.")
+    fallback = fallback or {}
+    new_map = {}
+    for k, v in loaded.items():
+        if k in template_columns and isinstance(v, str) and re.fullmatch(r"[A-Za-z]+", v):
+            new_map[k] = v.upper()
+    for k in template_columns:
+        if k not in new_map:
+            new_map[k] = fallback.get(k, DEFAULT_MAPPING.get(k, ""))
+    return new_map
+
+
+def detect_platform_by_headers(df) -> str:
+    """df(또는 헤더 목록)의 헤더 키워드로 플랫폼 판별"""
+    has_any = header_index(df).has_any
+
+    # 떠리몰 신호
+    if has_any(["수령자명", "수령자연락처", "옵션명:옵션값"]):
+        return "TTARIMALL"
+    # 스마트스토어 신호
+    if has_any(["수취인명", "수취인연락처1", "통합배송지"]):
+        return "SMARTSTORE"
+    # 쿠팡 신호
+    if has_any(["최초등록상품명"]) or (has_any(["구매수"]) and has_any(["옵션명"])) or has_any(["배송메시지"]):
+        return "COUPANG"
+    # 그 외 → 라오라로 가정
+    return "LAORA"
+
+
+def convert_laora(
+    df_src: pd.DataFrame,
+    template_columns: List[str],
+    mapping: Optional[Dict[str, str]],
+    source_columns: Optional[List] = None,
+) -> pd.DataFrame:
+    """source_columns: 전체 헤더 목록 (df_src 가 필요한 열만 읽은 투영일 때 열 문자 해석용)"""
+    if not isinstance(mapping, dict) or not mapping:
+        raise RuntimeError("라오라 매핑이 없습니다. 사이드바에서 라오라 매핑을 먼저 저장해 주세요.")
+    result = pd.DataFrame(index=range(len(df_src)), columns=template_columns)
+    src_cols_by_index = list(df_src.columns if source_columns is None else source_columns)
+    resolved_map = {}
+    for tpl_header, xl_letters in mapping.items():
+        if not xl_letters:
+            continue
+        idx = excel_col_to_index(xl_letters)
+        if idx >= len(src_cols_by_index):
+            raise IndexError(
+                f"소스 파일에 {xl_letters} 열(0-based index {idx})이 존재하지 않습니다. "
+                f"소스 컬럼 수: {len(src_cols_by_index)}"
+            )
+        resolved_map[tpl_header] = src_cols_by_index[idx]
+    for tpl_header, src_colname in resolved_map.items():
+        if tpl_header == "수량":
+            result[tpl_header] = pd.to_numeric(df_src[src_colname], errors="coerce")
+        elif tpl_header == "받는분 전화번호":
+            result[tpl_header] = text_column(df_src[src_colname])
+        else:
+            result[tpl_header] = df_src[src_colname]
+    return result
+
+
+def convert_coupang(df_src: pd.DataFrame, template_columns: List[str],
+                    source_columns: Optional[List] = None) -> pd.DataFrame:
+    result = pd.DataFrame(index=range(len(df_src)), columns=template_columns)
+    src_cols_by_index = list(df_src.columns if source_columns is None else source_columns)
+    resolved_map = {}
+    for tpl_header, xl_letters in COUPANG_MAPPING.items():
+        idx = excel_col_to_index(xl_letters)
+        if idx >= len(src_cols_by_index):
+            raise IndexError(
+                f"쿠팡 소스에 {xl_letters} 열(0-based index {idx})이 존재하지 않습니다. "
+                f"소스 컬럼 수: {len(src_cols_by_index)}"
+            )
+        resolved_map[tpl_header] = src_cols_by_index[idx]
+    for tpl_header, src_colname in resolved_map.items():
+        if tpl_header == "수량":
+            result[tpl_header] = pd.to_numeric(df_src[src_colname], errors="coerce")
+        elif tpl_header == "받는분 전화번호":
+            result[tpl_header] = text_column(df_src[src_colname])
+        else:
+            result[tpl_header] = df_src[src_colname]
+    return result
+
+
+def convert_smartstore_keywords(
+    df_ss: pd.DataFrame,
+    template_columns: List[str],
+    resolved: Optional[Dict[str, Hashable]] = None,
+) -> pd.DataFrame:
+    """resolved: {SS_NAME_MAP 키: 컬럼명} (양식 등록부에서 이미 해석된 열). 빠진 키만 키워드로 찾는다"""
+    resolved = resolved or {}
+
+    def col(key: str):
+        return resolved[key] if key in resolved else find_col(SS_NAME_MAP[key], df_ss)
+
+    col_order = col("주문번호")
+    col_name = col("받는분 이름")
+    col_addr = col("받는분 주소")
+    col_phone = col("받는분 전화번호")
+    col_prod_l = col("상품명_left")
+    col_prod_r = col("상품명_right")
+    col_qty = col("수량")
+    col_memo = col("메모")
+
+    result = pd.DataFrame(index=range(len(df_ss)), columns=template_columns)
+    result["주문번호"] = df_ss[col_order]
+    result["받는분 이름"] = df_ss[col_name]
+    result["받는분 주소"] = df_ss[col_addr]
+    result["받는분 전화번호"] = text_column(df_ss[col_phone])
+    result["상품명"] = text_column(df_ss[col_prod_l]) + text_column(df_ss[col_prod_r])
+    result["수량"] = pd.to_numeric(df_ss[col_qty], errors="coerce")
+    result["메모"] = df_ss[col_memo]
+    return result
+
+
+def convert_ttarimall(df_tm: pd.DataFrame, template_columns: List[str],
+                      source_columns: Optional[List] = None) -> pd.DataFrame:
+    src_cols_by_index = list(df_tm.columns if source_columns is None else source_columns)
+
+    def resolve(letter: str) -> str:
+        idx = excel_col_to_index(letter)
+        if idx >= len(src_cols_by_index):
+            raise IndexError(
+                f"떠리몰 소스에 {letter} 열(0-based index {idx})이 없습니다. "
+                f"소스 컬럼 수: {len(src_cols_by_index)}"
+            )
+        return src_cols_by_index[idx]
+
+    col_order = resolve(TTARIMALL_FIXED_LETTER_MAPPING["주문번호"])
+    col_name = resolve(TTARIMALL_FIXED_LETTER_MAPPING["받는분 이름"])
+    col_addr = resolve(TTARIMALL_FIXED_LETTER_MAPPING["받는분 주소"])
+    col_phone = resolve(TTARIMALL_FIXED_LETTER_MAPPING["받는분 전화번호"])
+    col_v = resolve(TTARIMALL_FIXED_LETTER_MAPPING["상품명"])
+    col_s = resolve("S")
+    col_qty = resolve(TTARIMALL_FIXED_LETTER_MAPPING["수량"])
+    col_memo = resolve(TTARIMALL_FIXED_LETTER_MAPPING["메모"])
+
+    result = pd.DataFrame(index=range(len(df_tm)), columns=template_columns)
+    result["주문번호"] = df_tm[col_order]
+    result["받는분 이름"] = df_tm[col_name]
+    result["받는분 주소"] = df_tm[col_addr]
+    result["받는분 전화번호"] = text_column(df_tm[col_phone])
+
+    s = text_column(df_tm[col_s])
+    v = text_column(df_tm[col_v])
+    same = (s == v)
+    prod = v.copy()
+    prod.loc[~same] = s[~same] + v[~same]
+    result["상품명"] = prod
+
+    result["수량"] = pd.to_numeric(df_tm[col_qty], errors="coerce")
+    result["메모"] = df_tm[col_memo]
+    return result
+
+
+def _is_numeric_name(dtype_name: Optional[str]) -> bool:
+    if dtype_name is None:  # pandas_dtype(None) 은 float64
+        return False
+    try:
+        return pd.api.types.is_numeric_dtype(pd.api.types.pandas_dtype(dtype_name))
+    except TypeError:
+        return False
+
+
+@dataclass(frozen=True)
+class TemplateSchema:
+    """
+    템플릿(2.xlsx)에서 한 번만 계산하는 변환 설정.
+    numeric: 숫자로 맞출 열 = 템플릿에 값이 있고 숫자형인 열 (전화번호 제외, 템플릿 열 순서)
+    """
+
+    columns: Tuple[str, ...]
+    numeric: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_template(cls, template_columns: List[str], tpl_df: Optional[pd.DataFrame]) -> "TemplateSchema":
+        if tpl_df is None:
+            return cls(tuple(template_columns))
+        present = [c for c in template_columns if c in tpl_df.columns]
+        return cls.from_profile(template_columns, {c: str(tpl_df[c].dtype) for c in present},
+                                {c for c in present if tpl_df[c].notna().any()})
+
+    @classmethod
+    def from_profile(cls, template_columns: List, dtypes: Dict[Hashable, str], filled) -> "TemplateSchema":
+        """저장해 둔 dtype 프로필로 (templates.TemplateRegistry). dtypes: 열 → dtype 이름, filled: 값이 있는 열"""
+        numeric = [c for c in template_columns
+                   if c != "받는분 전화번호" and c in filled and _is_numeric_name(dtypes.get(c))]
+        return cls(tuple(template_columns), tuple(numeric))
+
+    @property
+    def template_columns(self) -> List[str]:
+        return list(self.columns)
+
+
+def post_numeric_alignment(result_df: pd.DataFrame, schema: TemplateSchema):
+    # 템플릿 숫자형 정렬: 숫자로 맞출 열만, 변환기가 이미 숫자로 만든 열(수량 등)은 건너뜀
+    for col in schema.numeric:
+        if col in result_df.columns and not pd.api.types.is_numeric_dtype(result_df[col]):
+            result_df[col] = pd.to_numeric(result_df[col], errors="coerce")
+
+
+def convert_by_platform(
+    platform: str,
+    df: pd.DataFrame,
+    template_columns: List[str],
+    laora_mapping: Optional[Dict[str, str]] = None,
+    resolved: Optional[Dict[str, Hashable]] = None,
+    source_columns: Optional[List] = None,
+) -> pd.DataFrame:
+    """source_columns: df 가 투영(필요한 열만)일 때의 전체 헤더 목록 (열 문자 매핑 해석용)"""
+    if platform == "TTARIMALL":
+        return convert_ttarimall(df, template_columns, source_columns)
+    if platform == "SMARTSTORE":
+        return convert_smartstore_keywords(df, template_columns, resolved)
+    if platform == "COUPANG":
+        return convert_coupang(df, template_columns, source_columns)
+    return convert_laora(df, template_columns, laora_mapping, source_columns)  # LAORA
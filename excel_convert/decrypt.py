@@ -0,0 +1,120 @@
+# decrypt.py
+# 암호 걸린 엑셀(스마트스토어 주문 파일 등) 복호화 + 캐시
+#   - 복호화 결과: (암호문 해시, 비밀번호 해시) → 평문 xlsx 바이트. 용량 한도 LRU (ParseCache 와 같은 방식)
+#   - 키 유도(비밀번호 → 키, SHA-512 10만 회 등)는 느리게 만든 단계라 결과를 따로 보관:
+#     솔트/해시 알고리즘/반복 수 등 유도 매개변수가 같으면 다른 파일이어도 다시 계산하지 않음
+#   - 비밀번호 원문은 키에 넣지 않고 해시만 사용
+
+import io
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional
+
+from excel_convert.parse_cache import ParseCache, content_hash
+
+DECRYPT_CACHE = ParseCache(max_bytes=128 * 1024 * 1024)
+KEY_CACHE_SIZE = 32
+
+
+class _KeyCache:
+    """유도 매개변수 → 유도 결과 (개수 한도 LRU)"""
+
+    def __init__(self, size: int = KEY_CACHE_SIZE):
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_derive(self, key: Hashable, derive: Callable[[], bytes]) -> bytes:
+        with self._lock:
+            found = self._entries.get(key)
+            if found is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return found
+            self.misses += 1
+        value = derive()
+        with self._lock:
+            self._entries[key] = value
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+KEY_CACHE = _KeyCache()
+
+
+def _agile_secret_key(info: dict, password: str, pw_digest: str) -> bytes:
+    from msoffcrypto.method import ecma376_agile as agile
+
+    salt = bytes(info["passwordSalt"])
+    alg = info["passwordHashAlgorithm"]
+    # 반복 해시(비싼 부분)는 솔트/알고리즘/반복 수만으로 정해지므로 그 단위로 재사용
+    h = KEY_CACHE.get_or_derive(
+        ("agile", pw_digest, salt, alg, info["spinValue"]),
+        lambda: agile.ECMA376Agile._derive_iterated_hash_from_password(password, salt, alg, info["spinValue"]).digest(),
+    )
+    encryption_key = agile.ECMA376Agile._derive_encryption_key(
+        h, agile.blkKey_encryptedKeyValue, alg, info["passwordKeyBits"]
+    )
+    return agile._decrypt_aes_cbc(info["encryptedKeyValue"], encryption_key, salt)
+
+
+def _standard_secret_key(info: dict, password: str, pw_digest: str) -> bytes:
+    from msoffcrypto.method.ecma376_standard import ECMA376Standard
+
+    header, verifier = info["header"], info["verifier"]
+    params = (header["algId"], header["algIdHash"], header["providerType"], header["keySize"],
+              verifier["saltSize"], bytes(verifier["salt"]))
+    return KEY_CACHE.get_or_derive(
+        ("standard", pw_digest) + params,
+        lambda: ECMA376Standard.makekey_from_password(password, *params),
+    )
+
+
+def _secret_key(office_file, password: str) -> Optional[bytes]:
+    """OOXML(agile/standard) 이면 캐시를 거친 키, 그 외 형식이면 None (msoffcrypto 가 비밀번호로 직접)"""
+    if getattr(office_file, "format", None) != "ooxml":
+        return None
+    pw_digest = content_hash(password.encode("utf-8"))
+    try:
+        if office_file.type == "agile":
+            return _agile_secret_key(office_file.info, password, pw_digest)
+        if office_file.type == "standard":
+            return _standard_secret_key(office_file.info, password, pw_digest)
+    except Exception:  # 비공개 내부 함수를 쓰므로 msoffcrypto 버전이 바뀌어 무엇이 깨지든 기본 경로(load_key(password=))로
+        return None
+    return None
+
+
+def _decrypt(data: bytes, password: str) -> bytes:
+    try:
+        import msoffcrypto
+    except ImportError:
+        raise RuntimeError("암호화된 파일을 읽으려면 msoffcrypto-tool이 필요합니다. pip install msoffcrypto-tool")
+
+    office_file = msoffcrypto.OfficeFile(io.BytesIO(data))
+    secret_key = _secret_key(office_file, password)
+    if secret_key is None:
+        office_file.load_key(password=password)
+    else:
+        office_file.load_key(secret_key=secret_key)
+    out = io.BytesIO()
+    office_file.decrypt(out)
+    return out.getvalue()
+
+
+def decrypt_bytes(data: bytes, password: str, digest: Optional[str] = None) -> bytes:
+    """암호 걸린 Office 파일 바이트 → 평문 바이트. 같은 파일 + 같은 비밀번호면 캐시에서"""
+    options = ("decrypt", content_hash(password.encode("utf-8")))
+    return DECRYPT_CACHE.get_or_parse(digest or content_hash(data), options, lambda: _decrypt(data, password))
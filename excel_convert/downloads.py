@@ -0,0 +1,57 @@
+# downloads.py
+# 다운로드 버튼용 지연 생성 페이로드
+#   - st.download_button(data=callable) 로 넘겨 버튼을 누른 형식(CSV/XLSX)만 직렬화
+#   - 결과 DataFrame 내용 해시 + 형식 옵션으로 캐시 → 같은 결과를 다시 받을 때는 재직렬화 없음
+#   - eager_payloads() 안에서는 버튼을 만들 때 바로 직렬화해 캐시에 넣음 (프로파일링이 직렬화 비용까지 보도록)
+
+import hashlib
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Hashable, Iterator, Optional
+
+import pandas as pd
+
+from excel_convert.parse_cache import ParseCache
+from excel_convert.xlsx_writer import df_to_xlsx_bytes
+
+PAYLOAD_CACHE = ParseCache(max_bytes=256 * 1024 * 1024)
+_EAGER = ContextVar("eager_payloads", default=False)  # 스레드(세션 실행)마다 따로
+
+
+@contextmanager
+def eager_payloads() -> Iterator[None]:
+    token = _EAGER.set(True)
+    try:
+        yield
+    finally:
+        _EAGER.reset(token)
+
+
+def frame_digest(df: pd.DataFrame) -> str:
+    """컬럼명 + 값(행 해시) 기준 내용 해시. 값이 같으면 다른 객체여도 같은 키"""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(repr(list(df.columns)).encode("utf-8"))
+    h.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def lazy_payload(df: pd.DataFrame, options: Hashable, build: Callable[[pd.DataFrame], bytes]) -> Callable[[], bytes]:
+    """버튼 클릭 시에만 build(df) 실행. 결과는 (내용 해시, options) 로 캐시"""
+
+    def _payload() -> bytes:
+        try:
+            digest = frame_digest(df)
+        except TypeError:  # 해시할 수 없는 값(리스트 등)이 섞인 결과는 캐시 없이
+            return build(df)
+        return PAYLOAD_CACHE.get_or_parse(digest, options, lambda: build(df))
+
+    if _EAGER.get():
+        try:
+            _payload()
+        except Exception:  # 오류는 평소처럼 버튼을 누를 때 보이도록
+            pass
+    return _payload
+
+
+def xlsx_payload(df: pd.DataFrame, sheet_name: Optional[str] = None) -> Callable[[], bytes]:
+    return lazy_payload(df, ("xlsx", sheet_name), lambda d: df_to_xlsx_bytes(d, sheet_name))
@@ -0,0 +1,100 @@
+# headers.py
+# 헤더 정규화 / 키워드로 컬럼 찾기 (앱과 배치 작업자가 같이 사용)
+#   - 헤더 시그니처(컬럼명 튜플)별 HeaderIndex 를 만들어 두고 재사용
+#     → 같은 양식 파일을 다시 올리면 정규화/키워드 해석을 다시 하지 않음
+
+import re
+import threading
+import weakref
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Hashable, Iterable, List, Tuple
+
+import pandas as pd
+
+MAX_INDEXES = 256
+
+_NORM_PATTERN = re.compile(r"[\s\(\)\[\]{}:：/\\\-]")
+_NOT_FOUND = object()
+
+
+@lru_cache(maxsize=8192)
+def norm_header(s: str) -> str:
+    return _NORM_PATTERN.sub("", str(s).strip().lower())
+
+
+class HeaderIndex:
+    """
+    컬럼 목록 하나에 대한 조회표.
+      - norm_cols: {정규화 헤더: 원래 컬럼명} (정규화 결과가 겹치면 뒤 컬럼이 이김)
+      - 부분 일치용 목록은 원래 컬럼명 길이순으로 미리 정렬
+      - find() 결과(못 찾은 경우 포함)는 키워드 목록별로 메모
+    """
+
+    def __init__(self, columns: Tuple):
+        self.columns = columns
+        self.norm_cols: Dict[str, Hashable] = {norm_header(c): c for c in columns}
+        self._by_len: List[Tuple[str, Hashable]] = sorted(self.norm_cols.items(), key=lambda kv: len(str(kv[1])))
+        self._resolved: Dict[Tuple, object] = {}
+
+    def find(self, preferred_names: Iterable) -> Hashable:
+        key = tuple(preferred_names)
+        found = self._resolved.get(key)
+        if found is None:
+            found = self._resolve(key)
+            self._resolved[key] = found
+        if found is _NOT_FOUND:
+            raise KeyError(f"해당 키워드에 맞는 컬럼을 찾을 수 없습니다: {list(key)}")
+        return found
+
+    def _resolve(self, names: Tuple):
+        cand_norm = [norm_header(x) for x in names]
+        for n in cand_norm:
+            if n in self.norm_cols:
+                return self.norm_cols[n]
+        for want in cand_norm:
+            for k, orig in self._by_len:
+                if want in k:
+                    return orig
+        return _NOT_FOUND
+
+    def has_any(self, names: Iterable) -> bool:
+        return any(norm_header(k) in self.norm_cols for k in names)
+
+
+_INDEXES: "OrderedDict[Tuple, HeaderIndex]" = OrderedDict()
+_BY_COLUMNS_OBJ: Dict[int, Tuple[weakref.ref, HeaderIndex]] = {}  # 같은 df.columns 객체는 튜플 변환도 생략
+_LOCK = threading.Lock()
+
+
+def header_index(columns) -> HeaderIndex:
+    """컬럼 목록(또는 DataFrame) → HeaderIndex. 같은 시그니처면 같은 객체 (LRU)"""
+    columns = getattr(columns, "columns", columns)
+    if isinstance(columns, pd.Index):
+        hit = _BY_COLUMNS_OBJ.get(id(columns))
+        if hit is not None and hit[0]() is columns:
+            return hit[1]
+        index = _signature_index(tuple(columns))
+        key = id(columns)
+        _BY_COLUMNS_OBJ[key] = (weakref.ref(columns, lambda _, k=key: _BY_COLUMNS_OBJ.pop(k, None)), index)
+        return index
+    return _signature_index(tuple(columns))
+
+
+def _signature_index(signature: Tuple) -> HeaderIndex:
+    with _LOCK:
+        index = _INDEXES.get(signature)
+        if index is not None:
+            _INDEXES.move_to_end(signature)
+            return index
+    index = HeaderIndex(signature)
+    with _LOCK:
+        _INDEXES[signature] = index
+        while len(_INDEXES) > MAX_INDEXES:
+            _INDEXES.popitem(last=False)
+    return index
+
+
+def find_col(preferred_names, df):
+    """df(또는 컬럼 목록)에서 키워드에 맞는 컬럼명. 정확 일치 우선, 없으면 가장 짧은 부분 일치"""
+    return header_index(df).find(preferred_names)
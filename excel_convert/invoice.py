@@ -0,0 +1,172 @@
+# invoice.py
+# 송장등록: 송장파일 조회표(InvoiceIndex) → 라오/스마트스토어/쿠팡/떠리몰 송장 결과 만들기 (Streamlit 의존 없음)
+#   - 앱마다 다른 부분(주문번호 헤더 후보, 택배사 기본값, 라오 택배사코드, P열 필수 여부)은 인자로 받는다
+#   - 결과는 주문 파일의 얕은 사본: 바꾸는 열(송장번호/택배사 등)만 새 배열로 통째로 바꿔 넣고 나머지 열은 원본과 공유
+#     (열 안의 값을 제자리에서 고치지 않으므로 원본 주문 DataFrame 은 그대로)
+
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from excel_convert.headers import find_col
+from excel_convert.matching import DigitKeys, InvoiceIndex
+from excel_convert.projection import excel_col_to_index
+from excel_convert.text_columns import text_column
+
+LAO_FIXED_TEMPLATE_COLUMNS = ["주문번호", "택배사코드", "송장번호"]
+TRACKING_KEYS = ["송장번호", "운송장번호", "운송장", "등기번호", "운송장 번호", "송장번호1"]
+SS_TRACKING_COL_NAME = "송장번호"
+TM_ORDER_KEYS = ["주문번호", "주문ID", "주문코드", "주문번호1"]
+
+
+def build_invoice_index(df_invoice: pd.DataFrame, order_keys: List[str],
+                        keys: Optional[DigitKeys] = None) -> InvoiceIndex:
+    """송장파일 → InvoiceIndex (주문번호/송장번호 열은 헤더로 찾음). 라오/스마트스토어 분류도 여기서 한 번에"""
+    order_col = find_col(order_keys, df_invoice)
+    tracking_col = find_col(TRACKING_KEYS, df_invoice)
+    return InvoiceIndex(df_invoice, order_col, tracking_col, keys)
+
+
+def make_lao_invoice_df(lao_map: Dict[str, str], courier_code: str) -> pd.DataFrame:
+    """라오 송장: 고정 컬럼 [주문번호, 택배사코드, 송장번호]"""
+    if not lao_map:
+        return pd.DataFrame(columns=LAO_FIXED_TEMPLATE_COLUMNS)
+    orders = list(lao_map.keys())
+    tracks = [lao_map[o] for o in orders]
+    return pd.DataFrame(
+        {"주문번호": orders, "택배사코드": [courier_code] * len(orders), "송장번호": tracks},
+        columns=LAO_FIXED_TEMPLATE_COLUMNS,
+    )
+
+
+def _replace_where(df: pd.DataFrame, col, mask: pd.Series, values):
+    """df[col] 에서 mask 인 행만 values 로 바꾼 새 열을 넣는다 (기존 열 배열은 수정하지 않음)"""
+    if mask.any():
+        df[col] = df[col].where(~mask, values)
+
+
+def fill_courier(df: pd.DataFrame, courier: str):
+    """택배사 열이 없으면 추가, 빈 값(결측 포함)은 courier 로 (df 의 택배사 열을 새 열로 바꿈)"""
+    if "택배사" not in df.columns:
+        df["택배사"] = courier
+    else:
+        _replace_where(df, "택배사", text_column(df["택배사"]).str.strip().eq(""), courier)
+
+
+def make_ss_filled_df(ss_map: Dict[str, str], ss_df: Optional[pd.DataFrame], order_keys: List[str],
+                      courier: str, index: Optional[InvoiceIndex] = None) -> pd.DataFrame:
+    """
+    스마트스토어 주문 파일의 빈 송장번호 채우기 (주문 파일이 없으면 [주문번호, 송장번호, 택배사] 만)
+      - index 없음: 주문번호 원문으로 ss_map(InvoiceIndex.ss_by_order) 조회
+      - index 있음: 숫자키로 송장파일 주문번호 전체와 직접 매칭 (ss_map 은 InvoiceIndex.ss_by_digits)
+    """
+    if ss_df is None or ss_df.empty:
+        if not ss_map:
+            return pd.DataFrame()
+        df = pd.DataFrame({"주문번호": list(ss_map.keys()), SS_TRACKING_COL_NAME: list(ss_map.values())})
+        df["택배사"] = courier
+        return df
+
+    col_order = find_col(order_keys, ss_df)
+    out = ss_df.copy(deep=False)
+    if SS_TRACKING_COL_NAME not in out.columns:
+        out[SS_TRACKING_COL_NAME] = ""
+    is_empty = text_column(out[SS_TRACKING_COL_NAME]).str.strip().eq("")
+
+    if index is None:
+        mapped = text_column(out[col_order]).map(ss_map).fillna("")
+    else:
+        ss_order_digits = index.keys.get(ss_df, col_order)
+        try:
+            # 송장파일 주문번호(숫자만) → 송장번호 (중복은 마지막 값 우선)
+            mapped = ss_order_digits.map(index.digits_map() if len(index) else ss_map).fillna("")
+        except Exception:
+            mapped = ss_order_digits.map(ss_map).fillna("")
+    _replace_where(out, SS_TRACKING_COL_NAME, is_empty, mapped)
+
+    fill_courier(out, courier)
+    return out
+
+
+def build_inv_map_from_P(index: InvoiceIndex, require_p: bool = False) -> Dict[str, str]:
+    """
+    송장파일 P열(주문번호) 기준 {숫자키: 송장번호}. 열별 맵은 index 가 한 번만 만든다.
+    P열이 없으면 require_p 일 때 RuntimeError, 아니면 헤더로 찾은 주문번호 열 사용
+    """
+    inv_cols = list(index.df.columns)
+    p_idx = excel_col_to_index("P")
+    if p_idx < len(inv_cols):
+        inv_order_col = inv_cols[p_idx]
+    elif require_p:
+        raise RuntimeError("송장파일에 P열(주문번호)이 없습니다. 송장파일 양식을 확인해 주세요.")
+    else:
+        inv_order_col = index.order_col
+    return index.digits_map(inv_order_col)
+
+
+def _cp_order_col(cp_df: pd.DataFrame):
+    cp_cols = list(cp_df.columns)
+    c_idx = excel_col_to_index("C")
+    if c_idx >= len(cp_cols):
+        raise RuntimeError("쿠팡 주문 파일에 C열(주문번호)이 없습니다. 쿠팡 주문파일 양식을 확인해 주세요.")
+    return cp_cols[c_idx]
+
+
+def make_cp_filled_df_by_letters(index: Optional[InvoiceIndex], cp_df: Optional[pd.DataFrame],
+                                 require_p: bool = False) -> pd.DataFrame:
+    """
+    쿠팡 송장등록:
+      - 매칭 키: (숫자만 남긴) 송장파일의 P열 주문번호 ↔ (숫자만 남긴) 쿠팡주문파일의 C열 주문번호
+      - 쓰기 대상: 쿠팡주문파일의 E열(운송장 번호) ← 송장파일의 '송장번호' (매칭된 행만)
+    """
+    if cp_df is None or cp_df.empty:
+        return pd.DataFrame()
+    if index is None or not len(index):
+        return cp_df
+
+    inv_map = build_inv_map_from_P(index, require_p)
+    cp_keys = index.keys.get(cp_df, _cp_order_col(cp_df))
+    cp_cols = list(cp_df.columns)
+    out = cp_df.copy(deep=False)
+    e_idx = excel_col_to_index("E")
+    if e_idx < len(cp_cols):
+        cp_track_col = cp_cols[e_idx]
+    else:
+        cp_track_col = "운송장 번호"
+        if cp_track_col not in out.columns:
+            out[cp_track_col] = ""
+
+    mapped = cp_keys.map(inv_map)
+    _replace_where(out, cp_track_col, mapped.notna() & mapped.ne(""), mapped)
+    return out
+
+
+def count_cp_updates(index: InvoiceIndex, cp_df: Optional[pd.DataFrame], require_p: bool = False) -> int:
+    """쿠팡 주문 파일에서 송장번호가 채워질 행 수 (숫자비교 기준). 셀 수 없으면 0"""
+    if cp_df is None or cp_df.empty:
+        return 0
+    try:
+        inv_map = build_inv_map_from_P(index, require_p)
+        mapped = index.keys.get(cp_df, _cp_order_col(cp_df)).map(inv_map)
+        return int((mapped.notna() & mapped.ne("")).sum())
+    except Exception:
+        return 0
+
+
+def make_tm_filled_df(tm_df: Optional[pd.DataFrame], inv_map: Dict[str, str]) -> pd.DataFrame:
+    """떠리몰 주문 파일에 송장번호 채우기 (주문번호 원문 매칭, 송장번호의 하이픈 제거)"""
+    if tm_df is None or tm_df.empty:
+        return pd.DataFrame()
+    tm_order_col = find_col(TM_ORDER_KEYS, tm_df)
+    tracking_col_candidates = [c for c in TRACKING_KEYS if c in list(tm_df.columns)]
+    out = tm_df.copy(deep=False)
+    if tracking_col_candidates:
+        tm_tracking_col = tracking_col_candidates[0]
+    else:
+        tm_tracking_col = "송장번호"
+        if tm_tracking_col not in out.columns:
+            out[tm_tracking_col] = ""
+    mapped = text_column(out[tm_order_col]).map(inv_map)
+    mask = mapped.notna() & mapped.ne("")
+    _replace_where(out, tm_tracking_col, mask, mapped[mask].astype(str).str.replace("-", "", regex=False))
+    return out
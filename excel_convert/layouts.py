@@ -0,0 +1,145 @@
+# layouts.py
+# 헤더 양식(레이아웃) 등록부: 정규화한 헤더 행의 지문 → 플랫폼 + 해석된 열 위치
+#   - JSON 파일로 저장해 세션/프로세스가 바뀌어도 재사용 (경로: EXCEL_CONVERT_LAYOUTS 환경변수, excel_convert.registry)
+#   - 아는 양식은 지문 한 번 계산으로 판별/해석 끝
+#   - 처음 보는 양식은 한 번만 판별/해석하고 new=True 로 돌려줌 → 호출부에서 learn() 후 save()
+#   - 판별/해석 규칙(converters 매핑 상수, 판별 함수)의 지문을 같이 저장 → 규칙이 바뀌면 저장된 양식은 버리고 다시 학습
+
+import hashlib
+import inspect
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from excel_convert.converters import (
+    COUPANG_MAPPING,
+    SS_NAME_MAP,
+    TTARIMALL_FIXED_LETTER_MAPPING,
+    detect_platform_by_headers,
+)
+from excel_convert.headers import find_col, norm_header
+from excel_convert.projection import excel_col_to_index
+from excel_convert.registry import JsonRegistry
+
+LAYOUTS_ENV = "EXCEL_CONVERT_LAYOUTS"
+FORMAT_VERSION = 1
+
+
+@dataclass
+class Layout:
+    fingerprint: str
+    platform: str
+    n_cols: int
+    positions: Dict[str, int] = field(default_factory=dict)  # 템플릿/키워드 키 → 0-based 열 위치
+    first_seen: str = ""
+    new: bool = False
+
+    def column_names(self, columns: List) -> Dict[str, object]:
+        """positions 를 실제 컬럼명으로"""
+        return {k: columns[i] for k, i in self.positions.items()}
+
+    def usecols(self, laora_mapping: Optional[Dict[str, str]] = None) -> List[int]:
+        """변환에 필요한 열 위치만 (투영 읽기용). 폭을 넘거나 잘못된 열 문자는 빼고, 오류는 변환 단계가 보고"""
+        if self.platform != "LAORA":
+            return sorted(set(self.positions.values()))
+        mapping = laora_mapping if isinstance(laora_mapping, dict) else {}
+        wanted = set()
+        for letters in mapping.values():
+            if not letters:
+                continue
+            try:
+                idx = excel_col_to_index(letters)
+            except ValueError:
+                continue
+            if idx < self.n_cols:
+                wanted.add(idx)
+        return sorted(wanted)
+
+
+def fingerprint(columns: Iterable) -> str:
+    normed = "\x1f".join(norm_header(c) for c in columns)
+    return hashlib.blake2b(normed.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _letter_positions(mapping: Dict[str, str], n_cols: int) -> Dict[str, int]:
+    positions = {k: excel_col_to_index(v) for k, v in mapping.items() if v}
+    return {k: i for k, i in positions.items() if i < n_cols}
+
+
+def resolve_layout(columns: List, fp: Optional[str] = None) -> Layout:
+    """등록부 없이 판별 + 열 위치 해석 (새 양식일 때만 호출됨)"""
+    columns = list(columns)
+    platform = detect_platform_by_headers(columns)
+    positions: Dict[str, int] = {}
+    if platform == "SMARTSTORE":
+        for key, candidates in SS_NAME_MAP.items():
+            try:
+                positions[key] = columns.index(find_col(candidates, columns))
+            except KeyError:
+                pass  # 없는 열은 변환 단계에서 원래 오류 메시지로 보고
+    elif platform == "COUPANG":
+        positions = _letter_positions(COUPANG_MAPPING, len(columns))
+    elif platform == "TTARIMALL":
+        positions = _letter_positions(dict(TTARIMALL_FIXED_LETTER_MAPPING, 상품명_비교="S"), len(columns))
+    # LAORA 는 사용자 매핑(열 문자)을 따르므로 위치를 저장하지 않음
+    return Layout(
+        fingerprint=fp or fingerprint(columns),
+        platform=platform,
+        n_cols=len(columns),
+        positions=positions,
+        first_seen=datetime.now().isoformat(timespec="seconds"),
+        new=True,
+    )
+
+
+def _rules_hash() -> str:
+    parts = [repr(COUPANG_MAPPING), repr(SS_NAME_MAP), repr(TTARIMALL_FIXED_LETTER_MAPPING)]
+    for fn in (detect_platform_by_headers, resolve_layout):
+        try:
+            parts.append(inspect.getsource(fn))
+        except (OSError, TypeError):  # 소스 없이 배포된 경우
+            parts.append(repr(fn.__code__.co_consts) + fn.__code__.co_code.hex())
+    return hashlib.blake2b("\x1f".join(parts).encode("utf-8"), digest_size=8).hexdigest()
+
+
+RULES_HASH = _rules_hash()
+
+
+class LayoutRegistry(JsonRegistry[Layout]):
+    env = LAYOUTS_ENV
+    file_name = "layouts.json"
+    section = "layouts"
+    version = FORMAT_VERSION
+
+    def _header(self) -> dict:
+        # 판별 규칙이 바뀐 파일도 통째로 무시 (다음 save() 에서 덮어씀)
+        return dict(super()._header(), rules=RULES_HASH)
+
+    def _decode(self, key: str, entry: dict) -> Layout:
+        return Layout(fingerprint=key, **entry)
+
+    def _encode(self, item: Layout) -> dict:
+        return {k: v for k, v in asdict(item).items() if k not in ("fingerprint", "new")}
+
+    def lookup(self, columns: Iterable) -> Layout:
+        """아는 양식이면 저장된 Layout, 아니면 새로 해석한 Layout(new=True, 아직 저장 안 함)"""
+        columns = list(columns)
+        fp = fingerprint(columns)
+        with self._lock:
+            self._load()
+            known = self._entries.get(fp)
+        if known is not None and known.n_cols == len(columns):
+            return known
+        return resolve_layout(columns, fp)
+
+    def learn(self, layout: Layout) -> bool:
+        """새 양식 등록. 이미 있으면 False"""
+        with self._lock:
+            self._load()
+            if layout.fingerprint in self._entries:
+                return False
+            self._entries[layout.fingerprint] = Layout(**dict(asdict(layout), new=False))
+            return True
+
+
+LAYOUTS = LayoutRegistry()
@@ -0,0 +1,101 @@
+# matching.py
+# 송장파일 ↔ 주문파일 매칭용 키/매핑 생성 (컬럼 단위로 한 번에 처리)
+#   - 숫자키: 주문번호에서 숫자만 남긴 값 (형식/자리수 무시 비교용)
+#   - DigitKeys: DataFrame·컬럼별 숫자키를 메모해 송장등록 1회 실행 중 같은 열을 다시 정규화하지 않음
+#   - InvoiceIndex: 송장파일을 한 번 훑어 원문/숫자키/라오·스마트스토어 분류 조회표를 만들어 공유
+
+import re
+import weakref
+from typing import Dict, Hashable, Optional
+
+import pandas as pd
+
+from excel_convert.text_columns import text_column
+
+_NON_DIGITS = re.compile(r"\D+")
+
+
+def digits_series(values: pd.Series) -> pd.Series:
+    """Series 전체를 한 번에 숫자키로 (숫자가 아닌 문자 제거, 빈 값은 "")"""
+    return text_column(values).str.replace(_NON_DIGITS, "", regex=True)
+
+
+class DigitKeys:
+    """
+    (DataFrame, 컬럼) → 숫자키 Series 메모.
+    DataFrame 은 약한 참조로 확인하므로 같은 id 를 재사용한 다른 객체와 섞이지 않는다.
+    """
+
+    def __init__(self):
+        self._memo: Dict[tuple, tuple] = {}
+
+    def get(self, df: pd.DataFrame, col: Hashable) -> pd.Series:
+        key = (id(df), col)
+        hit = self._memo.get(key)
+        if hit is not None and hit[0]() is df:
+            return hit[1]
+        keys = digits_series(df[col])
+        # 조회표가 여러 번 실행에 걸쳐 재사용되므로, 이미 사라진 DataFrame 의 숫자키는 버림
+        self._memo = {k: v for k, v in self._memo.items() if v[0]() is not None}
+        self._memo[key] = (weakref.ref(df), keys)
+        return keys
+
+
+def digits_key_map(keys: pd.Series, tracks: pd.Series) -> Dict[str, str]:
+    """
+    {숫자키: 송장번호}  (keys 는 digits_series / DigitKeys.get 결과)
+      - 숫자키가 비었거나 송장번호가 빈 값(결측 포함)인 행은 제외
+      - 같은 키가 여러 번 나오면 마지막 행이 이김 (행 단위 루프와 동일)
+    """
+    tracks = text_column(tracks)
+    valid = keys.ne("") & tracks.ne("")
+    return dict(zip(keys[valid].tolist(), tracks[valid].tolist()))
+
+
+
+class InvoiceIndex:
+    """
+    송장파일 한 장을 한 번만 훑어 만든 조회표. 라오/스마트스토어/쿠팡/떠리몰 채우기가 모두 이것을 조회한다.
+      - by_order: {주문번호 원문: 송장번호}  (빈 값/결측 제외)
+      - lao: {주문번호: 송장번호}  ('LO' 포함)
+      - ss_by_digits / ss_by_order: 숫자 16자리 주문 (숫자키 / 원문 키)
+      - digits_map(col): {col 의 숫자키: 송장번호}  (열별로 한 번만 생성)
+    """
+
+    def __init__(self, df: pd.DataFrame, order_col: Hashable, tracking_col: Hashable,
+                 keys: Optional[DigitKeys] = None):
+        self.df = df
+        self.order_col = order_col
+        self.tracking_col = tracking_col
+        self.keys = keys or DigitKeys()
+        self.tracks = text_column(df[tracking_col])
+        self._digit_maps: Dict[Hashable, Dict[str, str]] = {}
+
+        orders = text_column(df[order_col])
+        tracks = self.tracks
+        valid = orders.ne("") & tracks.ne("")
+        self.by_order: Dict[str, str] = dict(zip(orders[valid].tolist(), tracks[valid].tolist()))
+
+        self.lao: Dict[str, str] = {}
+        self.ss_by_digits: Dict[str, str] = {}
+        self.ss_by_order: Dict[str, str] = {}
+        stripped = [o.strip() for o in self.by_order]
+        all_digits = digits_series(pd.Series(stripped, dtype=object)).tolist()
+        for s, digits, t in zip(stripped, all_digits, self.by_order.values()):
+            if "LO" in s.upper():
+                self.lao[s] = t
+            elif len(digits) == 16:
+                self.ss_by_digits[digits] = t
+                self.ss_by_order[s] = t
+
+    def __len__(self) -> int:
+        return len(self.df)
+
+    def digits_map(self, col: Optional[Hashable] = None) -> Dict[str, str]:
+        """주문번호 열(기본: order_col)의 숫자키 → 송장번호"""
+        col = self.order_col if col is None else col
+        found = self._digit_maps.get(col)
+        if found is None:
+            found = digits_key_map(self.keys.get(self.df, col), self.tracks)
+            self._digit_maps[col] = found
+        return found
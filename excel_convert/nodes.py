@@ -0,0 +1,52 @@
+# nodes.py
+# 증분 계산 노드 (송장등록처럼 입력 파일 여러 개 → 출력 여러 개인 화면용)
+#   - 노드 이름마다 마지막 입력 키(의존하는 업로드의 내용 해시 + 옵션)와 결과를 하나씩 보관
+#   - 키가 같으면 이전 결과를 그대로, 다르면 그 노드만 다시 계산 → 파일 하나를 바꾸면 그 파일에 걸린 출력만 새로
+#   - 입력 읽기(복호화 포함)도 노드 안에서 하므로 바뀌지 않은 파일은 다시 읽지 않는다
+#   - 세션마다 하나 (st.session_state 에 둠). 결과는 ParseCache 와 같이 얕은 복사로 돌려줌
+
+from typing import Callable, Dict, Hashable, List, Tuple
+
+from excel_convert.parse_cache import _share
+
+
+class NodeCache:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.recomputed: List[str] = []  # begin() 이후 다시 계산한 노드
+        self.reused: List[str] = []
+        self._nodes: Dict[str, Tuple[Hashable, object]] = {}
+
+    def begin(self):
+        """실행 한 번의 시작 (다시 계산/재사용 목록 초기화)"""
+        self.recomputed = []
+        self.reused = []
+
+    def get(self, name: str, key: Hashable, compute: Callable[[], object]):
+        """name 노드의 결과. 마지막 키와 같으면 재사용, 아니면 compute() (예외는 저장하지 않고 그대로 올림)"""
+        entry = self._nodes.get(name)
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            self.reused.append(name)
+            return _share(entry[1])
+        self.misses += 1
+        value = compute()
+        self._nodes[name] = (key, value)
+        self.recomputed.append(name)
+        return _share(value)
+
+    def clear(self):
+        self._nodes.clear()
+        self.hits = 0
+        self.misses = 0
+        self.recomputed = []
+        self.reused = []
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def summary(self) -> str:
+        recomputed = ", ".join(self.recomputed) or "없음"
+        reused = ", ".join(self.reused) or "없음"
+        return f"다시 계산: {recomputed} · 재사용: {reused}"
@@ -0,0 +1,94 @@
+# parse_cache.py
+# 업로드 파일 파싱 결과 캐시 (Streamlit 재실행 간 공유)
+#   - 키: 업로드 바이트의 해시 + 리더 옵션
+#   - 용량(바이트) 기준 LRU: 한도를 넘으면 가장 오래 안 쓴 결과부터 버림
+#   - 적중/미스 카운터는 사이드바에 표시
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional, Tuple
+
+import pandas as pd
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _frame_bytes(value) -> int:
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, (tuple, list)):
+        return sum(_frame_bytes(v) for v in value)
+    return 0
+
+
+def _share(value):
+    # 호출부가 컬럼을 추가/삭제해도 캐시 원본이 바뀌지 않도록 얕은 복사로 돌려준다
+    if isinstance(value, pd.DataFrame):
+        return value.copy(deep=False)
+    if isinstance(value, tuple):
+        return tuple(_share(v) for v in value)
+    return value
+
+
+class ParseCache:
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.bytes = 0
+        self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[object, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_parse(self, digest: str, options: Hashable, parse: Callable[[], object]):
+        key = (digest, options)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return _share(entry[0])
+            self.misses += 1
+
+        value = parse()
+        size = _frame_bytes(value)
+        with self._lock:
+            if size <= self.max_bytes and key not in self._entries:
+                self._entries[key] = (value, size)
+                self.bytes += size
+                while self.bytes > self.max_bytes:
+                    _, (_, old_size) = self._entries.popitem(last=False)
+                    self.bytes -= old_size
+        return _share(value)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def summary(self) -> str:
+        total = self.hits + self.misses
+        rate = (self.hits / total * 100) if total else 0.0
+        return (
+            f"파싱 캐시: 적중 {self.hits} / 미스 {self.misses} ({rate:.0f}%) · "
+            f"{len(self)}건 · {self.bytes / 1024 / 1024:.1f}MB / {self.max_bytes / 1024 / 1024:.0f}MB"
+        )
+
+
+PARSE_CACHE = ParseCache()
+
+
+def cached_parse(data: bytes, options: Hashable, parse: Callable[[], object], digest: Optional[str] = None):
+    """data(업로드 바이트) + options 로 캐시 조회, 없으면 parse() 실행 후 저장"""
+    return PARSE_CACHE.get_or_parse(digest or content_hash(data), options, parse)
@@ -0,0 +1,143 @@
+# perf.py
+# 단계별 성능 기록 (읽기 / 판별 / 변환 / 매칭 / 숫자 정렬 / 저장 등)
+#   - 단계마다 걸린 시간, 처리 행 수(→ 초당 행 수), 메모리 할당
+#   - 메모리: pyarrow 메모리 풀 할당 바이트(pyarrow 가 있으면 항상, 비용 거의 없음)
+#     + 파이썬 객체 할당 최대치(tracemalloc, memory=True 일 때만 — 몇 배 느려지므로 기본은 끔)
+#   - 기록(Trace)은 dataclass 라 작업자 프로세스에서 만들어 결과와 함께 돌려줄 수 있다
+#   - JSON 으로 내보내 다른 실행/다른 버전과 비교
+
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Iterator, List, Optional
+
+import pandas as pd
+
+STAGE_LABELS = {
+    "sniff": "헤더", "detect": "판별", "read": "읽기", "convert": "변환", "match": "매칭", "align": "숫자 정렬",
+    "write": "저장", "stream": "읽기·변환·저장",
+}
+
+
+def _arrow_pool():
+    try:
+        import pyarrow as pa
+    except ImportError:
+        return None
+    return pa.default_memory_pool()
+
+
+@dataclass
+class Stage:
+    name: str
+    detail: str = ""  # 같은 단계가 여러 번일 때 구분 (예: 읽기 (송장파일))
+    seconds: float = 0.0
+    rows: Optional[int] = None
+    arrow_bytes: Optional[int] = None  # 이 단계에서 Arrow 풀이 새로 할당한 바이트
+    py_peak_bytes: Optional[int] = None  # 이 단계 동안 파이썬 객체 할당 최대 (memory=True 일 때)
+
+    @property
+    def label(self) -> str:
+        label = STAGE_LABELS.get(self.name, self.name)
+        return f"{label} ({self.detail})" if self.detail else label
+
+    @property
+    def rows_per_sec(self) -> Optional[float]:
+        if self.rows is None or self.seconds <= 0:
+            return None
+        return self.rows / self.seconds
+
+    def text(self) -> str:
+        parts = [f"{self.label} {self.seconds:.2f}s"]
+        if self.rows_per_sec is not None:
+            parts.append(f"{self.rows:,}행 {self.rows_per_sec:,.0f}행/s")
+        if self.arrow_bytes:
+            parts.append(f"Arrow {self.arrow_bytes / 2**20:.1f}MB")
+        if self.py_peak_bytes is not None:
+            parts.append(f"최대 {self.py_peak_bytes / 2**20:.1f}MB")
+        return " ".join(parts)
+
+
+@dataclass
+class Trace:
+    """작업 하나(파일 하나, 송장등록 한 번 등)의 단계 기록"""
+
+    name: str
+    memory: bool = False
+    started: str = field(default_factory=lambda: datetime.now().isoformat(timespec="seconds"))
+    stages: List[Stage] = field(default_factory=list)
+
+    @contextmanager
+    def stage(self, name: str, detail: str = "", rows: Optional[int] = None) -> Iterator[Stage]:
+        """with trace.stage("read") as s: ... ; s.rows = len(df)  (예외가 나도 걸린 시간은 남김, 중첩하지 말 것)"""
+        rec = Stage(name=name, detail=detail, rows=rows)
+        pool = _arrow_pool()
+        arrow0 = pool.total_bytes_allocated() if pool is not None else None
+        started_tracing = False
+        if self.memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            tracemalloc.reset_peak()
+            py0 = tracemalloc.get_traced_memory()[0]
+        t = time.perf_counter()
+        try:
+            yield rec
+        finally:
+            rec.seconds = time.perf_counter() - t
+            if pool is not None:
+                rec.arrow_bytes = pool.total_bytes_allocated() - arrow0
+            if self.memory:
+                rec.py_peak_bytes = max(0, tracemalloc.get_traced_memory()[1] - py0)
+                if started_tracing:
+                    tracemalloc.stop()
+            self.stages.append(rec)
+
+    @property
+    def seconds(self) -> float:
+        return sum(s.seconds for s in self.stages)
+
+    def timings(self) -> "dict[str, float]":
+        """{단계 이름: 초} (같은 이름이 여러 번이면 합계)"""
+        out: "dict[str, float]" = {}
+        for s in self.stages:
+            out[s.name] = out.get(s.name, 0.0) + s.seconds
+        return out
+
+    def text(self) -> str:
+        return " · ".join(s.text() for s in self.stages)
+
+    def to_dict(self) -> dict:
+        d = asdict(self)
+        for rec, s in zip(d["stages"], self.stages):
+            rec["rows_per_sec"] = s.rows_per_sec
+        return d
+
+
+def traces_json(traces: List[Trace], **meta) -> bytes:
+    """JSON 내보내기: {"created", 추가 정보..., "traces": [...]}"""
+    doc = {"created": datetime.now().isoformat(timespec="seconds"), **meta,
+           "traces": [t.to_dict() for t in traces if t is not None]}
+    return json.dumps(doc, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def traces_table(traces: List[Trace]) -> pd.DataFrame:
+    """성능 패널용 표: 작업 × 단계 한 줄씩"""
+    rows = []
+    for t in traces:
+        if t is None:
+            continue
+        for s in t.stages:
+            rows.append({
+                "작업": t.name,
+                "단계": s.label,
+                "시간(s)": round(s.seconds, 3),
+                "행": s.rows,
+                "행/s": None if s.rows_per_sec is None else round(s.rows_per_sec),
+                "Arrow 할당(MB)": None if s.arrow_bytes is None else round(s.arrow_bytes / 2**20, 1),
+                "파이썬 최대(MB)": None if s.py_peak_bytes is None else round(s.py_peak_bytes / 2**20, 1),
+            })
+    return pd.DataFrame(rows, columns=["작업", "단계", "시간(s)", "행", "행/s", "Arrow 할당(MB)", "파이썬 최대(MB)"])
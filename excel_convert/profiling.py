@@ -0,0 +1,174 @@
+# profiling.py
+# 실행 한 번 프로파일링 (운영 크기 파일로 그 자리에서 회귀 추적 — 노트북으로 코드 옮길 필요 없이)
+#   - cProfile(표준 라이브러리): .prof 로 내려받아 snakeviz / python -m pstats 로 열기
+#   - pyinstrument 가 설치돼 있으면 선택 가능: 호출 트리 HTML 보고서
+#   - 보고서에 주요 함수(원본 읽기 / convert_* / make_*_filled_df / download_df 와 다운로드 직렬화) 표
+#   - 프로파일 중에는 다운로드 페이로드를 바로 만든다(downloads.eager_payloads) → 직렬화 비용도 보고서에 들어감
+#     (만든 결과는 페이로드 캐시에 남으므로 이후 버튼 클릭은 다시 직렬화하지 않음)
+
+import cProfile
+import io
+import marshal
+import pstats
+import re
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from excel_convert.downloads import eager_payloads
+
+ENGINES = ("cProfile", "pyinstrument")
+# 보고서 '주요 함수' 표에 모으는 함수 이름
+FOCUS = re.compile(
+    r"read_first_sheet_source_as_text|read_xlsx_as_text|read_smartstore_with_password|_read_excel_any"
+    r"|convert_(?:laora|coupang|smartstore_keywords|ttarimall|by_platform|file|batch|path)|post_numeric_alignment"
+    r"|make_\w+_filled_df\w*|make_lao_invoice_df|build_invoice_index"
+    r"|download_df|df_to_xlsx_bytes|to_csv"
+)
+FOCUS_COLUMNS = ["함수", "위치", "호출", "자체(s)", "누적(s)"]
+
+
+def available_engines() -> List[str]:
+    """설치된 프로파일러 (cProfile 은 항상)"""
+    try:
+        import pyinstrument  # noqa: F401
+    except ImportError:
+        return ["cProfile"]
+    return list(ENGINES)
+
+
+def _short_path(path: str) -> str:
+    parts = re.split(r"[\\/]", path)
+    return "/".join(parts[-2:])
+
+
+@dataclass
+class ProfileReport:
+    name: str
+    engine: str
+    seconds: float
+    started: str
+    text: str = ""  # 누적 시간 상위 함수 (pstats / pyinstrument 텍스트)
+    focus: List[Dict] = field(default_factory=list)  # 주요 함수 행 (FOCUS_COLUMNS)
+    prof: Optional[bytes] = None  # cProfile: pstats 덤프 (.prof)
+    html: Optional[str] = None  # pyinstrument: HTML 보고서
+
+    def focus_table(self) -> pd.DataFrame:
+        return pd.DataFrame(self.focus, columns=FOCUS_COLUMNS)
+
+    def file_stem(self) -> str:
+        return f"profile_{self.name}_{self.started.replace(':', '').replace('-', '')}"
+
+
+def _cprofile_focus(stats: pstats.Stats) -> List[Dict]:
+    rows = []
+    for (path, line, func), (_cc, nc, tt, ct, _callers) in stats.stats.items():
+        if FOCUS.fullmatch(func):
+            rows.append({"함수": func, "위치": f"{_short_path(path)}:{line}", "호출": nc,
+                         "자체(s)": round(tt, 3), "누적(s)": round(ct, 3)})
+    return _by_name(rows)
+
+
+def _by_name(rows: List[Dict]) -> List[Dict]:
+    """누적 시간 순, 같은 이름은 가장 긴 것 하나만 (to_csv 처럼 바깥/안쪽 구현이 같은 이름일 때)"""
+    out: Dict[str, Dict] = {}
+    for row in sorted(rows, key=lambda r: -r["누적(s)"]):
+        out.setdefault(row["함수"], row)
+    return list(out.values())
+
+
+def _pyinstrument_focus(root) -> List[Dict]:
+    """호출 트리에서 주요 함수 프레임 시간 합계 (재귀 안쪽 같은 함수는 다시 세지 않음)"""
+    totals: Dict[tuple, Dict] = {}
+
+    def walk(frame, inside: frozenset):
+        key = (frame.function, frame.file_path_short, frame.line_no)
+        if FOCUS.fullmatch(frame.function or "") and key not in inside:
+            row = totals.setdefault(key, {"함수": frame.function, "위치": f"{_short_path(frame.file_path or '')}:{frame.line_no}",
+                                          "호출": 0, "자체(s)": 0.0, "누적(s)": 0.0})
+            row["호출"] += 1  # 샘플링이라 실제 호출 수가 아니라 트리에 나타난 횟수
+            row["자체(s)"] += frame.total_self_time
+            row["누적(s)"] += frame.time
+            inside = inside | {key}
+        for child in frame.children:
+            walk(child, inside)
+
+    if root is not None:
+        walk(root, frozenset())
+    return _by_name([{**r, "자체(s)": round(r["자체(s)"], 3), "누적(s)": round(r["누적(s)"], 3)} for r in totals.values()])
+
+
+class RunProfiler:
+    """start() ~ stop() 사이를 프로파일. 같은 스레드에서 시작/끝낼 것 (Streamlit 은 실행 한 번이 한 스레드)"""
+
+    def __init__(self, name: str, engine: str = "cProfile", top: int = 40):
+        if engine not in available_engines():
+            raise ValueError(f"사용할 수 없는 프로파일러: {engine}")
+        self.name = name
+        self.engine = engine
+        self.top = top
+        self._profiler = None
+        self._eager = None
+        self._t0 = 0.0
+        self._started = ""
+
+    @property
+    def running(self) -> bool:
+        return self._profiler is not None
+
+    def start(self) -> "RunProfiler":
+        """다른 프로파일러가 이미 돌고 있으면 ValueError / RuntimeError (파이썬·pyinstrument 버전에 따라)"""
+        self._started = datetime.now().isoformat(timespec="seconds")
+        if self.engine == "pyinstrument":
+            from pyinstrument import Profiler
+
+            profiler = Profiler()
+            profiler.start()
+        else:
+            profiler = cProfile.Profile()
+            profiler.enable()
+        self._profiler = profiler
+        self._eager = eager_payloads()
+        self._eager.__enter__()
+        self._t0 = time.perf_counter()
+        return self
+
+    def _halt(self):
+        profiler, self._profiler = self._profiler, None
+        if profiler is None:
+            return None
+        if self.engine == "pyinstrument":
+            profiler.stop()
+        else:
+            profiler.disable()
+        self._eager.__exit__(None, None, None)
+        self._eager = None
+        return profiler
+
+    def discard(self):
+        """결과 없이 끝냄 (프로파일할 실행이 없었을 때)"""
+        self._halt()
+
+    def stop(self, name: Optional[str] = None) -> Optional[ProfileReport]:
+        """끝내고 보고서 (name: 보고서 이름을 실행한 작업 이름으로 바꿀 때)"""
+        seconds = time.perf_counter() - self._t0
+        profiler = self._halt()
+        if profiler is None:
+            return None
+        report = ProfileReport(name=name or self.name, engine=self.engine, seconds=seconds, started=self._started)
+        if self.engine == "pyinstrument":
+            report.text = profiler.output_text(unicode=True, color=False)
+            report.html = profiler.output_html()
+            report.focus = _pyinstrument_focus(profiler.last_session.root_frame())
+            return report
+        profiler.create_stats()
+        out = io.StringIO()
+        stats = pstats.Stats(profiler, stream=out)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.top)
+        report.text = out.getvalue()
+        report.prof = marshal.dumps(stats.stats)  # pstats.Stats.dump_stats 와 같은 형식 (Stats 가 profiler.stats 를 가져감)
+        report.focus = _cprofile_focus(stats)
+        return report
@@ -0,0 +1,77 @@
+# projection.py
+# 매핑(열 문자/컬럼명)이 실제로 쓰는 열만 골라 읽기 위한 헬퍼
+#   - 헤더 행만 먼저 읽어 열 폭을 알고, 매핑 열 문자가 폭을 넘으면 본문 파싱 전에 IndexError
+#     (폭은 pd.read_excel 과 같이 헤더보다 넓은 데이터 행까지 포함, XlsxBook.data_width.
+#      <dimension> 이 없는 파일은 헤더 폭 — 매핑 열 문자가 그 밖일 때만 본문 셀 위치를 훑어 확인)
+#   - 나머지 열은 디코딩/DataFrame 생성 자체를 하지 않음
+
+import re
+from typing import Iterable, List, Tuple
+
+import pandas as pd
+
+from excel_convert.parse_cache import PARSE_CACHE
+from excel_convert.xlsx_reader import XlsxBook, pad_columns, read_xlsx_as_text
+
+
+def excel_col_to_index(col_letters: str) -> int:
+    col_letters = str(col_letters).strip().upper()
+    if not re.fullmatch(r"[A-Z]+", col_letters):
+        raise ValueError(f"Invalid Excel column letters: {col_letters}")
+    idx = 0
+    for ch in col_letters:
+        idx = idx * 26 + (ord(ch) - ord('A') + 1)
+    return idx - 1  # 0-based
+
+
+def letters_to_usecols(letters: Iterable[str], n_cols: int, label: str = "소스 파일") -> List[int]:
+    """열 문자 목록 → 정렬된 0-based usecols. 시트 폭을 넘는 문자가 있으면 IndexError"""
+    usecols = set()
+    for xl_letters in letters:
+        if not xl_letters:
+            continue
+        idx = excel_col_to_index(xl_letters)
+        if idx >= n_cols:
+            raise IndexError(
+                f"{label}에 {xl_letters} 열(0-based index {idx})이 존재하지 않습니다. "
+                f"소스 컬럼 수: {n_cols}"
+            )
+        usecols.add(idx)
+    return sorted(usecols)
+
+
+def _header_columns(book: XlsxBook) -> Tuple:
+    columns = list(read_xlsx_as_text(book, nrows=0, cache=False).columns)
+    return tuple(pad_columns(columns, book.data_width(len(columns))))
+
+
+def read_header(source, cache: bool = True) -> Tuple[XlsxBook, List]:
+    """
+    헤더 행만 읽어 (열린 북, 전체 컬럼명 목록) 반환. 북은 본문 읽기에 그대로 재사용
+    데이터 행이 헤더보다 넓으면 그 열도 'Unnamed: n' 으로 포함 (pd.read_excel 과 같은 목록)
+    cache=False: 파싱 캐시에 넣지 않음 (배치/폴더 감시처럼 한 번 읽고 끝나는 파일)
+    """
+    book = source if isinstance(source, XlsxBook) else XlsxBook(source)
+    if not cache:
+        return book, list(_header_columns(book))
+    return book, list(PARSE_CACHE.get_or_parse(book.digest, ("header_columns",), lambda: _header_columns(book)))
+
+
+def read_projected_by_letters(source, letters: Iterable[str], label: str = "소스 파일") -> Tuple[pd.DataFrame, List]:
+    """
+    매핑 열 문자가 가리키는 열만 읽는다.
+    반환: (투영된 DataFrame, 전체 컬럼명 목록) — 열 문자 → 컬럼명 해석은 전체 목록으로
+    """
+    book, columns = read_header(source)
+    letters = [x for x in letters if x]
+    if any(excel_col_to_index(x) >= len(columns) for x in letters):
+        columns = pad_columns(columns, book.data_width(len(columns), scan=True))
+    usecols = letters_to_usecols(letters, len(columns), label)
+    return read_xlsx_as_text(book, usecols=usecols), columns
+
+
+def read_projected_by_names(book: XlsxBook, header_columns: List, names: Iterable) -> pd.DataFrame:
+    """read_header 로 얻은 컬럼명 중 names 에 해당하는 열만 읽는다 (키워드 매핑용)"""
+    wanted = set(names)
+    usecols = [i for i, c in enumerate(header_columns) if c in wanted]
+    return read_xlsx_as_text(book, usecols=usecols)
@@ -0,0 +1,76 @@
+# registry.py
+# JSON 파일 하나에 저장하는 등록부 공통 부분 (layouts.LayoutRegistry, templates.TemplateRegistry)
+#   - 경로: 환경변수 → 없으면 ~/.cache/excel_convert/<파일명>
+#   - 처음 쓸 때 한 번 읽음. 머리(version 등)가 지금과 다른 파일은 통째로 무시, 형식이 맞지 않는 항목은 하나씩 무시
+#   - save(): 임시 파일에 쓰고 교체 (excel_convert.atomic). 실패는 무시 (다음 실행에서 다시 만들 뿐)
+#   - 하위 클래스는 항목 ↔ JSON 변환(_decode/_encode)과 자기 기능만
+
+import json
+import os
+import threading
+from typing import Dict, Generic, Optional, TypeVar
+
+from excel_convert.atomic import atomic_file
+
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "excel_convert")
+
+T = TypeVar("T")
+
+
+class JsonRegistry(Generic[T]):
+    env: str = ""  # 경로 환경변수 이름
+    file_name: str = ""  # 기본 경로의 파일 이름 (예: layouts.json)
+    section: str = ""  # JSON 안에서 항목을 담는 키
+    version: int = 1
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.environ.get(self.env) or os.path.join(CACHE_DIR, self.file_name)
+        self._entries: Dict[str, T] = {}
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def _header(self) -> dict:
+        """파일 머리. 읽을 때 값이 하나라도 다르면 그 파일은 버림"""
+        return {"version": self.version}
+
+    def _decode(self, key: str, entry: dict) -> T:
+        raise NotImplementedError
+
+    def _encode(self, item: T) -> dict:
+        raise NotImplementedError
+
+    def _load(self):
+        # 호출부에서 self._lock 을 잡은 채로
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            with open(self.path, "r", encoding="utf-8") as fh:
+                raw = json.load(fh)
+        except (OSError, ValueError):
+            return
+        if any(raw.get(k) != v for k, v in self._header().items()):
+            return
+        for key, entry in raw.get(self.section, {}).items():
+            try:
+                self._entries[key] = self._decode(key, entry)
+            except TypeError:
+                continue  # 형식이 맞지 않는 항목은 무시 (다시 등록/학습)
+
+    def save(self):
+        """임시 파일에 쓰고 교체 (다른 프로세스가 읽는 중에도 깨진 파일이 보이지 않음). 실패는 무시"""
+        with self._lock:
+            payload = dict(self._header())
+            payload[self.section] = {key: self._encode(item) for key, item in self._entries.items()}
+        stem = os.path.splitext(self.file_name)[0]
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with atomic_file(self.path, "w", encoding="utf-8", prefix=f".{stem}-", suffix=".json") as fh:
+                json.dump(payload, fh, ensure_ascii=False, indent=1, default=str)  # 날짜 등 문자열이 아닌 값은 문자열로
+        except OSError:
+            pass
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._load()
+            return len(self._entries)
@@ -0,0 +1,107 @@
+# streaming.py
+# 행 묶음 변환 (쿠팡/떠리몰 = 열 문자 고정 매핑): 소스를 CHUNK_ROWS 행씩 읽어 묶음마다 매핑을 적용하고
+# 결과 XLSX/CSV 스트림에 바로 쓴다 → 원본/결과 DataFrame 전체가 메모리에 동시에 올라가지 않음
+#   - 열 문자 → 컬럼명 해석은 read_header 의 전체 컬럼명 기준 (묶음 컬럼명도 같은 목록)
+#   - 결과 값은 전체 읽기 → convert_* → 쓰기 와 같다
+
+import io
+import itertools
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from excel_convert.atomic import atomic_file
+from excel_convert.converters import TemplateSchema, convert_by_platform, post_numeric_alignment
+from excel_convert.layouts import LAYOUTS, Layout
+from excel_convert.projection import read_header
+from excel_convert.xlsx_reader import CHUNK_ROWS, XlsxBook, iter_xlsx_text_chunks, read_xlsx_as_text
+from excel_convert.xlsx_writer import df_to_xlsx_bytes, write_xlsx_chunks
+
+STREAM_PLATFORMS = ("COUPANG", "TTARIMALL")
+
+
+def output_columns(template_columns: List[str], out_df: pd.DataFrame) -> List:
+    return template_columns + [c for c in out_df.columns if c not in template_columns]
+
+
+def iter_converted_chunks(
+    book: XlsxBook,
+    platform: str,
+    columns: List,
+    usecols: List[int],
+    schema: TemplateSchema,
+    laora_mapping: Optional[Dict[str, str]] = None,
+    chunksize: int = CHUNK_ROWS,
+) -> Iterator[pd.DataFrame]:
+    """columns: 헤더 행 전체 컬럼명 (read_header), usecols: 매핑이 쓰는 열. 최소 한 묶음은 내보냄"""
+    template_columns = schema.template_columns
+    for chunk in iter_xlsx_text_chunks(book, usecols, chunksize=chunksize, columns=columns):
+        out = convert_by_platform(platform, chunk, template_columns, laora_mapping, source_columns=columns)
+        post_numeric_alignment(out, schema)
+        yield out[output_columns(template_columns, out)]
+
+
+def chunks_to_xlsx_bytes(chunks: Iterator[pd.DataFrame]) -> Tuple[bytes, int]:
+    """
+    변환 묶음 → XLSX 바이트, 행 수.
+    묶음이 하나뿐(= CHUNK_ROWS 행 이하)이면 df_to_xlsx_bytes 그대로 (작은 파일은 엔진 선택도 기존과 같음)
+    """
+    first = next(chunks)
+    second = next(chunks, None)
+    if second is None:
+        return df_to_xlsx_bytes(first), len(first)
+    buf = io.BytesIO()
+    n_rows = write_xlsx_chunks(buf, list(first.columns), itertools.chain([first, second], chunks))
+    return buf.getvalue(), n_rows
+
+
+def write_csv_chunks(fh: BinaryIO, chunks: Iterator[pd.DataFrame], sep: str = ",", encoding: str = "utf-8-sig") -> int:
+    """변환 묶음을 CSV 로 fh 에 이어 씀 (헤더는 첫 묶음에서 한 번). 반환: 데이터 행 수"""
+    text = io.TextIOWrapper(fh, encoding=encoding, newline="")
+    n_rows = 0
+    try:
+        for i, chunk in enumerate(chunks):
+            chunk.to_csv(text, sep=sep, index=False, header=(i == 0))
+            n_rows += len(chunk)
+        text.flush()
+    finally:
+        text.detach()  # fh 는 호출한 쪽에서 닫음
+    return n_rows
+
+
+def convert_path(
+    src_path: str,
+    out_path: str,
+    schema: TemplateSchema,
+    laora_mapping: Optional[Dict[str, str]] = None,
+    chunksize: int = CHUNK_ROWS,
+) -> Tuple[Layout, int]:
+    """
+    파일 하나 판별 + 변환 → out_path (.csv 면 CSV, 그 외 XLSX). 임시 파일에 쓰고 교체.
+    쿠팡/떠리몰은 묶음 단위로 흘려 쓰고, 그 외 플랫폼은 필요한 열만 전체를 읽어 변환한다.
+    반환: (양식, 데이터 행 수)
+    """
+    template_columns = schema.template_columns
+    book, columns = read_header(src_path, cache=False)
+    layout = LAYOUTS.lookup(columns)
+    usecols = layout.usecols(laora_mapping)
+    if layout.platform in STREAM_PLATFORMS:
+        chunks = iter_converted_chunks(book, layout.platform, columns, usecols, schema, laora_mapping,
+                                       chunksize)
+    else:
+        df = read_xlsx_as_text(book, usecols=usecols, cache=False)
+        out = convert_by_platform(layout.platform, df, template_columns, laora_mapping,
+                                  layout.column_names(columns), columns)
+        post_numeric_alignment(out, schema)
+        chunks = iter([out[output_columns(template_columns, out)]])
+
+    with atomic_file(out_path) as fh:
+        if out_path.lower().endswith(".csv"):
+            n_rows = write_csv_chunks(fh, chunks)
+        else:
+            first = next(chunks)
+            n_rows = write_xlsx_chunks(fh, list(first.columns), itertools.chain([first], chunks))
+    if layout.new:
+        LAYOUTS.learn(layout)
+        LAYOUTS.save()
+    return layout, n_rows
@@ -0,0 +1,118 @@
+# templates.py
+# 템플릿(2.xlsx) 등록부: 파일 내용 해시 → 이름 + 열 순서 + dtype 프로필
+#   - 템플릿에서 쓰는 것은 열 목록과 숫자형 여부뿐이므로 처음 올릴 때 한 번만 파싱해 프로필로 저장
+#     → 재실행마다 템플릿을 다시 읽지 않고, 저장된 템플릿은 파일 없이 이름으로 골라 씀
+#   - JSON 파일로 저장 (경로: EXCEL_CONVERT_TEMPLATES 환경변수, excel_convert.registry)
+#   - 변환에는 SavedTemplate.schema() (converters.TemplateSchema) 를 넘긴다
+
+import io
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+import pandas as pd
+
+from excel_convert.converters import TemplateSchema
+from excel_convert.parse_cache import content_hash
+from excel_convert.registry import JsonRegistry
+
+TEMPLATES_ENV = "EXCEL_CONVERT_TEMPLATES"
+FORMAT_VERSION = 1
+
+
+@dataclass
+class SavedTemplate:
+    digest: str
+    name: str
+    columns: List = field(default_factory=list)  # 템플릿 열 순서
+    dtypes: List[str] = field(default_factory=list)  # 열별 dtype 이름 (read_excel 기본 추론)
+    filled: List[bool] = field(default_factory=list)  # 열에 값(예시 행)이 있는지
+    added: str = ""
+
+    def schema(self) -> TemplateSchema:
+        dtypes = dict(zip(self.columns, self.dtypes))
+        filled = {c for c, f in zip(self.columns, self.filled) if f}
+        return TemplateSchema.from_profile(self.columns, dtypes, filled)
+
+
+def read_template(data: bytes) -> pd.DataFrame:
+    """템플릿은 일반적으로 읽기 (dtype 추론 그대로 — 숫자형 열 판단에 사용)"""
+    return pd.read_excel(io.BytesIO(data), sheet_name=0, header=0, engine="openpyxl")
+
+
+def profile_template(tpl_df: pd.DataFrame, digest: str, name: str) -> SavedTemplate:
+    columns = list(tpl_df.columns)
+    return SavedTemplate(
+        digest=digest,
+        name=name,
+        columns=columns,
+        dtypes=[str(tpl_df.iloc[:, i].dtype) for i in range(len(columns))],
+        filled=[bool(tpl_df.iloc[:, i].notna().any()) for i in range(len(columns))],
+        added=datetime.now().isoformat(timespec="seconds"),
+    )
+
+
+class TemplateRegistry(JsonRegistry[SavedTemplate]):
+    env = TEMPLATES_ENV
+    file_name = "templates.json"
+    section = "templates"
+    version = FORMAT_VERSION
+
+    def _decode(self, key: str, entry: dict) -> SavedTemplate:
+        return SavedTemplate(digest=key, **entry)
+
+    def _encode(self, item: SavedTemplate) -> dict:
+        return {k: v for k, v in asdict(item).items() if k != "digest"}
+
+    def _unique_name(self, name: str) -> str:
+        taken = {t.name for t in self._entries.values()}
+        if name not in taken:
+            return name
+        n = 2
+        while f"{name} ({n})" in taken:
+            n += 1
+        return f"{name} ({n})"
+
+    def register(self, data: bytes, name: str) -> Tuple[SavedTemplate, bool]:
+        """
+        템플릿 파일 바이트 → (SavedTemplate, 새로 등록했는지).
+        같은 내용이면 파싱 없이 저장된 것을 그대로 (이름도 처음 것), 처음 보는 내용만 파싱 후 저장.
+        """
+        digest = content_hash(data)
+        with self._lock:
+            self._load()
+            known = self._entries.get(digest)
+        if known is not None:
+            return known, False
+        saved = profile_template(read_template(data), digest, name or "템플릿")
+        with self._lock:
+            if digest in self._entries:  # 그 사이 다른 세션이 등록
+                return self._entries[digest], False
+            saved.name = self._unique_name(saved.name)
+            self._entries[digest] = saved
+        self.save()
+        return saved, True
+
+    def by_name(self, name: str) -> Optional[SavedTemplate]:
+        with self._lock:
+            self._load()
+            return next((t for t in self._entries.values() if t.name == name), None)
+
+    def names(self) -> List[str]:
+        """저장된 템플릿 이름 (등록 순)"""
+        with self._lock:
+            self._load()
+            return [t.name for t in sorted(self._entries.values(), key=lambda t: t.added)]
+
+    def remove(self, name: str) -> bool:
+        with self._lock:
+            self._load()
+            digest = next((d for d, t in self._entries.items() if t.name == name), None)
+            if digest is None:
+                return False
+            del self._entries[digest]
+        self.save()
+        return True
+
+
+TEMPLATES = TemplateRegistry()
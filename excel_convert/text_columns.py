@@ -0,0 +1,80 @@
+# text_columns.py
+# 변환/매칭 전 열 정리: 텍스트로 다루는 열(전화번호, 상품명 조각, 주문번호, 송장번호 등)을 결측 없는 문자열 Series 로
+#   - 소스는 read_xlsx_as_text / read_excel(dtype=str, keep_default_na=False) 로 읽으므로 대부분 이미 결측 없는 문자열
+#     → 그대로 돌려준다 (astype(str) 복사 + str.lower() != "nan" 비교를 하지 않음)
+#   - 정말 결측이 있을 수 있는 열(숫자/혼합 object 열, reindex 로 생긴 열 등)만 문자열로 바꾸고 결측 자리를 "" 로
+#   - 글자 그대로 "nan" 인 셀은 결측이 아니므로 지우지 않는다
+#   - 문자열 저장 방식(EXCEL_CONVERT_STRING_STORAGE): "arrow" pyarrow 문자열 열 / "object" 파이썬 str 객체 열
+#     기본 "auto" = pyarrow 가 있으면 arrow (셀당 메모리가 작고 .str 연산이 빠름). 어느 쪽이든 값은 원문 그대로 (앞 0 보존)
+
+import os
+from typing import Dict, Hashable, List, Union
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import infer_dtype
+
+STRING_STORAGE_ENV = "EXCEL_CONVERT_STRING_STORAGE"
+
+
+def _has_pyarrow() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def string_storage() -> str:
+    """"arrow" / "object". arrow 를 골랐어도 pyarrow 가 없으면 object"""
+    mode = os.environ.get(STRING_STORAGE_ENV, "auto").strip().lower()
+    if mode == "object" or not _has_pyarrow():
+        return "object"
+    return "arrow"
+
+
+def text_dtype() -> Union[pd.StringDtype, type]:
+    """소스 텍스트 열 dtype (read_xlsx_as_text / read_excel(dtype=str) 결과에 적용)"""
+    if string_storage() == "object":
+        return object
+    try:
+        return pd.StringDtype("pyarrow", na_value=np.nan)  # 결측은 NaN (object 열과 같은 의미)
+    except TypeError:  # pandas < 2.3
+        return pd.StringDtype("pyarrow")
+
+
+def text_frame(data: Dict[Hashable, List[str]], columns: List) -> pd.DataFrame:
+    """{컬럼명: 문자열 리스트} → text_dtype DataFrame. arrow 는 리스트에서 pyarrow 배열을 바로 만든다 (변환 한 번)"""
+    dtype = text_dtype()
+    if dtype is object:
+        return pd.DataFrame(data, columns=columns, dtype=object)
+    import pyarrow as pa
+
+    return pd.DataFrame({c: pd.Series(pa.array(data[c], type=pa.large_string()), dtype=dtype) for c in columns},
+                        columns=columns)
+
+
+def to_text_dtype(df: pd.DataFrame) -> pd.DataFrame:
+    """read_excel(dtype=str) 처럼 다른 경로로 읽은 문자열 DataFrame 을 text_dtype 으로 (이미 같으면 그대로)"""
+    dtype = text_dtype()
+    if all(d == dtype for d in df.dtypes):
+        return df
+    return df.astype(dtype)
+
+
+def is_clean_text(ser: pd.Series) -> bool:
+    """결측 없는 문자열만 든 열인지 (str dtype 은 결측 여부만, object 는 값 종류까지 확인 — 복사 없음)"""
+    if isinstance(ser.dtype, pd.StringDtype):
+        return not ser.hasnans
+    return ser.dtype == object and infer_dtype(ser, skipna=False) in ("string", "empty")
+
+
+def text_column(ser: pd.Series) -> pd.Series:
+    """텍스트 열 정리. 이미 깨끗하면 같은 Series 를 그대로 돌려줌 (호출부에서 고쳐 쓰지 말 것)"""
+    if is_clean_text(ser):
+        return ser
+    missing = ser.isna()
+    out = ser.astype(object).astype(str)
+    if missing.any():
+        out = out.mask(missing, "")
+    return out
@@ -0,0 +1,155 @@
+# watch.py
+# 감시 모드: 공유 폴더에 떨어지는 마켓 주문 파일을 계속 지켜보다가 새로 생기거나 바뀐 파일만 한 번씩 변환
+#   - 판별/변환은 배치와 같은 convert_file (헤더 판별 → convert_*) 을 작업자 풀에서 실행
+#   - 매니페스트(폴더 안 .excel_convert_manifest.json): 파일명 → 내용 해시. 해시가 같으면 다시 처리하지 않음
+#     (크기/수정시각이 그대로면 해시도 다시 계산하지 않음)
+#   - 결과는 입력 옆에 <이름>__<플랫폼>_converted.xlsx 로 임시 파일 → 교체 (반쯤 쓴 파일이 보이지 않음)
+#   - 쓰는 중인 파일을 잡지 않도록 마지막 수정 후 settle 초가 지난 파일만 처리
+
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from excel_convert.batch import BatchResult, convert_batch, new_pool, write_atomic
+from excel_convert.converters import TemplateSchema
+from excel_convert.parse_cache import content_hash
+
+MANIFEST_NAME = ".excel_convert_manifest.json"
+MANIFEST_VERSION = 1
+OUTPUT_SUFFIX = "_converted.xlsx"
+
+
+def is_input_name(name: str) -> bool:
+    """감시 대상 파일인지 (.xlsx, 엑셀 잠금/숨김/임시 파일과 변환 결과는 제외)"""
+    lower = name.lower()
+    if not lower.endswith(".xlsx") or name.startswith(("~$", ".")):
+        return False
+    return not ("__" in name and lower.endswith(OUTPUT_SUFFIX))
+
+
+class FolderWatcher:
+    def __init__(
+        self,
+        folder: str,
+        schema: TemplateSchema,
+        laora_mapping: Optional[Dict[str, str]] = None,
+        jobs: int = 1,
+        settle: float = 2.0,
+    ):
+        self.folder = folder
+        self.args = (schema, laora_mapping)
+        self.jobs = max(1, jobs)
+        self.settle = settle
+        self.manifest_path = os.path.join(folder, MANIFEST_NAME)
+        self.entries: Dict[str, dict] = self._load_manifest()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._dirty = False  # 매니페스트에 저장 안 된 변경 (시각만 바뀐 파일 등)
+
+    def _load_manifest(self) -> Dict[str, dict]:
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as fh:
+                raw = json.load(fh)
+        except (OSError, ValueError):
+            return {}
+        if raw.get("version") != MANIFEST_VERSION:
+            return {}
+        return dict(raw.get("files", {}))
+
+    def _save_manifest(self):
+        payload = {"version": MANIFEST_VERSION, "files": self.entries}
+        try:
+            write_atomic(self.manifest_path, json.dumps(payload, ensure_ascii=False, indent=1).encode("utf-8"))
+            self._dirty = False
+        except OSError:
+            self._dirty = True  # 다음 회차에 다시 저장 (감시는 계속)
+
+    def pending(self) -> List[Tuple[str, bytes, str, os.stat_result]]:
+        """[(파일명, 바이트, 해시, stat)] — 새로 생겼거나 내용이 바뀐 파일만"""
+        found = []
+        now = time.time()
+        for name in sorted(os.listdir(self.folder)):
+            if not is_input_name(name):
+                continue
+            path = os.path.join(self.folder, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue  # 그 사이 지워짐
+            if not os.path.isfile(path) or now - st.st_mtime < self.settle:
+                continue
+            entry = self.entries.get(name)
+            if entry and entry.get("size") == st.st_size and entry.get("mtime_ns") == st.st_mtime_ns:
+                continue
+            try:
+                with open(path, "rb") as fh:
+                    data = fh.read()
+            except OSError:
+                continue
+            digest = content_hash(data)
+            if entry and entry.get("hash") == digest:
+                # 내용은 같고 시각만 바뀜 (복사/touch) → 기록만 갱신
+                entry.update(size=st.st_size, mtime_ns=st.st_mtime_ns)
+                self._dirty = True
+                continue
+            found.append((name, data, digest, st))
+        return found
+
+    def _pool_for(self, n_items: int) -> Optional[ProcessPoolExecutor]:
+        if self.jobs <= 1 or n_items <= 1:
+            return None
+        if self._pool is None:
+            self._pool = new_pool(self.jobs)  # 작업자는 한 번 띄워 계속 재사용
+        return self._pool
+
+    def run_once(self) -> List[BatchResult]:
+        """한 번 훑어 대기 중인 파일을 모두 변환 (몰려 들어온 파일은 풀에서 동시에)"""
+        todo = self.pending()
+        if not todo:
+            if self._dirty:
+                self._save_manifest()
+            return []
+        items = [(name, data) for name, data, _, _ in todo]
+        results = convert_batch(items, *self.args, jobs=self.jobs, pool=self._pool_for(len(items)))
+        stamp = datetime.now().isoformat(timespec="seconds")
+        for (name, _, digest, st), res in zip(todo, results):
+            if res.xlsx is not None:
+                try:
+                    write_atomic(os.path.join(self.folder, res.out_name), res.xlsx)
+                except OSError as e:
+                    res.error = f"결과 저장 오류: {e}"
+                    res.xlsx = None
+                    continue  # 기록하지 않음 → 다음 회차에 다시 시도
+            # 변환 실패도 기록 → 같은 내용이면 재시도하지 않고, 파일이 바뀌면 다시 처리
+            self.entries[name] = {
+                "hash": digest,
+                "size": st.st_size,
+                "mtime_ns": st.st_mtime_ns,
+                "platform": res.platform,
+                "out": res.out_name,
+                "error": res.error,
+                "converted_at": stamp,
+            }
+            res.xlsx = None  # 이미 디스크에 씀. 긴 실행에서 결과 바이트를 들고 있지 않도록
+        self._save_manifest()
+        return results
+
+    def run_forever(self, interval: float = 5.0, on_result: Optional[Callable[[BatchResult], None]] = None):
+        """Ctrl+C 로 멈출 때까지 interval 초마다 run_once. on_result 기본은 로그 줄 출력"""
+        try:
+            while True:
+                for res in self.run_once():
+                    if on_result is None:
+                        print(res.log_line(), flush=True)
+                    else:
+                        on_result(res)
+                time.sleep(interval)
+        finally:
+            self.close()
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
@@ -0,0 +1,483 @@
+# xlsx_reader.py
+# .xlsx 첫 시트를 행 단위로 스트리밍해서 "전 컬럼 문자열" DataFrame 으로 읽는다.
+#   - openpyxl 워크북/셀 객체를 만들지 않고 zip 안의 시트 XML 을 iterparse 로 직접 읽음
+#   - pd.read_excel(..., engine="openpyxl", dtype=str, keep_default_na=False) 과 같은 결과
+#     (앞 0 보존, 빈 셀은 "", NaN 없음, 중복 헤더는 "이름.1", 빈 헤더는 "Unnamed: n")
+#   - 열 dtype 은 text_dtype() (기본: pyarrow 문자열, excel_convert.text_columns 참고)
+#   - usecols 로 필요한 열만 디코딩
+#   - nrows 를 주면 그 뒤 행은 디코딩하지 않고, 공유문자열도 실제로 참조한 번호까지만 읽음 (헤더만 볼 때 싸게)
+#   - iter_xlsx_text_chunks: 같은 결과를 행 묶음 DataFrame 으로 차례로 (큰 파일을 일정한 메모리로)
+
+import io
+import posixpath
+import sys
+import zipfile
+from collections import defaultdict
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from xml.etree.ElementTree import fromstring, iterparse
+
+import pandas as pd
+from openpyxl.cell.text import Text
+from openpyxl.styles.stylesheet import Stylesheet
+from openpyxl.utils.datetime import MAC_EPOCH, WINDOWS_EPOCH, from_ISO8601, from_excel
+
+from excel_convert.parse_cache import PARSE_CACHE, content_hash
+from excel_convert.text_columns import string_storage, text_frame
+
+SHEET_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+PKG_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+_ROW = SHEET_NS + "row"
+_CELL = SHEET_NS + "c"
+_VALUE = SHEET_NS + "v"
+_INLINE = SHEET_NS + "is"
+_TEXT = SHEET_NS + "t"
+_RUN = SHEET_NS + "r"
+_SI = SHEET_NS + "si"
+_SHEET_DATA = SHEET_NS + "sheetData"
+_DIMENSION = SHEET_NS + "dimension"
+
+CHUNK_ROWS = 5000
+
+_COL_CACHE: Dict[str, int] = {}
+
+
+def _col_index(ref: str) -> int:
+    """'AB12' → 27 (0-based). 열 문자는 캐시해서 재계산하지 않음"""
+    letters = ref.rstrip("0123456789")
+    idx = _COL_CACHE.get(letters)
+    if idx is None:
+        idx = 0
+        for ch in letters:
+            idx = idx * 26 + (ord(ch) - 64)
+        idx -= 1
+        _COL_CACHE[letters] = idx
+    return idx
+
+
+def _as_bytes(source) -> bytes:
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source)
+    if hasattr(source, "getvalue"):
+        return source.getvalue()
+    if hasattr(source, "read"):
+        if hasattr(source, "seek"):
+            source.seek(0)
+        return source.read()
+    with open(source, "rb") as fh:
+        return fh.read()
+
+
+class XlsxBook:
+    """zip 패키지에서 첫 시트 경로/공유문자열/날짜 서식/에포크만 뽑아 둔다."""
+
+    def __init__(self, source):
+        self.data = _as_bytes(source)
+        self._digest: Optional[str] = None
+        self._loaded = False
+        self._shared_strings: Optional[List[str]] = None
+        self._shared_iter = None  # 공유문자열 증분 파서 (다 읽으면 None)
+        self._data_width: Optional[int] = None
+
+    @property
+    def digest(self) -> str:
+        """업로드 바이트 해시 (파싱 캐시 키)"""
+        if self._digest is None:
+            self._digest = content_hash(self.data)
+        return self._digest
+
+    def _load(self):
+        # zip/워크북/스타일은 실제로 시트를 읽을 때만 연다 (캐시 적중 시엔 열지 않음)
+        if self._loaded:
+            return
+        self.zf = zipfile.ZipFile(io.BytesIO(self.data))
+        self.epoch = WINDOWS_EPOCH
+        self.date_formats = set()
+        self.timedelta_formats = set()
+        self.sheet_path = self._first_sheet_path()
+        self._read_styles()
+        self._loaded = True
+
+    def _first_sheet_path(self) -> str:
+        wb_path = "xl/workbook.xml"
+        root_rels = fromstring(self.zf.read("_rels/.rels"))
+        for rel in root_rels.iter(PKG_REL_NS + "Relationship"):
+            if rel.get("Type", "").endswith("/officeDocument"):
+                wb_path = rel.get("Target").lstrip("/")
+                break
+        wb_xml = fromstring(self.zf.read(wb_path))
+        pr = wb_xml.find(SHEET_NS + "workbookPr")
+        if pr is not None and pr.get("date1904") in ("1", "true"):
+            self.epoch = MAC_EPOCH
+        sheet = wb_xml.find(f"{SHEET_NS}sheets/{SHEET_NS}sheet")
+        if sheet is None:
+            raise ValueError("워크북에서 첫 시트를 찾을 수 없습니다. (.xlsx 형식인지 확인해 주세요)")
+        rid = sheet.get(REL_NS + "id")
+        base, name = posixpath.split(wb_path)
+        rels = fromstring(self.zf.read(posixpath.join(base, "_rels", name + ".rels")))
+        for rel in rels.iter(PKG_REL_NS + "Relationship"):
+            if rel.get("Id") == rid:
+                target = rel.get("Target")
+                if target.startswith("/"):
+                    return target.lstrip("/")
+                return posixpath.normpath(posixpath.join(base, target))
+        raise ValueError("첫 시트의 위치를 찾을 수 없습니다.")
+
+    def _read_styles(self):
+        try:
+            node = fromstring(self.zf.read("xl/styles.xml"))
+        except KeyError:
+            return
+        stylesheet = Stylesheet.from_tree(node)
+        self.date_formats = stylesheet.date_formats
+        self.timedelta_formats = stylesheet.timedelta_formats
+
+    def _iter_shared(self):
+        # openpyxl read_string_table 과 같은 규칙 (<si> 하나 = 문자열 하나, 윗주(rPh) 제외)
+        try:
+            fh = self.zf.open("xl/sharedStrings.xml")
+        except KeyError:
+            return
+        with fh:
+            for _, node in iterparse(fh):
+                if node.tag == _SI:
+                    text = Text.from_tree(node).content.replace("x005F_", "")
+                    node.clear()
+                    yield text
+
+    def shared_string(self, idx: int) -> str:
+        """idx 번째 공유문자열. 필요한 곳까지만 읽는다 (헤더만 볼 때 표 전체를 읽지 않도록)"""
+        strings = self._shared_strings
+        if strings is None:
+            self._load()
+            strings = self._shared_strings = []
+            self._shared_iter = self._iter_shared()
+        while len(strings) <= idx and self._shared_iter is not None:
+            try:
+                strings.append(next(self._shared_iter))
+            except StopIteration:
+                self._shared_iter = None
+        return strings[idx]
+
+    @property
+    def shared_strings(self) -> List[str]:
+        if self._shared_strings is None or self._shared_iter is not None:
+            try:
+                self.shared_string(sys.maxsize)
+            except IndexError:
+                pass
+        return self._shared_strings
+
+    def _dimension_width(self) -> Optional[int]:
+        """<dimension ref="A1:AB100"/> 의 열 폭 (없으면 None). 시트 앞부분만 읽음"""
+        with self.zf.open(self.sheet_path) as fh:
+            for _, el in iterparse(fh, ("start",)):
+                if el.tag == _DIMENSION:
+                    ref = (el.get("ref") or "").split(":")[-1].rstrip("0123456789")
+                    return _col_index(ref) + 1 if ref else None
+                if el.tag == _SHEET_DATA:
+                    return None
+        return None
+
+    def data_width(self, header_width: int = 0, scan: bool = False) -> int:
+        """
+        값이 있는 셀까지 포함한 시트 폭 (pd.read_excel 의 열 수).
+          - <dimension> 이 header_width 이내면 본문을 읽지 않고 header_width
+          - 더 넓다고 하면 본문 셀 위치를 한 번 훑어 실제 폭 (값은 디코딩하지 않음, 결과는 북에 보관)
+          - <dimension> 이 없으면 scan=True 일 때만 훑음 (아니면 header_width)
+        """
+        if self._data_width is not None:
+            return max(self._data_width, header_width)
+        self._load()
+        dim = self._dimension_width()
+        if (dim is not None and dim <= header_width) or (dim is None and not scan):
+            return header_width
+        width = 0
+        with self.zf.open(self.sheet_path) as fh:
+            for _, el in iterparse(fh):
+                if el.tag != _ROW:
+                    continue
+                col = -1
+                for c in el.iter(_CELL):
+                    ref = c.get("r")
+                    col = _col_index(ref) if ref else col + 1
+                    if col >= width and len(c):
+                        width = col + 1
+                el.clear()
+        self._data_width = width
+        return max(width, header_width)
+
+    def iter_rows(self, usecols: Optional[Iterable[int]] = None, full_until: int = -1,
+                  last_row: Optional[int] = None, release: bool = False):
+        """
+        (0-based 행 번호, {열 인덱스: 값}, 값 있음 여부) 를 시트 순서대로 내보낸다.
+          - 값은 openpyxl read-only 와 같은 파이썬 타입(str/int/float/bool/datetime)
+          - usecols 밖의 셀은 디코딩하지 않음 (full_until 이하 행은 전체 디코딩)
+          - 값 있음 여부는 usecols 밖의 셀까지 포함 (빈 행 판정이 전체 읽기와 같도록)
+          - last_row 를 넘는 첫 행은 디코딩하지 않고 빈 행으로 한 번 내보낸 뒤 멈춤
+            (이때는 공유문자열도 필요한 곳까지만 읽음)
+          - release: 처리한 <row> 를 트리에서 떼어냄 (행 수와 상관없이 메모리 일정, 파싱은 조금 느림)
+        """
+        self._load()
+        wanted = None if usecols is None else frozenset(usecols)
+        shared = self.shared_strings if last_row is None else None
+        shared_string = self.shared_string
+        convert = self._convert
+        row_no = -1
+        sheet_data = None
+        # 보통은 end 이벤트만 받는다 (start 까지 받으면 이벤트 수가 두 배). release 는 부모(sheetData)가 필요
+        events = ("start", "end") if release else ("end",)
+        with self.zf.open(self.sheet_path) as fh:
+            for event, el in iterparse(fh, events):
+                if event == "start":
+                    if sheet_data is None and el.tag == _SHEET_DATA:
+                        sheet_data = el
+                    continue
+                if el.tag != _ROW:
+                    continue
+                r = el.get("r")
+                row_no = int(r) - 1 if r else row_no + 1
+                if last_row is not None and row_no > last_row:
+                    yield row_no, {}, False
+                    return
+                row_wanted = wanted if row_no > full_until else None
+                cells = {}
+                has_value = False
+                col = -1
+                for c in el.iter(_CELL):
+                    ref = c.get("r")
+                    col = _col_index(ref) if ref else col + 1
+                    if row_wanted is not None and col not in row_wanted:
+                        if not has_value and len(c):
+                            has_value = True
+                        continue
+                    t = c.get("t", "n")
+                    if t == "inlineStr":
+                        node = c.find(_INLINE)
+                        if node is None:
+                            continue
+                        text = node.findtext(_TEXT)
+                        if text is None:
+                            text = "".join(run.findtext(_TEXT) or "" for run in node.iter(_RUN))
+                        value = text
+                    else:
+                        v = c.findtext(_VALUE)
+                        if not v:
+                            continue
+                        if t == "s":
+                            value = shared[int(v)] if shared is not None else shared_string(int(v))
+                        elif t == "str" or t == "e":
+                            value = v
+                        else:
+                            value = convert(v, t, c.get("s"))
+                    if value != "":
+                        cells[col] = value
+                        has_value = True
+                el.clear()
+                if sheet_data is not None:
+                    sheet_data.clear()
+                yield row_no, cells, has_value
+
+    def _convert(self, v: str, t: str, style: Optional[str]):
+        if t == "b":
+            return bool(int(v))
+        if t == "d":
+            return from_ISO8601(v)
+        value = float(v) if ("." in v or "E" in v or "e" in v) else int(v)
+        if style:
+            style_id = int(style)
+            if style_id in self.date_formats:
+                try:
+                    return from_excel(value, self.epoch, timedelta=style_id in self.timedelta_formats)
+                except (OverflowError, ValueError):
+                    return "#VALUE!"
+        if isinstance(value, float) and value.is_integer():
+            return int(value)
+        return value
+
+
+def _header_names(header: Dict[int, object], width: int) -> List[object]:
+    """
+    pd.read_excel 헤더 규칙 (pandas PythonParser._infer_columns 와 같은 순서):
+      - 빈 헤더 → 'Unnamed: n'
+      - 중복 헤더 → '이름.1', '이름.2' … 이름 있는 열을 먼저, 빈 헤더 열은 나중에 처리하고
+        원래 헤더에 이미 있는 이름('a.1' 등)은 건너뜀
+    """
+    names: List[object] = []
+    unnamed: List[int] = []
+    for i in range(width):
+        val = header.get(i, "")
+        if val == "" or val is None:
+            unnamed.append(i)
+            names.append(f"Unnamed: {i}")
+        else:
+            names.append(val)
+    unnamed_set = set(unnamed)
+    counts: Dict[object, int] = defaultdict(int)
+    for i in [i for i in range(width) if i not in unnamed_set] + unnamed:
+        col = old_col = names[i]
+        cur = counts[col]
+        while cur > 0:
+            counts[old_col] = cur + 1
+            col = f"{old_col}.{cur}"
+            if col in names:
+                cur += 1
+            else:
+                cur = counts[col]
+        names[i] = col
+        counts[col] = cur + 1
+    return names
+
+
+def pad_columns(columns: List, width: int) -> List:
+    """헤더 행 컬럼명을 width 까지 늘림 (헤더보다 넓은 데이터 열은 pd.read_excel 처럼 'Unnamed: n')"""
+    if width <= len(columns):
+        return list(columns)
+    return _header_names(dict(enumerate(columns)), width)
+
+
+def _to_text(value) -> str:
+    return value if isinstance(value, str) else str(value)
+
+
+def read_xlsx_as_text(
+    source,
+    usecols: Optional[Iterable[int]] = None,
+    skiprows: int = 0,
+    nrows: Optional[int] = None,
+    cache: bool = True,
+) -> pd.DataFrame:
+    """
+    첫 시트를 전 컬럼 문자열로 읽는다.
+      - usecols : 읽을 0-based 열 인덱스. None 이면 전체
+      - skiprows: 헤더 앞에서 건너뛸 행 수 (스마트스토어 암호 파일은 1)
+      - nrows   : 헤더 아래로 읽을 최대 행 수 (0 이면 헤더만)
+      - cache   : 같은 바이트 + 같은 옵션이면 파싱 캐시에서 꺼냄
+    source 로 XlsxBook 을 넘기면 zip/공유문자열을 다시 읽지 않는다.
+    컬럼명/행 수는 usecols 와 상관없이 전체 읽기와 같다.
+    """
+    book = source if isinstance(source, XlsxBook) else XlsxBook(source)
+    wanted = None if usecols is None else tuple(sorted(set(usecols)))
+    if not cache:
+        return _read_book(book, wanted, skiprows, nrows)
+    options = ("xlsx_text", wanted, skiprows, nrows, string_storage())
+    return PARSE_CACHE.get_or_parse(book.digest, options, lambda: _read_book(book, wanted, skiprows, nrows))
+
+
+def _read_book(book: XlsxBook, wanted: Optional[Tuple[int, ...]], skiprows: int, nrows: Optional[int]) -> pd.DataFrame:
+    header: Dict[int, object] = {}
+    header_seen = False
+    columns: Dict[int, List[str]] = {}
+    width = 0
+    n_rows = 0  # 값이 있는 마지막 데이터 행까지의 행 수 (뒤쪽 빈 행은 버림)
+
+    last_row = None if nrows is None else skiprows + nrows
+    for row_no, cells, has_value in book.iter_rows(wanted, full_until=skiprows, last_row=last_row):
+        if row_no < skiprows:
+            # 건너뛴 행도 열 폭 계산에는 들어간다 (pandas 와 같게)
+            if cells:
+                width = max(width, max(cells) + 1)
+            continue
+        if not header_seen:
+            header_seen = True
+            if row_no == skiprows:
+                # skiprows 바로 다음 행이 헤더 (XML 에 없는 빈 행이면 빈 헤더)
+                header = cells
+                if header:
+                    width = max(width, max(header) + 1)
+                continue
+        pos = row_no - skiprows - 1
+        if nrows is not None and pos >= nrows:
+            break
+        for col, val in cells.items():
+            lst = columns.get(col)
+            if lst is None:
+                lst = columns[col] = []
+            if len(lst) < pos:
+                lst.extend([""] * (pos - len(lst)))
+            lst.append(_to_text(val))
+            if col >= width:
+                width = col + 1
+        if has_value:
+            n_rows = pos + 1
+
+    if not header_seen:
+        return pd.DataFrame()
+
+    if wanted and nrows is None and wanted[-1] >= width:
+        # 읽은 열 바깥을 요청: 읽지 않은 열 값 때문에 시트가 더 넓을 수 있음 (전체 읽기와 같은 폭으로)
+        width = book.data_width(width, scan=True)
+    names = _header_names(header, width)
+    keep = range(width) if wanted is None else [i for i in wanted if i < width]
+    data = {}
+    for i in keep:
+        lst = columns.get(i, [])
+        if len(lst) < n_rows:
+            lst.extend([""] * (n_rows - len(lst)))
+        elif len(lst) > n_rows:
+            del lst[n_rows:]
+        data[names[i]] = lst
+    return text_frame(data, [names[i] for i in keep])
+
+
+def iter_xlsx_text_chunks(
+    source,
+    usecols: Optional[Iterable[int]] = None,
+    skiprows: int = 0,
+    chunksize: int = CHUNK_ROWS,
+    columns: Optional[List] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    read_xlsx_as_text 와 같은 값을 chunksize 행씩 나눠 내보낸다 (파싱 캐시는 쓰지 않음).
+      - columns: 전체 컬럼명 (projection.read_header, 헤더보다 넓은 데이터 열의 'Unnamed: n' 포함).
+        없으면 헤더 행만 읽어서
+      - 중간 빈 행은 "" 행, 맨 뒤 빈 행은 버림 (전체 읽기와 같음)
+      - 묶음마다 인덱스는 0 부터. 데이터 행이 없으면 빈 묶음 하나
+    """
+    book = source if isinstance(source, XlsxBook) else XlsxBook(source)
+    if columns is None:
+        columns = read_xlsx_as_text(book, skiprows=skiprows, nrows=0, cache=False).columns
+    names = list(columns)
+    keep = [i for i in range(len(names)) if usecols is None or i in set(usecols)]
+    keep_names = [names[i] for i in keep]
+
+    def frame(buf: Dict[int, List[str]], n: int) -> pd.DataFrame:
+        if not keep:
+            return pd.DataFrame(index=range(n))  # 읽을 열이 없어도 행 수는 유지
+        return text_frame({names[i]: buf[i] for i in keep}, keep_names)
+
+    buf: Dict[int, List[str]] = {i: [] for i in keep}
+    n_buf = 0
+    blank_run = 0  # 아직 내보내지 않은 빈 행 수 (뒤에 값 있는 행이 오면 채움, 끝까지 안 오면 버림)
+    last_pos = -1
+    emitted = False
+    for row_no, cells, has_value in book.iter_rows(keep, full_until=skiprows, release=True):
+        if row_no <= skiprows:
+            continue
+        pos = row_no - skiprows - 1
+        blank_run += pos - last_pos - 1  # XML 에 없는 행
+        last_pos = pos
+        if not has_value:
+            blank_run += 1
+            continue
+        while blank_run:
+            take = min(blank_run, chunksize - n_buf)
+            for i in keep:
+                buf[i].extend([""] * take)
+            n_buf += take
+            blank_run -= take
+            if n_buf == chunksize:
+                yield frame(buf, n_buf)
+                emitted = True
+                buf, n_buf = {i: [] for i in keep}, 0
+        for i in keep:
+            val = cells.get(i)
+            buf[i].append("" if val is None else _to_text(val))
+        n_buf += 1
+        if n_buf == chunksize:
+            yield frame(buf, n_buf)
+            emitted = True
+            buf, n_buf = {i: [] for i in keep}, 0
+    if n_buf or not emitted:
+        yield frame(buf, n_buf)
@@ -0,0 +1,261 @@
+# xlsx_writer.py
+# DataFrame → .xlsx 바이트. 엔진을 바꿔 끼울 수 있는 얇은 쓰기 계층
+#   - "openpyxl": 기존 pd.ExcelWriter(engine="openpyxl") 경로 그대로
+#   - "stream": openpyxl 셀 객체 없이 시트 XML 을 행 묶음 단위로 zip 에 바로 흘려 씀 (메모리 일정)
+#   - "auto": 행 수가 STREAM_MIN_ROWS 이상이면 stream, 아니면 openpyxl
+#   - 전화번호/주문번호 열은 두 엔진 모두 텍스트 셀로 기록 (앞 0 / 긴 숫자 보존)
+#   - write_xlsx_chunks: 행 묶음 DataFrame 들을 받는 대로 파일에 바로 씀 (전체 결과를 메모리에 두지 않음)
+
+import datetime as dt
+import io
+import re
+import zipfile
+from typing import BinaryIO, Callable, Dict, Iterable, List, Optional
+from xml.sax.saxutils import escape
+
+import numpy as np
+import pandas as pd
+from openpyxl.utils.datetime import to_excel
+
+STREAM_MIN_ROWS = 5000
+ROW_CHUNK = 5000
+DEFAULT_SHEET_NAME = "Sheet1"
+
+TEXT_COL_PATTERN = re.compile(r"(전화번호|연락처|휴대폰|주문번호)")
+_ILLEGAL_XML = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+# 스타일 인덱스: 0 기본 / 1 날짜시간 / 2 날짜 (헤더는 pandas 와 같이 서식 없음)
+_DATETIME_XF = 1
+_DATE_XF = 2
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '</Types>'
+)
+
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    '<Relationship Id="rId2" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+    'Target="styles.xml"/>'
+    '</Relationships>'
+)
+
+_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="{name}" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+
+_STYLES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<numFmts count="2">'
+    '<numFmt numFmtId="164" formatCode="YYYY-MM-DD HH:MM:SS"/>'
+    '<numFmt numFmtId="165" formatCode="YYYY-MM-DD"/>'
+    '</numFmts>'
+    '<fonts count="1"><font><sz val="11"/><name val="Calibri"/><family val="2"/></font></fonts>'
+    '<fills count="2">'
+    '<fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill>'
+    '</fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="3">'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="164" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '<xf numFmtId="165" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '</cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+
+_SHEET_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<sheetData>'
+)
+_SHEET_TAIL = '</sheetData></worksheet>'
+
+
+def _col_letter(idx: int) -> str:
+    letters = ""
+    idx += 1
+    while idx:
+        idx, rem = divmod(idx - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+def text_columns(df: pd.DataFrame) -> List:
+    """전화번호/연락처/휴대폰/주문번호 가 들어간 열 (텍스트 셀로 써야 하는 열)"""
+    return [c for c in df.columns if TEXT_COL_PATTERN.search(str(c))]
+
+
+def _as_text(value) -> str:
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _with_text_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """텍스트 열 중 문자열이 아닌 값(숫자 등)만 문자열로 바꾼 얕은 사본. 빈 값은 그대로 빈 칸"""
+    cols = [c for c in text_columns(df) if not pd.api.types.is_string_dtype(df[c])]
+    if not cols:
+        return df
+    out = df.copy(deep=False)
+    for c in cols:
+        ser = out[c]
+        out[c] = ser.map(_as_text, na_action="ignore").astype(object).where(ser.notna(), None)
+    return out
+
+
+def _sheet_title(sheet_name: Optional[str]) -> str:
+    return (sheet_name or DEFAULT_SHEET_NAME)[:31]
+
+
+def _text_cell(ref: str, text: str) -> str:
+    text = escape(_ILLEGAL_XML.sub("", text))
+    if text[:1].isspace() or text[-1:].isspace():
+        return f'<c r="{ref}" t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+    return f'<c r="{ref}" t="inlineStr"><is><t>{text}</t></is></c>'
+
+
+def _cell(ref: str, value) -> str:
+    """값 하나 → <c> (빈 값은 ""). openpyxl 이 셀 타입을 정하는 규칙과 같은 순서로 판별"""
+    if value is None or value is pd.NaT or value is pd.NA:
+        return ""
+    if isinstance(value, str):
+        return _text_cell(ref, value) if value else ""
+    if isinstance(value, (bool, np.bool_)):
+        return f'<c r="{ref}" t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, np.integer)):
+        return f'<c r="{ref}"><v>{int(value)}</v></c>'
+    if isinstance(value, (float, np.floating)):
+        if value != value:  # NaN
+            return ""
+        if value in (np.inf, -np.inf):
+            return _text_cell(ref, "inf" if value > 0 else "-inf")
+        if value.is_integer() and abs(value) < 1e15:
+            return f'<c r="{ref}"><v>{int(value)}</v></c>'  # openpyxl 과 같이 1.0 → 1
+        return f'<c r="{ref}"><v>{float(value)!r}</v></c>'
+    if isinstance(value, dt.datetime):
+        if value.tzinfo is not None:
+            raise ValueError("Excel 은 시간대가 있는 날짜를 저장할 수 없습니다. 먼저 시간대를 제거해 주세요.")
+        return f'<c r="{ref}" s="{_DATETIME_XF}"><v>{to_excel(value)!r}</v></c>'
+    if isinstance(value, dt.date):
+        return f'<c r="{ref}" s="{_DATE_XF}"><v>{to_excel(value)!r}</v></c>'
+    return _text_cell(ref, str(value))
+
+
+def _iter_sheet_xml(columns: List, chunks: Iterable[pd.DataFrame]):
+    letters = [_col_letter(i) for i in range(len(columns))]
+    header = "".join(_text_cell(f"{letter}1", str(col)) for letter, col in zip(letters, columns))
+    yield _SHEET_HEAD + f'<row r="1">{header}</row>'
+
+    # 행 묶음 단위로 열별 값을 꺼내 XML 조각을 만든다 (전체 시트를 메모리에 올리지 않음)
+    start = 0
+    for chunk in chunks:
+        values = [chunk.iloc[:, j].tolist() for j in range(chunk.shape[1])]
+        parts = []
+        for offset, row in enumerate(zip(*values)):
+            r = start + offset + 2
+            cells = "".join(_cell(f"{letter}{r}", v) for letter, v in zip(letters, row))
+            parts.append(f'<row r="{r}">{cells}</row>')
+        yield "".join(parts)
+        start += len(chunk)
+    yield _SHEET_TAIL
+
+
+def _write_zip(fh: BinaryIO, columns: List, chunks: Iterable[pd.DataFrame], sheet_name: Optional[str]):
+    with zipfile.ZipFile(fh, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("[Content_Types].xml", _CONTENT_TYPES)
+        zf.writestr("_rels/.rels", _ROOT_RELS)
+        zf.writestr("xl/workbook.xml", _WORKBOOK.format(name=escape(_sheet_title(sheet_name), {'"': "&quot;"})))
+        zf.writestr("xl/_rels/workbook.xml.rels", _WORKBOOK_RELS)
+        zf.writestr("xl/styles.xml", _STYLES)
+        with zf.open("xl/worksheets/sheet1.xml", "w") as sheet:
+            for piece in _iter_sheet_xml(columns, chunks):
+                sheet.write(piece.encode("utf-8"))
+
+
+def _write_stream(df: pd.DataFrame, sheet_name: Optional[str]) -> bytes:
+    buf = io.BytesIO()
+    chunks = (df.iloc[start:start + ROW_CHUNK] for start in range(0, len(df), ROW_CHUNK))
+    _write_zip(buf, list(df.columns), chunks, sheet_name)
+    return buf.getvalue()
+
+
+def write_xlsx_chunks(fh: BinaryIO, columns: List, chunks: Iterable[pd.DataFrame],
+                      sheet_name: Optional[str] = None) -> int:
+    """
+    행 묶음들을 스트리밍 엔진으로 fh 에 바로 쓴다 (묶음은 columns 순서의 열을 가져야 함). 반환: 데이터 행 수
+    텍스트 열 처리는 df_to_xlsx_bytes 와 같다.
+    """
+    n_rows = 0
+
+    def counted():
+        nonlocal n_rows
+        for chunk in chunks:
+            n_rows += len(chunk)
+            yield _with_text_columns(chunk)
+
+    _write_zip(fh, list(columns), counted(), sheet_name)
+    return n_rows
+
+
+def _write_openpyxl(df: pd.DataFrame, sheet_name: Optional[str]) -> bytes:
+    buf = io.BytesIO()
+    with pd.ExcelWriter(buf, engine="openpyxl") as writer:
+        if sheet_name:
+            df.to_excel(writer, index=False, sheet_name=sheet_name)
+        else:
+            df.to_excel(writer, index=False)
+    return buf.getvalue()
+
+
+WRITERS: Dict[str, Callable[[pd.DataFrame, Optional[str]], bytes]] = {
+    "openpyxl": _write_openpyxl,
+    "stream": _write_stream,
+}
+
+
+def pick_engine(n_rows: int, engine: str = "auto") -> str:
+    if engine != "auto":
+        return engine
+    return "stream" if n_rows >= STREAM_MIN_ROWS else "openpyxl"
+
+
+def df_to_xlsx_bytes(df: pd.DataFrame, sheet_name: Optional[str] = None, engine: str = "auto") -> bytes:
+    """
+    df → .xlsx 바이트 (인덱스 제외, 헤더 1행).
+    engine: "auto" | "openpyxl" | "stream". sheet_name 이 없으면 Sheet1.
+    """
+    name = pick_engine(len(df), engine)
+    if name not in WRITERS:
+        raise ValueError(f"알 수 없는 XLSX 엔진: {engine}")
+    return WRITERS[name](_with_text_columns(df), sheet_name)
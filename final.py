@@ -6,47 +6,65 @@
 import io
 import re
 from datetime import datetime
-from typing import Optional
+from typing import Hashable, Optional
 
 import pandas as pd
 import streamlit as st
 
+from excel_convert.decrypt import DECRYPT_CACHE, KEY_CACHE, decrypt_bytes
+from excel_convert.downloads import lazy_payload, xlsx_payload
+from excel_convert.invoice import (
+    TRACKING_KEYS,
+    build_invoice_index,
+    count_cp_updates,
+    make_cp_filled_df_by_letters,
+    make_lao_invoice_df,
+    make_ss_filled_df,
+    make_tm_filled_df,
+)
+from excel_convert.nodes import NodeCache
+from excel_convert.parse_cache import PARSE_CACHE, cached_parse, content_hash
+from excel_convert.perf import Trace, traces_json, traces_table
+from excel_convert.profiling import RunProfiler, available_engines
+from excel_convert.text_columns import string_storage, text_column, to_text_dtype
+from excel_convert.xlsx_reader import read_xlsx_as_text
+
 st.set_page_config(page_title="송장등록", layout="centered")
 
 st.title("송장등록")
 st.caption("송장번호를 라오/스마트스토어/쿠팡/떠리몰 형식으로 등록합니다.")
 
+st.sidebar.subheader("파싱 캐시")
+if st.sidebar.button("파싱 캐시 비우기"):
+    PARSE_CACHE.clear()
+    DECRYPT_CACHE.clear()
+    KEY_CACHE.clear()
+    st.session_state.pop("invoice_nodes", None)
+parse_cache_status = st.sidebar.empty()  # 실행 결과까지 반영되도록 맨 아래에서 채움
+
+st.sidebar.subheader("성능")
+trace_memory = st.sidebar.checkbox("단계별 메모리 할당까지 기록 (느려짐)", value=False, key="trace_memory")
+# 다음 '실행' 한 번만 프로파일링 (끝나면 자동으로 꺼짐 — 체크박스 값은 위젯을 만들기 전에만 바꿀 수 있음)
+if st.session_state.pop("profile_disarm", False):
+    st.session_state["profile_next"] = False
+profile_next = st.sidebar.checkbox("다음 실행 프로파일링", value=False, key="profile_next",
+                                   help="다음에 누르는 '실행' 버튼 한 번을 프로파일링합니다. (.prof / HTML 보고서)")
+profile_engine = st.sidebar.radio("프로파일러", available_engines(), horizontal=True, key="profile_engine",
+                                  disabled=not profile_next)
+profile_panel = st.sidebar.container()  # 마지막 프로파일 보고서 (맨 아래에서 채움)
+stale_profiler = st.session_state.pop("profiler", None)  # 중간에 끊긴 실행이 남긴 것
+if stale_profiler is not None:
+    stale_profiler.discard()
+if profile_next:
+    try:
+        st.session_state["profiler"] = RunProfiler("송장등록", profile_engine).start()
+    except (ValueError, RuntimeError) as e:
+        st.sidebar.warning(f"프로파일링을 시작하지 못했습니다: {e}")
+
 # -------------------------- Helpers --------------------------
-def excel_col_to_index(col_letters: str) -> int:
-    col_letters = str(col_letters).strip().upper()
-    if not re.fullmatch(r"[A-Z]+", col_letters):
-        raise ValueError(f"Invalid Excel column letters: {col_letters}")
-    idx = 0
-    for ch in col_letters:
-        idx = idx * 26 + (ord(ch) - ord('A') + 1)
-    return idx - 1  # 0-based
-
-def norm_header(s: str) -> str:
-    return re.sub(r"[\s\(\)\[\]{}:：/\\\-]", "", str(s).strip().lower())
-
-def find_col(preferred_names, df):
-    norm_cols = {norm_header(c): c for c in df.columns}
-    cand_norm = [norm_header(x) for x in preferred_names]
-    for n in cand_norm:
-        if n in norm_cols:
-            return norm_cols[n]
-    for want in cand_norm:
-        hits = [orig for k, orig in norm_cols.items() if want in k]
-        if hits:
-            return sorted(hits, key=len)[0]
-    raise KeyError(f"해당 키워드에 맞는 컬럼을 찾을 수 없습니다: {preferred_names}")
-
-def read_first_sheet_source_as_text(file) -> pd.DataFrame:
-    """전 컬럼 문자열로 읽어 전화번호 앞 0 보존"""
-    return pd.read_excel(
-        file, sheet_name=0, header=0, engine="openpyxl",
-        dtype=str, keep_default_na=False,
-    )
+def read_first_sheet_source_as_text(file, usecols=None) -> pd.DataFrame:
+    """전 컬럼 문자열로 읽어 전화번호 앞 0 보존 (시트 XML 스트리밍, usecols: 읽을 0-based 열)"""
+    return read_xlsx_as_text(file, usecols=usecols)
 
 # Excel이 CSV를 열 때 숫자로 오인되지 않도록 텍스트 보호
 def _guard_excel_text(s: str) -> str:
@@ -97,41 +115,71 @@ def download_df(
     label_sep = _labels_from_sep(csv_sep)
     label_enc = _labels_from_enc(csv_enc)
 
-    # CSV (전화번호 보호)
-    with col_csv:
-        df_safe = df.copy()
+    # CSV (전화번호 보호) — 버튼을 누를 때만 생성
+    def _csv_bytes(frame: pd.DataFrame) -> bytes:
+        df_safe = frame.copy(deep=False)  # 전화번호 열만 새 열로 바꿔 넣으므로 얕은 사본
         phone_like_cols = [c for c in df_safe.columns if re.search(r"(전화번호|연락처|휴대폰)", str(c))]
         for c in phone_like_cols:
             df_safe[c] = df_safe[c].astype(str).map(_guard_excel_text)
 
         csv_str = df_safe.to_csv(index=False, sep=csv_sep, lineterminator="\n")
-        csv_bytes = csv_str.encode(csv_enc, errors="replace")
+        return csv_str.encode(csv_enc, errors="replace")
+
+    with col_csv:
         st.download_button(
             label=f"{base_label} (CSV · {label_sep} · {label_enc})",
-            data=csv_bytes,
+            data=lazy_payload(df, ("csv", csv_sep, csv_enc), _csv_bytes),
             file_name=f"{filename_stem}_{ts}.csv",
             mime="text/csv",
             key=f"btn_{widget_key}_csv",
             help="선택한/강제된 구분자·인코딩으로 CSV 저장합니다.",
         )
 
-    # XLSX
+    # XLSX — 버튼을 누를 때만 생성
     with col_xlsx:
-        buf = io.BytesIO()
-        with pd.ExcelWriter(buf, engine="openpyxl") as writer:
-            if sheet_name:
-                df.to_excel(writer, index=False, sheet_name=sheet_name)
-            else:
-                df.to_excel(writer, index=False)
         st.download_button(
             label=f"{base_label} (XLSX)",
-            data=buf.getvalue(),
+            data=xlsx_payload(df, sheet_name),
             file_name=f"{filename_stem}_{ts}.xlsx",
             mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
             key=f"btn_{widget_key}_xlsx",
             help="서식 유지가 필요할 때 XLSX로 저장하세요.",
         )
 
+def show_perf_panel(traces, widget_key: str):
+    """단계별 시간/행 수/메모리 표 + JSON 내보내기 (접힌 '성능' 패널)"""
+    with st.expander("성능", expanded=False):
+        table = traces_table(traces)
+        if table.empty:
+            st.caption("이번 실행에서 새로 계산한 단계가 없습니다.")
+        else:
+            st.dataframe(table, hide_index=True)
+        ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+        st.download_button(
+            label="성능 기록 JSON 다운로드",
+            data=traces_json(traces, kind=widget_key),
+            file_name=f"trace_{widget_key}_{ts}.json",
+            mime="application/json",
+            key=f"btn_{widget_key}_trace",
+        )
+
+def show_profile_report(report):
+    """마지막 프로파일: 주요 함수 표 + .prof / HTML / 텍스트 다운로드 (사이드바)"""
+    if report is None:
+        return
+    st.caption(f"마지막 프로파일: {report.name} · {report.engine} · {report.seconds:.2f}s ({report.started})")
+    with st.expander("주요 함수", expanded=False):
+        st.dataframe(report.focus_table(), hide_index=True)
+    if report.prof is not None:
+        st.download_button(".prof 다운로드 (snakeviz / pstats)", data=report.prof,
+                           file_name=f"{report.file_stem()}.prof", mime="application/octet-stream",
+                           key="btn_profile_prof")
+    if report.html is not None:
+        st.download_button("HTML 보고서 다운로드", data=report.html.encode("utf-8"),
+                           file_name=f"{report.file_stem()}.html", mime="text/html", key="btn_profile_html")
+    st.download_button("텍스트 요약 다운로드", data=report.text.encode("utf-8"),
+                       file_name=f"{report.file_stem()}.txt", mime="text/plain", key="btn_profile_txt")
+
 # ======================================================================
 # 송장등록: 송장파일 → 라오/스마트스토어/쿠팡/떠리몰
 # ======================================================================
@@ -159,34 +207,35 @@ def _get_bytes(file) -> bytes:
 
 def read_smartstore_with_password(file, password: str = "1234") -> pd.DataFrame:
     """스마트스토어 파일: 암호 해제 후 첫 행 삭제하고 읽기"""
-    try:
-        import msoffcrypto
-    except ImportError:
-        raise RuntimeError("암호화된 파일을 읽으려면 msoffcrypto-tool이 필요합니다. pip install msoffcrypto-tool")
-    
     data = _get_bytes(file)
-    
-    # 암호 해제
-    decrypted = io.BytesIO()
-    office_file = msoffcrypto.OfficeFile(io.BytesIO(data))
-    office_file.load_key(password=password)
-    office_file.decrypt(decrypted)
-    decrypted.seek(0)
-    
-    # 첫 행 삭제를 위해 header=0으로 읽고 skiprows=1로 첫 행 건너뛰기
-    df = pd.read_excel(
-        decrypted, sheet_name=0, header=0, skiprows=1, dtype=str, keep_default_na=False,
-        engine="openpyxl",
-    )
-    return df
+    digest = content_hash(data)
+
+    def _parse():
+        # 암호 해제 (복호화 결과/키 유도는 excel_convert.decrypt 에서 따로 캐시)
+        decrypted = io.BytesIO(decrypt_bytes(data, password, digest=digest))
+
+        # 첫 행 삭제: skiprows=1로 첫 행 건너뛰고 그 다음 행을 헤더로
+        return read_xlsx_as_text(decrypted, skiprows=1, cache=False)
+
+    # 암호 파일 바이트 + 비밀번호(해시) 기준으로 캐시: 재실행 시 복호화/파싱 생략
+    options = ("smartstore", content_hash(password.encode("utf-8")), string_storage())
+    return cached_parse(data, options, _parse, digest=digest)
 
 def _read_excel_any(file, header=0, dtype=str, keep_default_na=False) -> pd.DataFrame:
     name = (getattr(file, "name", "") or "").lower()
     data = _get_bytes(file)
+    digest = content_hash(data)
 
     def _read_with(engine: Optional[str]):
-        bio = io.BytesIO(data)
-        return pd.read_excel(bio, sheet_name=0, header=header, dtype=dtype, keep_default_na=keep_default_na, engine=engine)
+        def _parse():
+            bio = io.BytesIO(data)
+            df = pd.read_excel(bio, sheet_name=0, header=header, dtype=dtype, keep_default_na=keep_default_na, engine=engine)
+            # 문자열로 읽었으면 소스 텍스트 열과 같은 저장 방식(pyarrow 문자열 등)으로
+            return to_text_dtype(df) if dtype is str else df
+        # 같은 파일 재실행 시 파싱 캐시에서 꺼냄
+        options = ("excel_any", engine, header, getattr(dtype, "__name__", str(dtype)), keep_default_na,
+                   string_storage())
+        return cached_parse(data, options, _parse, digest=digest)
 
     try:
         if name.endswith(".xlsx"):
@@ -212,9 +261,6 @@ def _read_excel_any(file, header=0, dtype=str, keep_default_na=False) -> pd.Data
     except Exception as e:
         raise RuntimeError(f"엑셀 파일을 읽는 중 알 수 없는 오류: {e}")
 
-def _digits_only(x: str) -> str:
-    return re.sub(r"\D+", "", str(x or ""))
-
 st.markdown("## 🚚 송장등록")
 
 with st.expander("동작 요약", expanded=False):
@@ -232,8 +278,6 @@ with st.expander("동작 요약", expanded=False):
         """
     )
 
-LAO_FIXED_TEMPLATE_COLUMNS = ["주문번호", "택배사코드", "송장번호"]
-
 st.subheader("1) 파일 업로드")
 invoice_file = st.file_uploader("송장번호 포함 파일 업로드 (예: 송장파일.xls)", type=["xls", "xlsx"], key="inv_file")
 ss_order_file = st.file_uploader("스마트스토어 주문 파일 업로드 (선택)", type=["xlsx"], key="inv_ss_orders")
@@ -243,238 +287,115 @@ tm_order_file = st.file_uploader("떠리몰 주문 파일 업로드 (선택)", t
 run_invoice = st.button("송장등록 실행")
 
 ORDER_KEYS_INVOICE = ["주문번호", "주문ID", "주문코드", "주문번호1", "고객주문번호"]
-TRACKING_KEYS = ["송장번호", "운송장번호", "운송장", "등기번호", "운송장 번호", "송장번호1"]
-
 SS_ORDER_KEYS = ["상품주문번호", "주문번호"]
-SS_TRACKING_COL_NAME = "송장번호"
-TM_ORDER_KEYS = ["주문번호", "주문ID", "주문코드", "주문번호1"]
-
-def build_order_tracking_map(df_invoice: pd.DataFrame):
-    order_col = find_col(ORDER_KEYS_INVOICE, df_invoice)
-    tracking_col = find_col(TRACKING_KEYS, df_invoice)
-    orders = df_invoice[order_col].astype(str).where(lambda s: s.str.lower() != "nan", "")
-    tracks = df_invoice[tracking_col].astype(str).where(lambda s: s.str.lower() != "nan", "")
-    mapping = {}
-    for o, t in zip(orders, tracks):
-        if o and t:
-            mapping[str(o)] = str(t)
-    return mapping
-
-def classify_orders(mapping: dict):
-    lao, ss = {}, {}
-    for o, t in mapping.items():
-        s = str(o).strip()
-        digits = _digits_only(s)
-        if "LO" in s.upper():
-            lao[s] = t
-        elif len(digits) == 16:
-            # 스마트스토어: 숫자만 추출한 값으로 매핑 (주문번호 형식이 다양할 수 있으므로)
-            ss[digits] = t
-    return lao, ss
-
-def make_lao_invoice_df_fixed(lao_map: dict) -> pd.DataFrame:
-    if not lao_map:
-        return pd.DataFrame(columns=LAO_FIXED_TEMPLATE_COLUMNS)
-    orders = list(lao_map.keys())
-    tracks = [lao_map[o] for o in orders]
-    return pd.DataFrame({"주문번호": orders, "택배사코드": ["04"] * len(orders), "송장번호": tracks}, columns=LAO_FIXED_TEMPLATE_COLUMNS)
-
-def make_ss_filled_df(ss_map: dict, ss_df: Optional[pd.DataFrame], df_invoice: Optional[pd.DataFrame] = None) -> pd.DataFrame:
-    """
-    스마트스토어 파일에 송장번호 입력
-    ss_map: classify_orders에서 생성된 매핑 (16자리 숫자만 추출한 값)
-    df_invoice: 송장파일 (직접 매칭을 위해 사용)
-    """
-    if ss_df is None or ss_df.empty:
-        if not ss_map:
-            return pd.DataFrame()
-        df = pd.DataFrame({"주문번호": list(ss_map.keys()), SS_TRACKING_COL_NAME: list(ss_map.values())})
-        df["택배사"] = "CJ대한통운"
-        return df
-    
-    col_order = find_col(SS_ORDER_KEYS, ss_df)
-    out = ss_df.copy()
-    if SS_TRACKING_COL_NAME not in out.columns:
-        out[SS_TRACKING_COL_NAME] = ""
-    existing = out[SS_TRACKING_COL_NAME].astype(str)
-    is_empty = (existing.str.lower().eq("nan")) | (existing.str.strip().eq(""))
-    
-    # 송장파일이 제공되면 직접 매칭: 고객주문번호(숫자만) = 상품주문번호(숫자만)
-    if df_invoice is not None and not df_invoice.empty:
-        try:
-            inv_order_col = find_col(ORDER_KEYS_INVOICE, df_invoice)
-            inv_tracking_col = find_col(TRACKING_KEYS, df_invoice)
-            # 송장파일에서 숫자만 추출한 주문번호로 매핑 생성
-            direct_map = {}
-            for i in range(len(df_invoice)):
-                inv_order = str(df_invoice.iloc[i][inv_order_col])
-                inv_order_digits = _digits_only(inv_order)
-                inv_track = str(df_invoice.iloc[i][inv_tracking_col])
-                if inv_order_digits and inv_track and str(inv_track).lower() != "nan":
-                    direct_map[inv_order_digits] = inv_track
-            
-            # 스마트스토어 파일의 상품주문번호에서 숫자만 추출하여 직접 매칭
-            ss_order_digits = out[col_order].astype(str).map(_digits_only)
-            mapped = ss_order_digits.map(direct_map).fillna("")
-            out.loc[is_empty, SS_TRACKING_COL_NAME] = mapped[is_empty]
-        except Exception:
-            # 직접 매칭 실패 시 기존 방식 사용
-            ss_order_digits = out[col_order].astype(str).map(_digits_only)
-            mapped = ss_order_digits.map(ss_map).fillna("")
-            out.loc[is_empty, SS_TRACKING_COL_NAME] = mapped[is_empty]
-    else:
-        # 기존 방식: ss_map 사용 (16자리 숫자만 추출한 값)
-        ss_order_digits = out[col_order].astype(str).map(_digits_only)
-        mapped = ss_order_digits.map(ss_map).fillna("")
-        out.loc[is_empty, SS_TRACKING_COL_NAME] = mapped[is_empty]
-    if "택배사" not in out.columns:
-        out["택배사"] = "CJ대한통운"
-    else:
-        ser = out["택배사"].astype(str)
-        empty_mask = ser.str.lower().eq("nan") | ser.str.strip().eq("")
-        out.loc[empty_mask, "택배사"] = "CJ대한통운"
-    return out
-
-# --- (쿠팡) 송장파일에서 주문번호 매핑 생성: P열 우선, 없으면 헤더 자동탐색 ---
-def build_inv_map_from_P(df_invoice: pd.DataFrame) -> dict:
-    """
-    송장파일: (우선) P열(주문번호) 또는 (대안) 헤더 키워드(ORDER_KEYS_INVOICE)로 주문번호 열을 찾아
-    송장번호(TRACKING_KEYS)와 매핑을 만든다. 반환: {숫자만 남긴 주문번호: 송장번호}
-    """
-    inv_cols = list(df_invoice.columns)
-    tracking_col = find_col(TRACKING_KEYS, df_invoice)
+LAO_COURIER_CODE = "04"
+SS_COURIER = "CJ대한통운"
+
+
+def _upload_digest(file) -> Hashable:
+    """노드 키에 쓰는 업로드 내용 해시 (파일 없음: None / 바이트를 못 읽음: 매번 다른 값 → 다시 읽어 경고 표시)"""
+    if not file:
+        return None
     try:
-        inv_order_col = inv_cols[excel_col_to_index("P")]
+        return content_hash(_get_bytes(file))
     except Exception:
-        try:
-            inv_order_col = find_col(ORDER_KEYS_INVOICE, df_invoice)
-        except Exception:
-            raise RuntimeError("송장파일에서 주문번호 열을 찾지 못했습니다. (P열 또는 헤더: 주문번호/주문ID/주문코드/주문번호1)")
-    orders = df_invoice[inv_order_col].astype(str).where(lambda s: s.str.lower() != "nan", "")
-    tracks = df_invoice[tracking_col].astype(str).where(lambda s: s.str.lower() != "nan", "")
-    inv_map = {}
-    for o, t in zip(orders, tracks):
-        key = _digits_only(o)
-        if key and str(t):
-            inv_map[key] = str(t)
-    return inv_map
-
-def make_cp_filled_df_by_letters(df_invoice: Optional[pd.DataFrame], cp_df: Optional[pd.DataFrame]) -> pd.DataFrame:
-    if cp_df is None or cp_df.empty:
-        return pd.DataFrame()
-    if df_invoice is None or df_invoice.empty:
-        return cp_df
-    inv_map = build_inv_map_from_P(df_invoice)
-    cp_cols = list(cp_df.columns)
+        return object()
+
+def _read_order_file(file, read, label: str, trace: Trace):
+    """(선택) 주문 파일 읽기 → (DataFrame 또는 None, 경고 문구 또는 None)"""
+    if not file:
+        return None, None
     try:
-        cp_order_col = cp_cols[excel_col_to_index("C")]
-    except Exception:
-        raise RuntimeError("쿠팡 주문 파일에 C열(주문번호)이 없습니다.")
+        with trace.stage("read", label) as stage:
+            df = read(file)
+            stage.rows = len(df)
+        return df, None
+    except Exception as e:
+        return None, f"{label} 주문 파일을 읽는 중 오류: {e}"
+
+def _tm_update_count(df_tm_orders: Optional[pd.DataFrame], tm_out_df: pd.DataFrame) -> int:
+    if df_tm_orders is None or df_tm_orders.empty or tm_out_df is None or tm_out_df.empty:
+        return 0
     try:
-        cp_track_col = cp_cols[excel_col_to_index("E")]
+        tm_track_col = next((c for c in TRACKING_KEYS if c in tm_out_df.columns), "송장번호")
+        before = text_column(df_tm_orders.get(tm_track_col, pd.Series([""]*len(df_tm_orders))))
+        after  = text_column(tm_out_df.get(tm_track_col, pd.Series([""]*len(tm_out_df))))
+        return int((before != after).sum())
     except Exception:
-        cp_track_col = "운송장 번호"
-        if cp_track_col not in cp_df.columns:
-            cp_df = cp_df.copy()
-            cp_df[cp_track_col] = ""
-    out = cp_df.copy()
-    cp_keys = out[cp_order_col].astype(str).map(_digits_only)
-    mapped = cp_keys.map(inv_map)
-    mask = mapped.notna() & mapped.astype(str).str.len().gt(0)
-    out.loc[mask, cp_track_col] = mapped[mask]
-    return out
-
-def make_tm_filled_df(tm_df: Optional[pd.DataFrame], inv_map: dict) -> pd.DataFrame:
-    if tm_df is None or tm_df.empty:
-        return pd.DataFrame()
-    tm_order_col = find_col(TM_ORDER_KEYS, tm_df)
-    tracking_col_candidates = [c for c in TRACKING_KEYS if c in list(tm_df.columns)]
-    if tracking_col_candidates:
-        tm_tracking_col = tracking_col_candidates[0]
-        out = tm_df.copy()
-    else:
-        tm_tracking_col = "송장번호"
-        out = tm_df.copy()
-        if tm_tracking_col not in out.columns:
-            out[tm_tracking_col] = ""
-    keys = out[tm_order_col].astype(str)
-    mapped = keys.map(inv_map)
-    # 떠리몰: 송장번호에서 하이픈 제거
-    mapped_no_hyphen = mapped.astype(str).str.replace("-", "", regex=False)
-    mask = mapped.notna() & mapped.astype(str).str.len().gt(0)
-    out.loc[mask, tm_tracking_col] = mapped_no_hyphen[mask]
-    return out
+        return 0
 
-if run_invoice:
-    df_invoice = None
-    df_ss_orders = None
-    df_cp_orders = None
-    df_tm_orders = None
 
+if run_invoice:
     if not invoice_file:
         st.error("송장번호가 포함된 송장파일을 업로드해 주세요. (예: 송장파일.xls)")
     else:
+        # 출력(라오/스마트스토어/쿠팡/떠리몰)마다 노드: 키는 의존하는 업로드의 내용 해시
+        # → 주문 파일 하나만 바꾸거나 추가하면 그 출력만 다시 읽고 계산 (송장파일 읽기/조회표/복호화는 재사용)
+        nodes = st.session_state.setdefault("invoice_nodes", NodeCache())
+        nodes.begin()
+        inv_key = (_upload_digest(invoice_file), string_storage())
+        trace = Trace("송장등록", memory=trace_memory)  # 다시 계산한 노드의 단계만 기록됨
+
+        def _invoice_node():
+            with trace.stage("read", "송장파일") as stage:
+                df = _read_excel_any(invoice_file, header=0, dtype=str, keep_default_na=False)
+                stage.rows = len(df)
+            return df
+
+        def _index_node():
+            with trace.stage("match", "조회표", rows=len(df_invoice)):
+                return build_invoice_index(df_invoice, ORDER_KEYS_INVOICE)
+
         try:
-            df_invoice = _read_excel_any(invoice_file, header=0, dtype=str, keep_default_na=False)
+            df_invoice = nodes.get("송장파일", inv_key, _invoice_node)
         except Exception as e:
             st.exception(RuntimeError(f"송장파일 읽기 오류: {e}"))
             df_invoice = None
 
-        if ss_order_file:
-            try:
-                df_ss_orders = read_smartstore_with_password(ss_order_file, password="1234")
-            except Exception as e:
-                st.warning(f"스마트스토어 주문 파일을 읽는 중 오류: {e}")
-                df_ss_orders = None
-
-        if cp_order_file:
-            try:
-                df_cp_orders = read_first_sheet_source_as_text(cp_order_file)
-            except Exception as e:
-                st.warning(f"쿠팡 주문 파일을 읽는 중 오류: {e}")
-                df_cp_orders = None
-
-        if tm_order_file:
-            try:
-                df_tm_orders = read_first_sheet_source_as_text(tm_order_file)
-            except Exception as e:
-                st.warning(f"떠리몰 주문 파일을 읽는 중 오류: {e}")
-                df_tm_orders = None
-
         if df_invoice is None:
             st.error("송장파일을 읽지 못했습니다. 파일 형식 및 내용(주문번호/송장번호 컬럼)을 확인해 주세요.")
         else:
             try:
-                order_track_map = build_order_tracking_map(df_invoice)
-                lao_map, ss_map = classify_orders(order_track_map)
-
-                lao_out_df = make_lao_invoice_df_fixed(lao_map)
-                ss_out_df = make_ss_filled_df(ss_map, df_ss_orders, df_invoice)
-                cp_out_df = make_cp_filled_df_by_letters(df_invoice, df_cp_orders)
-                tm_out_df = make_tm_filled_df(df_tm_orders, order_track_map)
-
-                cp_update_cnt = 0
-                if df_cp_orders is not None and not df_cp_orders.empty:
-                    try:
-                        inv_map_tmp = build_inv_map_from_P(df_invoice)
-                        cp_cols_tmp = list(df_cp_orders.columns)
-                        cp_order_col_tmp = cp_cols_tmp[excel_col_to_index("C")]
-                        mapped_tmp = df_cp_orders[cp_order_col_tmp].astype(str).map(_digits_only).map(inv_map_tmp)
-                        cp_update_cnt = int((mapped_tmp.notna() & mapped_tmp.astype(str).str.len().gt(0)).sum())
-                    except Exception:
-                        cp_update_cnt = 0
-
-                tm_update_cnt = 0
-                if df_tm_orders is not None and not df_tm_orders.empty and tm_out_df is not None and not tm_out_df.empty:
-                    try:
-                        tm_track_col = next((c for c in TRACKING_KEYS if c in tm_out_df.columns), "송장번호")
-                        before = df_tm_orders.get(tm_track_col, pd.Series([""]*len(df_tm_orders))).astype(str).fillna("")
-                        after  = tm_out_df.get(tm_track_col, pd.Series([""]*len(tm_out_df))).astype(str).fillna("")
-                        tm_update_cnt = int((before != after).sum())
-                    except Exception:
-                        tm_update_cnt = 0
+                # 송장파일은 여기서 한 번만 훑고, 이후 채우기는 모두 조회표를 사용
+                inv_index = nodes.get("조회표", inv_key, _index_node)
+                lao_map, ss_map = inv_index.lao, inv_index.ss_by_digits
+
+                def _lao_node():
+                    with trace.stage("match", "라오", rows=len(lao_map)):
+                        return make_lao_invoice_df(lao_map, LAO_COURIER_CODE)
+
+                def _ss_node():
+                    df_ss_orders, warn = _read_order_file(
+                        ss_order_file, lambda f: read_smartstore_with_password(f, password="1234"), "스마트스토어", trace)
+                    with trace.stage("match", "스마트스토어") as stage:
+                        out = make_ss_filled_df(ss_map, df_ss_orders, SS_ORDER_KEYS, SS_COURIER, inv_index)
+                        stage.rows = len(out)
+                    return out, warn
+
+                def _cp_node():
+                    df_cp_orders, warn = _read_order_file(cp_order_file, read_first_sheet_source_as_text, "쿠팡", trace)
+                    with trace.stage("match", "쿠팡") as stage:
+                        out = make_cp_filled_df_by_letters(inv_index, df_cp_orders)
+                        stage.rows = len(out)
+                        return out, count_cp_updates(inv_index, df_cp_orders), warn
+
+                def _tm_node():
+                    df_tm_orders, warn = _read_order_file(tm_order_file, read_first_sheet_source_as_text, "떠리몰", trace)
+                    with trace.stage("match", "떠리몰") as stage:
+                        tm_out = make_tm_filled_df(df_tm_orders, inv_index.by_order)
+                        stage.rows = len(tm_out)
+                        return tm_out, _tm_update_count(df_tm_orders, tm_out), warn
+
+                lao_out_df = nodes.get("라오", inv_key, _lao_node)
+                ss_out_df, ss_warn = nodes.get("스마트스토어", inv_key + (_upload_digest(ss_order_file),), _ss_node)
+                cp_out_df, cp_update_cnt, cp_warn = nodes.get("쿠팡", inv_key + (_upload_digest(cp_order_file),), _cp_node)
+                tm_out_df, tm_update_cnt, tm_warn = nodes.get("떠리몰", inv_key + (_upload_digest(tm_order_file),), _tm_node)
+                for warn in (ss_warn, cp_warn, tm_warn):
+                    if warn:
+                        st.warning(warn)
 
                 st.success(f"분류/매칭 완료: 라오 {len(lao_map)}건 / 스마트스토어 {len(ss_map)}건 / 쿠팡 업데이트 예정 {cp_update_cnt}건 / 떠리몰 갱신 {tm_update_cnt}건")
+                st.caption(nodes.summary())
                 with st.expander("라오 송장 미리보기", expanded=True):
                     st.dataframe(lao_out_df.head(50))
                 with st.expander("스마트스토어 송장 미리보기 (시트명: 발송처리)", expanded=False):
@@ -488,14 +409,7 @@ if run_invoice:
                 download_df(lao_out_df, "라오 송장 완성 다운로드", "라오 송장 완성", "lao_inv",
                             csv_encoding_override="cp949")
                 if ss_out_df is not None and not ss_out_df.empty:
-                    ss_out_export = ss_out_df.copy()
-                    if "택배사" not in ss_out_export.columns:
-                        ss_out_export["택배사"] = "CJ대한통운"
-                    else:
-                        ser = ss_out_export["택배사"].astype(str)
-                        empty_mask = ser.str.lower().eq("nan") | ser.str.strip().eq("")
-                        ss_out_export.loc[empty_mask, "택배사"] = "CJ대한통운"
-                    download_df(ss_out_export, "스마트스토어 송장 완성 다운로드", "스마트스토어 송장 완성", "ss_inv",
+                    download_df(ss_out_df, "스마트스토어 송장 완성 다운로드", "스마트스토어 송장 완성", "ss_inv",
                                 sheet_name="발송처리", csv_sep_override=",", csv_encoding_override="cp949")
                 if cp_out_df is not None and not cp_out_df.empty:
                     download_df(cp_out_df, "쿠팡 송장 완성 다운로드", "쿠팡 송장 완성", "cp_inv",
@@ -509,3 +423,19 @@ if run_invoice:
 
             except Exception as e:
                 st.exception(RuntimeError(f"송장등록 처리 중 오류: {e}"))
+
+        show_perf_panel([trace], "invoice")
+
+# 프로파일링: 이번 실행에서 '실행' 버튼을 눌렀을 때만 보고서를 남기고 체크박스를 끔
+run_profiler = st.session_state.pop("profiler", None)
+if run_profiler is not None:
+    ran = [name for name, pressed in (("송장등록", run_invoice),) if pressed]
+    if ran:
+        st.session_state["profile_report"] = run_profiler.stop(ran[0])
+        st.session_state["profile_disarm"] = True
+    else:
+        run_profiler.discard()
+with profile_panel:
+    show_profile_report(st.session_state.get("profile_report"))
+
+parse_cache_status.caption(PARSE_CACHE.summary())